@@ -0,0 +1,118 @@
+"""
+Download throughput benchmark.
+
+Serves a set of random blobs from a local mock HTTP server (with an artificial
+per-request latency to mimic a real CDN round trip) and downloads them once
+with the old serial path (minecraft_launcher_lib download_file, one after
+another) and once with the pooled Downloader.
+
+Usage:
+    python benchmarks/bench_downloads.py [--files 500] [--size 16384] [--latency 0.02] [--workers 8]
+"""
+import os
+import sys
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.downloader import Downloader
+
+
+def start_server(blobs, latency):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1" # keep-alive
+        disable_nagle_algorithm = True # headers and body are separate writes
+
+        def do_GET(self):
+            data = blobs.get(self.path.lstrip("/"))
+            if data is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_jobs(blobs, base_url, target_dir):
+    jobs = []
+    for name, data in blobs.items():
+        jobs.append({
+            "url": f"{base_url}/{name}",
+            "path": os.path.join(target_dir, name[:2], name),
+            "sha1": name,
+            "size": len(data)
+        })
+    return jobs
+
+
+def run_serial(jobs):
+    # The path install_version used before: one file after another
+    import requests
+    from minecraft_launcher_lib.helper import download_file
+    session = requests.session()
+    for job in jobs:
+        download_file(job["url"], job["path"], sha1=job["sha1"], session=session)
+
+
+def run_pooled(jobs, workers):
+    Downloader(max_workers=workers).download_all(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--size", type=int, default=16 * 1024)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    blobs = {}
+    for _ in range(args.files):
+        data = os.urandom(args.size)
+        blobs[hashlib.sha1(data).hexdigest()] = data
+    total_bytes = sum(len(d) for d in blobs.values())
+
+    server = start_server(blobs, args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"{args.files} files x {args.size} bytes, {args.latency * 1000:.0f} ms latency per request")
+
+    results = {}
+    for label, runner in (("serial", lambda jobs: run_serial(jobs)),
+                          (f"pooled x{args.workers}", lambda jobs: run_pooled(jobs, args.workers))):
+        target = tempfile.mkdtemp(prefix="bench-dl-")
+        try:
+            jobs = make_jobs(blobs, base_url, target)
+            start = time.perf_counter()
+            runner(jobs)
+            elapsed = time.perf_counter() - start
+            results[label] = elapsed
+            print(f"{label:>12}: {elapsed:7.2f} s  {total_bytes / elapsed / 1024 / 1024:7.2f} MiB/s  {args.files / elapsed:8.1f} files/s")
+        finally:
+            shutil.rmtree(target, ignore_errors=True)
+
+    server.shutdown()
+    serial = results["serial"]
+    pooled = results[f"pooled x{args.workers}"]
+    print(f"speedup: {serial / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Launch command construction benchmark.
+
+Builds a synthetic large Forge modpack version (a vanilla parent plus a
+Forge child with a few hundred libraries) in a temporary minecraft
+directory, then compares:
+
+  cold   - minecraft_launcher_lib.command.get_minecraft_command on every launch
+  cached - LaunchPlanCache hit (hash the version JSONs, substitute user fields)
+
+Usage:
+    python benchmarks/bench_launch_command.py [--libraries 400] [--runs 50]
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import minecraft_launcher_lib
+import launcher_core # applies the get_libraries patch
+from utils.launch_plan import LaunchPlanCache
+
+
+def make_library(group, name, version, native=False, rules=False):
+    lib = {
+        "name": f"{group}:{name}:{version}",
+        "downloads": {"artifact": {
+            "path": f"{group.replace('.', '/')}/{name}/{version}/{name}-{version}.jar",
+            "url": "https://example.invalid/lib.jar", "sha1": "0" * 40, "size": 1
+        }}
+    }
+    if native:
+        lib["natives"] = {"linux": "natives-linux", "windows": "natives-windows", "osx": "natives-macos"}
+    if rules:
+        lib["rules"] = [{"action": "allow"}, {"action": "disallow", "os": {"name": "osx"}}]
+    return lib
+
+
+def make_versions(mc_dir, forge_libraries):
+    vanilla = {
+        "id": "1.20.1", "type": "release", "mainClass": "net.minecraft.client.main.Main",
+        "assets": "5", "assetIndex": {"id": "5", "url": "https://example.invalid/5.json", "sha1": "0" * 40},
+        "arguments": {
+            "game": ["--username", "${auth_player_name}", "--version", "${version_name}",
+                     "--gameDir", "${game_directory}", "--assetsDir", "${assets_root}",
+                     "--assetIndex", "${assets_index_name}", "--uuid", "${auth_uuid}",
+                     "--accessToken", "${auth_access_token}", "--userType", "${user_type}",
+                     "--versionType", "${version_type}",
+                     {"rules": [{"action": "allow", "features": {"is_demo_user": True}}], "value": "--demo"}],
+            "jvm": [{"rules": [{"action": "allow", "os": {"name": "osx"}}], "value": ["-XstartOnFirstThread"]},
+                    "-Djava.library.path=${natives_directory}", "-cp", "${classpath}"]
+        },
+        "libraries": [make_library("org.lwjgl", f"lwjgl-part{i}", "3.3.1", native=(i % 3 == 0), rules=(i % 4 == 0)) for i in range(60)]
+    }
+    forge = {
+        "id": "1.20.1-forge-47.2.0", "inheritsFrom": "1.20.1", "type": "release",
+        "mainClass": "cpw.mods.bootstraplauncher.BootstrapLauncher",
+        "arguments": {"game": ["--launchTarget", "forgeclient"], "jvm": ["-DignoreList=bootstraplauncher"]},
+        "libraries": [make_library(f"com.example.group{i % 20}", f"modlib{i}", f"1.{i}") for i in range(forge_libraries)]
+    }
+    for data in (vanilla, forge):
+        version_dir = os.path.join(mc_dir, "versions", data["id"])
+        os.makedirs(version_dir, exist_ok=True)
+        with open(os.path.join(version_dir, data["id"] + ".json"), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    return forge["id"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--libraries", type=int, default=400)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    mc_dir = tempfile.mkdtemp(prefix="bench-cmd-")
+    try:
+        version_id = make_versions(mc_dir, args.libraries)
+        base_options = {"jvmArguments": ["-Xmx4096M", "-Xms128M"], "executablePath": "java"}
+
+        def options():
+            return dict(base_options, username="Player", uuid=str(uuid.uuid4()), token="")
+
+        def build(plan_options):
+            return minecraft_launcher_lib.command.get_minecraft_command(version_id, mc_dir, plan_options)
+
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            cold_command = build(options())
+        cold = (time.perf_counter() - start) / args.runs
+
+        plans = LaunchPlanCache(mc_dir)
+        start = time.perf_counter()
+        plans.get_command(version_id, options(), build)
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            opts = options()
+            cached_command = plans.get_command(version_id, opts, build)
+        cached = (time.perf_counter() - start) / args.runs
+
+        same = cached_command == build(opts)
+        print(f"version {version_id} with {args.libraries + 60} libraries, {len(cold_command)} args")
+        print(f"  cold (library builder): {cold * 1000:8.3f} ms/launch")
+        print(f"  plan build (first run): {first * 1000:8.3f} ms")
+        print(f"  cached plan:            {cached * 1000:8.3f} ms/launch")
+        print(f"  speedup: {cold / cached:.1f}x, identical command: {same}")
+    finally:
+        shutil.rmtree(mc_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
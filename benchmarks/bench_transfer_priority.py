@@ -0,0 +1,148 @@
+"""
+Transfer priority benchmark.
+
+Serves random blobs from a local HTTP server behind one throttled "link"
+(all connections share --link-kbps), starts a background batch, and a
+moment later a launch-critical batch, like pressing PLAY during a large
+download. Runs the scenario twice:
+
+    unscheduled  both batches in the same class (old behaviour: they split the link)
+    scheduled    background batch in BACKGROUND, launch batch in LAUNCH
+
+and reports when each batch finished. With the scheduler the launch batch
+should finish first, in about the time it takes alone.
+
+Usage:
+    python benchmarks/bench_transfer_priority.py [--link-kbps 4096] [--background 40] [--launch 10] [--size 262144]
+"""
+import os
+import sys
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.downloader import Downloader
+from utils.transfer_scheduler import transfers, TransferScheduler
+
+
+class Link:
+    # Token bucket shared by every connection of the server
+    def __init__(self, bytes_per_second):
+        self.rate = bytes_per_second
+        self.lock = threading.Lock()
+        self.tokens = 0.0
+        self.last = time.monotonic()
+
+    def send(self, size):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate * 0.05, self.tokens + (now - self.last) * self.rate) - size
+            self.last = now
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0
+        if delay:
+            time.sleep(delay)
+
+
+def start_server(blobs, link, chunk=16 * 1024):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            data = blobs.get(self.path.lstrip("/"))
+            if data is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            for i in range(0, len(data), chunk):
+                link.send(min(chunk, len(data) - i))
+                self.wfile.write(data[i:i + chunk])
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_blobs(count, size):
+    blobs = {}
+    for _ in range(count):
+        data = os.urandom(size)
+        blobs[hashlib.sha1(data).hexdigest()] = data
+    return blobs
+
+
+def make_jobs(blobs, base_url, target_dir):
+    return [{"url": f"{base_url}/{name}", "path": os.path.join(target_dir, name), "sha1": name, "size": len(data)}
+            for name, data in blobs.items()]
+
+
+def run_scenario(base_url, background, launch, background_class, launch_class, delay):
+    target = tempfile.mkdtemp(prefix="bench-prio-")
+    finished = {}
+    start = time.perf_counter()
+
+    def run(name, blobs, priority):
+        Downloader().download_all(make_jobs(blobs, base_url, os.path.join(target, name)), priority=priority)
+        finished[name] = time.perf_counter() - start
+
+    try:
+        bg = threading.Thread(target=run, args=("background", background, background_class))
+        bg.start()
+        time.sleep(delay)
+        launch_start = time.perf_counter()
+        run("launch", launch, launch_class)
+        finished["launch_only"] = time.perf_counter() - launch_start
+        bg.join()
+    finally:
+        shutil.rmtree(target, ignore_errors=True)
+    return finished
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--link-kbps", type=int, default=4096)
+    parser.add_argument("--background", type=int, default=40)
+    parser.add_argument("--launch", type=int, default=10)
+    parser.add_argument("--size", type=int, default=256 * 1024)
+    parser.add_argument("--delay", type=float, default=0.5, help="Seconds between background start and PLAY")
+    args = parser.parse_args()
+
+    background = make_blobs(args.background, args.size)
+    launch = make_blobs(args.launch, args.size)
+    server = start_server({**background, **launch}, Link(args.link_kbps * 1024))
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    alone = args.launch * args.size / (args.link_kbps * 1024)
+    print(f"link {args.link_kbps} KB/s; background {args.background} x {args.size // 1024} KB, "
+          f"launch {args.launch} x {args.size // 1024} KB (alone ~{alone:.1f}s)")
+
+    results = {}
+    for label, bg_class, launch_class in (("unscheduled", TransferScheduler.USER, TransferScheduler.USER),
+                                          ("scheduled", TransferScheduler.BACKGROUND, TransferScheduler.LAUNCH)):
+        r = run_scenario(base_url, background, launch, bg_class, launch_class, args.delay)
+        results[label] = r
+        first = "launch" if r["launch"] < r["background"] else "background"
+        print(f"{label:>12}: launch batch {r['launch_only']:6.2f}s after PLAY, "
+              f"background done at {r['background']:6.2f}s, {first} finished first")
+
+    print(f"launch speedup: {results['unscheduled']['launch_only'] / results['scheduled']['launch_only']:.1f}x, "
+          f"background paused {transfers.stats['background']['paused_seconds']:.1f}s (summed over workers)")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Headless command-line entry point.
+
+Uses LauncherCore, InstanceManager, ProfileManager and Config directly and
+never imports the UI (customtkinter / Pillow), so scripted launches on CI and
+lab machines start in a fraction of a second. LauncherCore itself is only
+imported by the commands that need it.
+
+    python cli.py instances
+    python cli.py create "Event 1" 1.20.1 Fabric
+    python cli.py install "Event 1"
+    python cli.py verify "Event 1" --repair
+    python cli.py launch "Event 1" --wait --log
+    python cli.py launch "Event 1" --offline
+    python cli.py prepare event.json
+    python cli.py mrpack pack.mrpack --name "Event 2"
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from utils.config import Config
+from utils.instance_manager import InstanceManager
+from utils.profiles import ProfileManager
+from utils.process_supervisor import ProcessSupervisor
+
+def get_core():
+    from launcher_core import LauncherCore
+    return LauncherCore()
+
+def resolve_target(name, loader=None):
+    """Instance name -> its settings; anything else is treated as a version id."""
+    inst = InstanceManager.get_instance(name)
+    if inst:
+        return {
+            "version": inst["version"],
+            "loader": inst["loader"],
+            "game_dir": inst["path"],
+            "loader_version": inst.get("loader_version"),
+            "jvm_preset": inst.get("jvm_preset"),
+            "placement": {k: inst[k] for k in ProcessSupervisor.PLACEMENT_KEYS if k in inst}
+        }
+    return {"version": name, "loader": loader or "None", "game_dir": None, "loader_version": None, "jvm_preset": None, "placement": None}
+
+def print_progress():
+    # Plain-text progress for the install callbacks
+    state = {"max": 0, "last": -1}
+
+    def set_progress(value):
+        if not state["max"] or not value:
+            return
+        percent = int(value * 100 / state["max"])
+        if percent != state["last"] and percent % 10 == 0:
+            state["last"] = percent
+            print(f"  {percent}%")
+
+    return {
+        "setStatus": lambda text: print(text),
+        "setProgress": set_progress,
+        "setMax": lambda value: state.update(max=value, last=-1)
+    }
+
+# --- Commands ---
+def cmd_instances(args):
+    instances = InstanceManager.load_instances()
+    if args.json:
+        print(json.dumps(instances, indent=4))
+        return 0
+    if not instances:
+        print("No instances.")
+        return 0
+    for name, inst in instances.items():
+        print(f"{name:<24} {inst['version']:<12} {inst['loader']:<8} {inst['path']}")
+    return 0
+
+def cmd_profiles(args):
+    ProfileManager.load()
+    current = ProfileManager.get_current_profile_data()
+    for p in ProfileManager.profiles:
+        marker = "*" if current and p["id"] == current["id"] else " "
+        print(f"{marker} {p['name']:<24} {p.get('type', 'offline')}")
+    return 0
+
+def cmd_versions(args):
+    core = get_core()
+    if args.installed:
+        versions = core.get_installed_versions()
+    else:
+        versions = [v for v in core.get_available_versions() if args.snapshots or v["type"] == "release"]
+    for v in versions:
+        print(f"{v['id']:<28} {v['type']}")
+    return 0
+
+def cmd_create(args):
+    if InstanceManager.get_instance(args.name):
+        print(f"Instance '{args.name}' already exists.")
+        return 1
+    inst = InstanceManager.create_instance(args.name, args.version, args.loader)
+    if args.preset:
+        InstanceManager.update_instance(args.name, jvm_preset=args.preset)
+    print(f"Created '{args.name}' ({inst['version']} {inst['loader']}) at {inst['path']}")
+    return 0
+
+def cmd_install(args):
+    core = get_core()
+    target = resolve_target(args.name, args.loader)
+    start = time.time()
+    version_id = core.install_and_get_version(target["version"], target["loader"], print_progress(), game_dir=target["game_dir"],
+                                              loader_version=args.loader_version or target["loader_version"])
+    print(f"Installed {version_id} in {time.time() - start:.1f}s")
+    return 0
+
+def cmd_verify(args):
+    core = get_core()
+    target = resolve_target(args.name, args.loader)
+    # The build the instance is pinned to, not the newest one installed
+    loader_version = args.loader_version or target["loader_version"]
+    if target["loader"] in ("None", "OptiFine", "NeoForge"):
+        version_id = target["version"]
+    else:
+        version_id = core.version_index.lookup(target["version"], target["loader"], loader_version)
+    if not version_id:
+        print(f"{target['loader']} {loader_version or ''} for {target['version']} is not installed.".replace("  ", " "))
+        return 1
+
+    if core.is_version_installed(version_id):
+        print(f"{version_id}: OK (all files match their stamps)")
+        if not args.deep:
+            return 0
+    else:
+        print(f"{version_id}: files changed or missing")
+        if not args.repair and not args.deep:
+            return 1
+
+    # Re-hash everything and download what's broken
+    from utils.version_installer import VersionInstaller
+    VersionInstaller(core.minecraft_dir, downloader=core.downloader).install(version_id, print_progress(), force=True)
+    print(f"{version_id}: verified")
+    return 0
+
+def cmd_launch(args):
+    core = get_core()
+    ProfileManager.load()
+    profile = ProfileManager.get_current_profile_data()
+    if args.profile:
+        profile = next((p for p in ProfileManager.profiles if p["name"] == args.profile), None)
+        if profile is None:
+            print(f"Profile '{args.profile}' not found.")
+            return 1
+
+    target = resolve_target(args.name, args.loader)
+    from utils.transfer_scheduler import transfers, TransferScheduler
+    with transfers.priority(TransferScheduler.LAUNCH):
+        version_id = core.install_and_get_version(target["version"], target["loader"], print_progress(), game_dir=target["game_dir"],
+                                                  loader_version=args.loader_version or target["loader_version"])
+
+    if args.log:
+        from utils.game_output import game_output
+        game_output.subscribe(lambda lines: print("\n".join(f"[{l['stream']}] {l['text']}" for l in lines), flush=True))
+
+    session = core.launch_game(version_id, profile["name"], profile.get("type", "offline"),
+                               game_dir=target["game_dir"], access_token=profile.get("access_token"),
+                               jvm_preset=args.preset or target["jvm_preset"], placement=target["placement"])
+    if session is None:
+        return 1
+
+    running = core.supervisor.list_games()
+    for game in running:
+        print(f"Running: {game['instance'] or game['version']} pid {game['pid']}")
+
+    if not args.wait:
+        return 0
+    try:
+        exit_codes = []
+        for game in running:
+            exit_codes.append(core.supervisor.wait(game["id"], args.timeout))
+    except KeyboardInterrupt:
+        print("Stopping game...")
+        core.supervisor.stop_all()
+        return 130
+    if None in exit_codes:
+        print("Timed out waiting for the game.")
+        return 1
+    # Give the output batches a moment to flush
+    time.sleep(0.3)
+    return exit_codes[0] if exit_codes else 0
+
+def cmd_prepare(args):
+    from utils.bulk_prepare import BulkPreparer
+    from utils.transfer_scheduler import transfers, TransferScheduler
+    entries = BulkPreparer.load_manifest(args.manifest)
+    with transfers.priority(TransferScheduler.BACKGROUND if args.background else TransferScheduler.USER):
+        summary = BulkPreparer(get_core()).prepare(entries, print_progress())
+    if args.json:
+        print(json.dumps(summary, indent=4))
+        return 0 if not summary["missing_mods"] else 1
+
+    for inst in summary["instances"]:
+        print(f"{inst['name']:<24} {inst['version_id']:<40} {inst['path']}")
+    for mod in summary["missing_mods"]:
+        print(f"No matching file for mod {mod}")
+    print(f"{len(entries)} instances ({summary['created']} new): {summary['vanilla_versions']} vanilla versions, "
+          f"{summary['loader_installs']} loader installs, {summary['mod_files']} mod files for {summary['mod_references']} mods")
+    print(f"Downloaded {summary['files_downloaded']} files ({summary['bytes_downloaded'] / (1024 * 1024):.1f} MB) "
+          f"in {summary['elapsed_seconds']}s")
+    print(f"Saved ~{summary['estimated_seconds_saved']}s and {summary['bytes_saved'] / (1024 * 1024):.1f} MB "
+          f"vs. one instance at a time (~{summary['estimated_sequential_seconds']}s)")
+    return 0 if not summary["missing_mods"] else 1
+
+def cmd_mrpack(args):
+    from utils.mrpack_installer import MrpackInstaller
+    start = time.time()
+    inst = MrpackInstaller().install(args.source, name=args.name, callback=print_progress())
+    print(f"Created '{inst['name']}' ({inst['version']} {inst['loader']} {inst.get('loader_version', '')}) at {inst['path']}")
+    print(f"{inst['files']} files ({inst['bytes_downloaded'] / (1024 * 1024):.1f} MB downloaded), "
+          f"{inst['overrides']} overrides in {time.time() - start:.1f}s")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="IEB-MC-Launcher headless CLI")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("instances", help="List instances")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_instances)
+
+    p = sub.add_parser("profiles", help="List profiles")
+    p.set_defaults(func=cmd_profiles)
+
+    p = sub.add_parser("versions", help="List Minecraft versions")
+    p.add_argument("--installed", action="store_true")
+    p.add_argument("--snapshots", action="store_true")
+    p.set_defaults(func=cmd_versions)
+
+    p = sub.add_parser("create", help="Create an instance")
+    p.add_argument("name")
+    p.add_argument("version")
+    p.add_argument("loader", choices=["None", "Forge", "Fabric", "Quilt", "NeoForge"])
+    p.add_argument("--preset", help="JVM preset for this instance")
+    p.set_defaults(func=cmd_create)
+
+    p = sub.add_parser("mrpack", help="Create an instance from a Modrinth modpack (.mrpack)")
+    p.add_argument("source", help="Path or URL of the .mrpack")
+    p.add_argument("--name", help="Instance name (default: the pack's name)")
+    p.set_defaults(func=cmd_mrpack)
+
+    p = sub.add_parser("prepare", help="Create and install many instances from a manifest")
+    p.add_argument("manifest", help="JSON file: {\"instances\": [{name, version, loader, loader_version, mods}]}")
+    p.add_argument("--json", action="store_true")
+    p.add_argument("--background", action="store_true", help="Yield bandwidth to launches and other downloads")
+    p.set_defaults(func=cmd_prepare)
+
+    for name, func, text in (("install", cmd_install, "Install an instance or version"),
+                             ("verify", cmd_verify, "Check an instance's files"),
+                             ("launch", cmd_launch, "Launch an instance or version")):
+        p = sub.add_parser(name, help=text)
+        p.add_argument("name", help="Instance name or Minecraft version")
+        p.add_argument("--loader", help="Loader when NAME is a version (Forge, Fabric, Quilt)")
+        p.add_argument("--loader-version", dest="loader_version")
+        p.set_defaults(func=func)
+        if name == "verify":
+            p.add_argument("--repair", action="store_true", help="Re-download broken files")
+            p.add_argument("--deep", action="store_true", help="Re-hash every file even if stamps match")
+        if name in ("install", "launch"):
+            p.add_argument("--offline", action="store_true", help="Use local files only, never the network")
+        if name == "launch":
+            p.add_argument("--profile", help="Profile name (default: current)")
+            p.add_argument("--preset", help="JVM preset override")
+            p.add_argument("--wait", action="store_true", help="Wait for the game to exit and return its exit code")
+            p.add_argument("--timeout", type=float, default=None, help="Seconds to wait with --wait")
+            p.add_argument("--log", action="store_true", help="Print game output")
+    return parser
+
+def main(argv=None):
+    # Same working directory as main.py (config.json, instances.json, profiles.json)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    Config.load()
+
+    args = build_parser().parse_args(argv)
+    if getattr(args, "offline", False):
+        from utils.offline_mode import OfflineMode
+        OfflineMode.go_offline("--offline", float("inf"))
+    try:
+        return args.func(args)
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
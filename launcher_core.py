@@ -2,50 +2,107 @@ import minecraft_launcher_lib
 import subprocess
 import os
 import uuid
+import json
+import time
 import platform
-import requests
+import threading
 from utils.config import Config
+from utils.downloader import Downloader
+from utils.version_installer import VersionInstaller
+from utils.version_manifest import VersionManifest
+from utils.launch_plan import LaunchPlanCache
+from utils.version_index import InstalledVersionIndex
+from utils.java_runtimes import JavaRegistry
+from utils.jvm_presets import JvmPresets
+from utils.game_output import game_output
+from utils.cds_archives import CdsArchives
+from utils.forge_processor_cache import ForgeProcessorCache
+from utils.process_supervisor import ProcessSupervisor
+from utils.launch_trace import tracer
+from utils.transfer_scheduler import transfers, TransferScheduler
+from utils.offline_mode import OfflineMode
+from utils.loader_catalog import LoaderCatalog
 
 # --- Monkeypatch for minecraft-launcher-lib crash (ValueError: too many values to unpack) ---
 from minecraft_launcher_lib.helper import parse_rule_list
 from minecraft_launcher_lib.natives import get_natives
 
+# Rule and natives results only depend on the library's "rules"/"natives" entries,
+# so they are memoized instead of re-evaluated for every library on every build.
+_library_info_cache = {}
+
+def _library_info(lib):
+    if "rules" not in lib and "natives" not in lib:
+        return True, ""
+    key = json.dumps([lib.get("rules"), lib.get("natives")], sort_keys=True)
+    info = _library_info_cache.get(key)
+    if info is None:
+        info = (parse_rule_list(lib, "rules", {}), get_natives(lib))
+        _library_info_cache[key] = info
+    return info
+
 def patched_get_libraries(data, path):
     if platform.system() == "Windows":
         classpath_seperator = ";"
     else:
         classpath_seperator = ":"
-    libstr = ""
+    libraries_dir = os.path.join(path, "libraries")
+    entries = []
     for i in data["libraries"]:
-        if not parse_rule_list(i, "rules", {}):
+        allowed, native = _library_info(i)
+        if not allowed:
             continue
-        current_path = os.path.join(path, "libraries")
         
         # PATCH: Robust split for names with classifiers (e.g. group:name:ver:classifier)
         parts = i["name"].split(":")
         lib_path, name, version = parts[0], parts[1], parts[2]
         
-        for lib_part in lib_path.split("."):
-            current_path = os.path.join(current_path, lib_part)
-        current_path = os.path.join(current_path, name, version)
-        native = get_natives(i)
         if native == "":
             jar_filename = name + "-" + version + ".jar"
         else:
             jar_filename = name + "-" + version + "-" + native + ".jar"
-        current_path = os.path.join(current_path, jar_filename)
-        libstr = libstr + current_path + classpath_seperator
+        entries.append(os.path.join(libraries_dir, *lib_path.split("."), name, version, jar_filename))
     if "jar" in data:
-        libstr = libstr + os.path.join(path, "versions", data["jar"], data["jar"] + ".jar")
+        entries.append(os.path.join(path, "versions", data["jar"], data["jar"] + ".jar"))
     else:
-        libstr = libstr + os.path.join(path, "versions", data["id"], data["id"] + ".jar")
-    return libstr
+        entries.append(os.path.join(path, "versions", data["id"], data["id"] + ".jar"))
+    return classpath_seperator.join(entries)
 
 # Apply Patch
 minecraft_launcher_lib.command.get_libraries = patched_get_libraries
 # -------------------------------------------------------------------------------------------
 
+# --- Route the loader installers through the parallel download engine ---
+# forge/fabric/quilt call install_minecraft_version (and forge install_libraries) internally,
+# which would otherwise download everything serially again.
+def pooled_install_minecraft_version(versionid, minecraft_directory, callback=None):
+    VersionInstaller(minecraft_directory).install(versionid, callback)
+
+def pooled_install_libraries(data, path, callback):
+    installer = VersionInstaller(path)
+    jobs = []
+    installer.collect_library_jobs(data, jobs)
+    installer.downloader.download_all(jobs, callback)
+
+for _loader_module in ("forge", "fabric", "quilt"):
+    _module = getattr(minecraft_launcher_lib, _loader_module, None)
+    if _module is not None and hasattr(_module, "install_minecraft_version"):
+        _module.install_minecraft_version = pooled_install_minecraft_version
+if hasattr(minecraft_launcher_lib.forge, "install_libraries"):
+    minecraft_launcher_lib.forge.install_libraries = pooled_install_libraries
+
+# Forge processors (Java remapping/patching of the client jar) reuse cached outputs
+def cached_forge_processors(data, minecraft_directory, lzma_path, installer_path, callback, java=None):
+    ForgeProcessorCache().run_processors(data, minecraft_directory, lzma_path, installer_path, callback, java)
+
+if hasattr(minecraft_launcher_lib.forge, "forge_processors"):
+    minecraft_launcher_lib.forge.forge_processors = cached_forge_processors
+# -------------------------------------------------------------------------------------------
+
 class LauncherCore:
+    # Launch traces wait this long for the game window before being written
+    TRACE_STARTUP_TIMEOUT = 180
+
     def __init__(self):
         raw_dir = Config.get("minecraft_dir")
         # Ensure dir exists first
@@ -58,6 +115,26 @@ class LauncherCore:
         # Convert to Short Path (Windows 8.3) to avoid encoding issues with Java
         self.minecraft_dir = self._get_short_path(raw_dir)
         print(f"Using Minecraft Dir: {self.minecraft_dir}")
+        
+        # Shared download engine (keep-alive session + worker pool)
+        self.downloader = Downloader()
+        
+        # Cached launch commands (classpath/arguments resolved once per version)
+        self.launch_plans = LaunchPlanCache(self.minecraft_dir)
+        
+        # (vanilla, loader, loader version) -> installed version id
+        self.version_index = InstalledVersionIndex(self.minecraft_dir)
+        
+        # Discovered Java runtimes with cached version probes
+        self.java_registry = JavaRegistry(self.minecraft_dir)
+        self.jvm_presets = JvmPresets(self.minecraft_dir)
+        self.cds_archives = CdsArchives(self.minecraft_dir, self.jvm_presets)
+        
+        # Every running game (PID, RSS, exit code, CPU/memory placement)
+        self.supervisor = ProcessSupervisor()
+        
+        # Loader installers share jars and detect their result from versions/, one at a time
+        self._loader_lock = threading.Lock()
 
     def _get_short_path(self, path):
         if os.name == 'nt':
@@ -76,22 +153,73 @@ class LauncherCore:
     def get_installed_versions(self):
         return minecraft_launcher_lib.utils.get_installed_versions(self.minecraft_dir)
 
-    def get_available_versions(self):
-        # Returns a list of versions from Mojang
-        return minecraft_launcher_lib.utils.get_available_versions(self.minecraft_dir)
+    def get_available_versions(self, force_refresh=False):
+        # Returns a list of versions from Mojang (served from the cached manifest,
+        # revalidated in the background) plus installed versions Mojang doesn't list
+        try:
+            versions = VersionManifest.get_versions(force=force_refresh)
+        except Exception as e:
+            # First run without a cached manifest: installed versions still work
+            OfflineMode.go_offline(f"version manifest unavailable ({e})")
+            versions = []
+        known = {v["id"] for v in versions}
+        for v in self.get_installed_versions():
+            if v["id"] not in known:
+                versions.append(v)
+        return versions
 
     def install_version(self, version_id, callback=None):
-        minecraft_launcher_lib.install.install_minecraft_version(
-            versionid=version_id,
-            minecraft_directory=self.minecraft_dir,
-            callback=callback
-        )
+        # Parallel install: libraries, assets, client jar and runtime are fetched
+        # concurrently instead of one after another.
+        # Already installed versions are answered from the install stamps (stat only).
+        installer = VersionInstaller(self.minecraft_dir, downloader=self.downloader)
+        before = self.downloader.stats()
+        with tracer.span("install_version", version=version_id) as span:
+            installer.install(version_id, callback)
+            after = self.downloader.stats()
+            span.update({k: after[k] - before[k] for k in after})
+        for key, value in span.items():
+            if key != "version":
+                tracer.count(key, value)
+
+    def is_version_installed(self, version_id):
+        return VersionInstaller(self.minecraft_dir, downloader=self.downloader).is_installed(version_id)
 
-    def install_and_get_version(self, vanilla_version, loader_type, callback=None, game_dir=None):
+    def install_and_get_version(self, vanilla_version, loader_type, callback=None, game_dir=None, loader_version=None):
         """
         Installs vanilla version if needed, then installs the requested loader 
         and returns the resulting version ID to launch.
+        Offline (forced, or Mojang unreachable) only local files are used.
         """
+        if OfflineMode.active():
+            return self.resolve_offline(vanilla_version, loader_type, loader_version)
+        try:
+            return self._install_and_get_version(vanilla_version, loader_type, callback, game_dir, loader_version)
+        except Exception as e:
+            if OfflineMode.network_available():
+                raise
+            print(f"Install failed without network ({e}), using local files")
+            return self.resolve_offline(vanilla_version, loader_type, loader_version)
+
+    def resolve_offline(self, vanilla_version, loader_type, loader_version=None):
+        """
+        Version id to launch, from local files only. Raises with the list of
+        what's missing instead of trying to download it.
+        """
+        with tracer.span("offline check", loader=loader_type):
+            version_id = vanilla_version
+            missing = []
+            if loader_type in ("Forge", "Fabric", "Quilt"):
+                version_id = self.version_index.lookup(vanilla_version, loader_type, loader_version)
+                if not version_id:
+                    missing.append(f"{loader_type} {loader_version or ''} for {vanilla_version} (not installed)".replace("  ", " "))
+            if version_id:
+                missing += VersionInstaller(self.minecraft_dir, downloader=self.downloader).check_local(version_id)
+        if missing:
+            raise OfflineMode.missing_error(missing)
+        return version_id
+
+    def _install_and_get_version(self, vanilla_version, loader_type, callback=None, game_dir=None, loader_version=None):
         # Determine target directory
         target_dir = game_dir if game_dir else self.minecraft_dir
         
@@ -112,55 +240,95 @@ class LauncherCore:
         
         if loader_type == "None":
             return vanilla_version
-            
-        elif loader_type == "Forge":
-            # Check if already installed?
-            # Ideally find installed forge version matching vanilla
-            # For simplicity, we run installer. 
-            # minecraft-launcher-lib has install_forge_version(versionid, path)
-            # which automatically finds latest forge for that version.
-            print(f"Installing Forge for {vanilla_version}...")
-            minecraft_launcher_lib.forge.install_forge_version(vanilla_version, self.minecraft_dir, callback=callback)
-            
-            # Find the ID of the installed forge version
-            # Usually generic convention or we need to search 'versions' folder
-            installed = self.get_installed_versions()
-            for v in installed:
-                if v["id"].startswith(f"{vanilla_version}-forge"):
-                    return v["id"]
-            # Fallback if naming is different (older forge)
-            # Try to find one containing both
-            for v in installed:
-                if vanilla_version in v["id"] and "forge" in v["id"].lower():
-                    return v["id"]
+        
+        if loader_type not in ("Forge", "Fabric", "Quilt"):
+            # OptiFine
+            # Mod Loaders that require manual jar running (OptiFine) are harder to automate 
+            # via minecraft-launcher-lib directly unless it supports it.
+            # Assuming manual install or unsupported for now, fallback to vanilla
+            print(f"Loader {loader_type} automation not fully supported yet, returning vanilla.")
+            return vanilla_version
+        
+        # Already installed loader build? O(1) index lookup, no installer run
+        with tracer.span("loader lookup", loader=loader_type):
+            version_id = self.version_index.lookup(vanilla_version, loader_type, loader_version)
+        if version_id:
+            self.install_version(version_id, callback)
+            return version_id
+        
+        with tracer.span("install_loader", loader=loader_type):
+            version_id = self.install_loader(vanilla_version, loader_type, loader_version, callback)
+        if version_id:
+            return version_id
+        
+        print(f"Could not determine installed {loader_type} version, returning vanilla.")
+        return vanilla_version
+
+    def install_loader(self, vanilla_version, loader_type, loader_version=None, callback=None):
+        """
+        Runs the loader installer and records the resulting version id in the
+        installed-version index. Returns the version id (or None). Installs
+        are serialized, so this is safe to call from several threads.
+        """
+        with self._loader_lock:
+            return self._install_loader(vanilla_version, loader_type, loader_version, callback)
+
+    def _install_loader(self, vanilla_version, loader_type, loader_version, callback):
+        versions_dir = os.path.join(self.minecraft_dir, "versions")
+        before = set(os.listdir(versions_dir)) if os.path.isdir(versions_dir) else set()
+        
+        if loader_type == "Forge":
+            # Forge versions look like "1.20.1-47.2.0"
+            if loader_version:
+                forge_version = f"{vanilla_version}-{loader_version}"
+            else:
+                loader_version = LoaderCatalog.latest("Forge", vanilla_version)
+                forge_version = f"{vanilla_version}-{loader_version}" if loader_version else minecraft_launcher_lib.forge.find_forge_version(vanilla_version)
+                if not forge_version:
+                    raise Exception(f"No Forge version found for {vanilla_version}")
+            loader_version = forge_version.split("-", 1)[1]
+            print(f"Installing Forge {forge_version}...")
+            minecraft_launcher_lib.forge.install_forge_version(forge_version, self.minecraft_dir, callback=callback)
+            expected_id = minecraft_launcher_lib.forge.forge_to_installed_version(forge_version)
                     
         elif loader_type == "Fabric":
-            print(f"Installing Fabric for {vanilla_version}...")
-            minecraft_launcher_lib.fabric.install_fabric(vanilla_version, self.minecraft_dir, callback=callback)
-            
-            # Find ID
-            installed = self.get_installed_versions()
-            for v in installed:
-                if "fabric" in v["id"].lower() and vanilla_version in v["id"]:
-                    return v["id"]
+            loader_version = loader_version or LoaderCatalog.latest("Fabric", vanilla_version) or minecraft_launcher_lib.fabric.get_latest_loader_version()
+            print(f"Installing Fabric {loader_version} for {vanilla_version}...")
+            minecraft_launcher_lib.fabric.install_fabric(vanilla_version, self.minecraft_dir, loader_version=loader_version, callback=callback)
+            expected_id = f"fabric-loader-{loader_version}-{vanilla_version}"
 
         elif loader_type == "Quilt":
-            print(f"Installing Quilt for {vanilla_version}...")
-            minecraft_launcher_lib.quilt.install_quilt(vanilla_version, self.minecraft_dir, callback=callback)
-            
-            installed = self.get_installed_versions()
-            for v in installed:
-                if "quilt" in v["id"].lower() and vanilla_version in v["id"]:
-                    return v["id"]
-        
-        # OptiFine
-        # Mod Loaders that require manual jar running (OptiFine) are harder to automate 
-        # via minecraft-launcher-lib directly unless it supports it.
-        # Assuming manual install or unsupported for now, fallback to vanilla
-        print(f"Loader {loader_type} automation not fully supported yet, returning vanilla.")
-        return vanilla_version
+            loader_version = loader_version or LoaderCatalog.latest("Quilt", vanilla_version) or minecraft_launcher_lib.quilt.get_latest_loader_version()
+            print(f"Installing Quilt {loader_version} for {vanilla_version}...")
+            minecraft_launcher_lib.quilt.install_quilt(vanilla_version, self.minecraft_dir, loader_version=loader_version, callback=callback)
+            expected_id = f"quilt-loader-{loader_version}-{vanilla_version}"
+        
+        else:
+            return None
+        
+        version_id = None
+        if os.path.isfile(os.path.join(versions_dir, expected_id, expected_id + ".json")):
+            version_id = expected_id
+        else:
+            # Naming differs (older Forge): take what the installer just created
+            created = [v for v in set(os.listdir(versions_dir)) - before
+                       if os.path.isfile(os.path.join(versions_dir, v, v + ".json"))]
+            if len(created) == 1:
+                version_id = created[0]
+        
+        if version_id:
+            self.version_index.record(vanilla_version, loader_type, loader_version, version_id)
+        return version_id
 
-    def launch_game(self, version_id, username, profile_type="offline", game_dir=None, access_token=None): 
+    def launch_game(self, version_id, username, profile_type="offline", game_dir=None, access_token=None, jvm_preset=None, placement=None): 
+        phase_start = time.time()
+        
+        # Offline nothing can be downloaded on the way: report everything missing up front
+        if OfflineMode.active():
+            missing = self._check_offline_launch(version_id, profile_type)
+            if missing:
+                raise OfflineMode.missing_error(missing)
+        
         # Java Path Logic
         java_path = Config.get("java_path", "java")
         final_java_path = None
@@ -170,50 +338,49 @@ class LauncherCore:
              final_java_path = java_path
              print(f"Using user-specified Java: {java_path}")
         else:
-             # Default: Try to use bundled runtime first
+             # Pick a runtime matching the version's javaVersion from the registry
+             # (probed once and cached; no scanning or network on a warm launch)
              try:
-                 vdata = minecraft_launcher_lib.utils.get_version_data(version_id, self.minecraft_dir)
-                 if "javaVersion" in vdata:
-                     component = vdata["javaVersion"]["component"]
-                     major_version = vdata["javaVersion"]["majorVersion"]
-                     
-                     # Check if runtime exists, if not install it
-                     from minecraft_launcher_lib.runtime import get_jvm_runtimes
-                     runtimes = get_jvm_runtimes()
+                 java_version = self._get_java_version(version_id)
+                 if java_version:
+                     component = java_version.get("component")
+                     major_version = java_version.get("majorVersion")
+                     final_java_path = self.java_registry.find(major_version, component)
                      
-                     # Check if we have this runtime installed
-                     runtime_path = os.path.join(self.minecraft_dir, "runtime", component)
-                     if not os.path.exists(runtime_path):
+                     if not final_java_path and component and not OfflineMode.active():
                          print(f"Installing Java {major_version} runtime...")
                          try:
-                             from minecraft_launcher_lib.runtime import install_jvm_runtime
-                             install_jvm_runtime(component, self.minecraft_dir, callback={
-                                 "setStatus": lambda x: print(f"Runtime: {x}"),
-                                 "setProgress": lambda x: None,
-                                 "setMax": lambda x: None
-                             })
+                             # Same download pool as the game files, launch-critical
+                             with transfers.priority(TransferScheduler.LAUNCH):
+                                 VersionInstaller(self.minecraft_dir, downloader=self.downloader).install_runtime(component, callback={
+                                     "setStatus": lambda x: print(f"Runtime: {x}")
+                                 })
                              print(f"Java {major_version} runtime installed successfully")
+                             final_java_path = self.java_registry.find(major_version, component)
                          except Exception as e:
                              print(f"Failed to install runtime: {e}")
-                             final_java_path = self._autodetect_java()
                      
-                     # DON'T set final_java_path - let library use bundled runtime
-                     print(f"Will use bundled Java {major_version} runtime")
+                     if final_java_path:
+                         print(f"Using Java {major_version} runtime")
+                     else:
+                         final_java_path = self._autodetect_java()
                  else:
-                     # No java version specified (old versions), use auto-detect
-                     final_java_path = self._autodetect_java()
+                     # No java version specified (old versions), these need Java 8
+                     final_java_path = self._autodetect_java(8)
                      print(f"Legacy version, using auto-detected Java")
              except Exception as e:
                  print(f"Error checking version data: {e}")
                  final_java_path = self._autodetect_java()
+        tracer.add_span("java runtime", phase_start, java=final_java_path)
 
         # Default options
-        options = {
-            "username": username,
-            "uuid": str(uuid.uuid4()),
-            "token": access_token if access_token else "",
-            "jvmArguments": self._get_jvm_args()
-        }
+        with tracer.span("jvm args"):
+            options = {
+                "username": username,
+                "uuid": str(uuid.uuid4()),
+                "token": access_token if access_token else "",
+                "jvmArguments": self._get_jvm_args(final_java_path, jvm_preset)
+            }
         
         if final_java_path:
             options["executablePath"] = final_java_path
@@ -226,7 +393,8 @@ class LauncherCore:
         
         # Ely.by Support
         if profile_type == "elyby":
-             authlib_path = self._check_authlib()
+             with tracer.span("authlib check"):
+                 authlib_path = self._check_authlib()
              if authlib_path:
                  # Add javaagent to JVM args
                  auth_arg = f"-javaagent:{authlib_path}=ely.by"
@@ -235,64 +403,135 @@ class LauncherCore:
              else:
                  print("Warning: Ely.by selected but authlib-injector could not be found/downloaded!")
 
-        command = minecraft_launcher_lib.command.get_minecraft_command(
-            version=version_id,
-            minecraft_directory=self.minecraft_dir,
-            options=options
-        )
+        # Only username/uuid/token are substituted when a plan for this version exists
+        with tracer.span("launch command"):
+            command = self.launch_plans.get_command(
+                version_id,
+                options,
+                lambda plan_options: minecraft_launcher_lib.command.get_minecraft_command(
+                    version=version_id,
+                    minecraft_directory=self.minecraft_dir,
+                    options=plan_options
+                )
+            )
+        
+        # Optional AppCDS: dump a class archive on the first run, map it afterwards
+        cds_mode, cds_key = None, None
+        if CdsArchives.enabled():
+            try:
+                phase_start = time.time()
+                java_info = self.java_registry.get_info(command[0]) if os.path.isabs(command[0]) else None
+                command, cds_mode, cds_key = self.cds_archives.apply(command, version_id, java_info.get("major") if java_info else None)
+            except Exception as e:
+                print(f"AppCDS setup failed, launching without it: {e}")
+            tracer.add_span("appcds", phase_start, mode=cds_mode)
+        
+        # Memory/CPU caps (cgroup scope) and fixed affinity / nice from the first JVM thread on
+        prefix, scope = self.supervisor.prepare_launch(placement)
+        command = prefix + command
         
         print(f"Launching command: {' '.join(command[:5])}...")  # Print first few args for debugging
         
         # Launch with output capture
         try:
+            spawn_start = time.time()
             process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
+                errors="replace",
                 bufsize=1
             )
             
-            # Start thread to monitor output
-            import threading
-            def monitor_output():
-                try:
-                    for line in process.stdout:
-                        print(f"[GAME] {line.strip()}")
-                    for line in process.stderr:
-                        print(f"[GAME ERROR] {line.strip()}")
-                except Exception as e:
-                    print(f"Error monitoring game output: {e}")
+            # Both streams are drained concurrently into a ring buffer + rotating log
+            session_name = os.path.basename(os.path.normpath(game_dir)) if game_dir else version_id
+            log_path = os.path.join(self.minecraft_dir, Config.CACHE_DIR_NAME, "logs", f"{session_name}.log")
+            session = game_output.start_session(process, session_name, log_path)
+            if cds_key:
+                self.cds_archives.track(session, cds_key, cds_mode)
             
-            threading.Thread(target=monitor_output, daemon=True).start()
+            # Tracked until exit; applies CPU affinity / nice / cgroup caps for the instance
+            self.supervisor.register(process, session, instance=session_name if game_dir else None,
+                                     version_id=version_id, placement=placement, scope=scope)
+            tracer.add_span("process spawn", spawn_start, pid=process.pid)
+            self._trace_game_startup(session, spawn_start)
             
             # Check if process started successfully
-            import time
             time.sleep(1)
             if process.poll() is not None:
                 # Process already exited
-                stdout, stderr = process.communicate()
                 print(f"Game crashed immediately!")
                 print(f"Exit code: {process.returncode}")
-                if stdout:
-                    print(f"STDOUT:\n{stdout}")
-                if stderr:
-                    print(f"STDERR:\n{stderr}")
+                session.join(timeout=2)
+                for line in session.tail(50):
+                    print(f"[{line['stream']}] {line['text']}")
             else:
                 print("Game process started successfully")
+            return session
                 
         except Exception as e:
             print(f"Failed to launch game: {e}")
             import traceback
             traceback.print_exc()
 
+    def _trace_game_startup(self, session, spawn_start):
+        # The game's first log lines arrive after launch_game returned, so the
+        # session finishes the trace (window up, game exit or timeout)
+        trace = tracer.current()
+        if trace is None:
+            return
+        trace.deferred = True
+        
+        def on_first_line(line):
+            trace.instant("first game log line", line["time"], text=line["text"][:200])
+        
+        def on_window(line):
+            trace.add_span("game startup", spawn_start, line["time"], marker=line["text"][:200])
+            tracer.finish(trace)
+        
+        session.watch([""], on_first_line)
+        session.watch(CdsArchives.STARTUP_MARKERS, on_window)
+        session.on_exit(lambda s: tracer.finish(trace))
+        timer = threading.Timer(self.TRACE_STARTUP_TIMEOUT, lambda: tracer.finish(trace))
+        timer.daemon = True
+        timer.start()
+
+    def _check_offline_launch(self, version_id, profile_type):
+        """What launch_game would have to download: Java runtime and authlib jar."""
+        missing = []
+        java_path = Config.get("java_path", "java")
+        if java_path != "java" and java_path:
+            if not os.path.isfile(java_path):
+                missing.append(f"Java at {java_path} (java_path setting)")
+        else:
+            try:
+                java_version = self._get_java_version(version_id)
+                if java_version:
+                    if not self.java_registry.find(java_version.get("majorVersion"), java_version.get("component")):
+                        missing.append(f"Java {java_version.get('majorVersion')} runtime ({java_version.get('component')})")
+                elif not self._autodetect_java(8):
+                    # Legacy versions run on whatever Java is installed, like online
+                    missing.append("a Java installation (Java 8 for legacy versions)")
+            except Exception as e:
+                missing.append(f"version {version_id} ({e})")
+        if profile_type == "elyby" and not os.path.exists(self._authlib_path()):
+            missing.append(f"authlib-injector jar ({self._authlib_path()})")
+        return missing
+
+    def _authlib_path(self):
+        return os.path.join(os.getcwd(), "authlib", "authlib-injector.jar")
+
     def _check_authlib(self):
         """Checks for authlib-injector, downloads if missing."""
-        lib_dir = os.path.join(os.getcwd(), "authlib")
+        jar_path = self._authlib_path()
+        lib_dir = os.path.dirname(jar_path)
         if not os.path.exists(lib_dir):
             os.makedirs(lib_dir)
-            
-        jar_path = os.path.join(lib_dir, "authlib-injector.jar")
+        
+        if not os.path.exists(jar_path) and OfflineMode.active():
+            print("authlib-injector is not cached and the launcher is offline")
+            return None
         
         if not os.path.exists(jar_path):
             print("Downloading authlib-injector...")
@@ -300,78 +539,50 @@ class LauncherCore:
                 # Using latest release from yushijinhun's authlib-injector
                 # Direct link to stable version (e.g. 1.2.5) or latest
                 url = "https://github.com/yushijinhun/authlib-injector/releases/download/v1.2.5/authlib-injector-1.2.5.jar"
-                response = requests.get(url, stream=True)
-                if response.status_code == 200:
-                    with open(jar_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                    print("Authlib-injector downloaded.")
-                    return jar_path
-                else:
-                    print(f"Failed to download authlib: {response.status_code}")
-                    return None
+                # Through the download pool: retries, .part file, a LAUNCH batch the scheduler sees
+                self.downloader.download_file({"url": url, "path": jar_path, "sha1": None}, priority=TransferScheduler.LAUNCH)
+                print("Authlib-injector downloaded.")
+                return jar_path
             except Exception as e:
                 print(f"Error downloading authlib: {e}")
                 return None
         return jar_path
 
-    def _autodetect_java(self):
-        # 1. Check JAVA_HOME
-        jh = os.environ.get("JAVA_HOME")
-        if jh:
-            bin_java = os.path.join(jh, "bin", "javaw.exe" if os.name == 'nt' else "java")
-            if os.path.exists(bin_java): return bin_java
-            
-        # 2. Scan Common Windows Paths
-        if os.name == 'nt':
-            search_paths = [
-                r"C:\Program Files\Java",
-                r"C:\Program Files (x86)\Java",
-                r"C:\Program Files\Eclipse Adoptium",
-                r"C:\Users\Public\Java"
-            ]
-            
-            candidates = []
-            for path in search_paths:
-                if os.path.exists(path):
-                    try:
-                        for entry in os.scandir(path):
-                            if entry.is_dir() and (entry.name.startswith("jdk") or entry.name.startswith("jre")):
-                                jpath = os.path.join(entry.path, "bin", "javaw.exe")
-                                if os.path.exists(jpath):
-                                    candidates.append(jpath)
-                    except: pass
-            
-            # Smart Selection: Prefer JDK over JRE, Newer versions (lexicographically roughly works for jdk-17 vs jdk-1.8)
-            if candidates:
-                candidates.sort(reverse=True) # Sort to get likely newer versions first (e.g. jdk-17 > jdk-11)
-                return candidates[0]
-                
-        # 3. Path fallback
-        import shutil
-        return shutil.which("javaw") or shutil.which("java")
+    def _autodetect_java(self, major_version=None):
+        # Cached registry of JAVA_HOME, common install roots and PATH
+        java_path = self.java_registry.find(major_version)
+        if java_path is None and major_version is not None:
+            # Nothing with the right major version, better than failing outright
+            java_path = self.java_registry.find()
+        if java_path is None:
+            import shutil
+            return shutil.which("javaw") or shutil.which("java")
+        return java_path
 
-    def _get_jvm_args(self):
+    def _get_java_version(self, version_id):
+        """javaVersion from the version JSON, following inheritsFrom."""
+        current = version_id
+        for _ in range(8):
+            json_path = os.path.join(self.minecraft_dir, "versions", current, current + ".json")
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if "javaVersion" in data:
+                return data["javaVersion"]
+            current = data.get("inheritsFrom")
+            if not current:
+                return None
+        return None
+
+    def _get_jvm_args(self, java_path=None, jvm_preset=None):
         ram = int(Config.get("ram", 2048))
-        fps_boost = Config.get("fps_boost", False)
-        
-        # Base RAM args
-        # Note: minecraft-launcher-lib handles Xmx/Xms via 'jvmArguments' if passed as list? 
-        # Actually get_minecraft_command usually handles RAM if passed in options specifically?
-        # Checking docs/usage: typically one passes "jvmArguments": ["-Xmx2G", ...]
+        preset = jvm_preset or JvmPresets.get_global_preset()
         
-        args = [f"-Xmx{ram}M", "-Xms128M"]
+        # Flags are picked for the runtime's major version and checked against
+        # what that JVM supports (the old fps_boost flags broke modern Java)
+        major_version = None
+        if java_path:
+            info = self.java_registry.get_info(java_path)
+            if info:
+                major_version = info.get("major")
         
-        if fps_boost:
-            try:
-                cpu_count = os.cpu_count() or 4
-                args.extend([
-                    "-XX:+UnlockExperimentalVMOptions",
-                    f"-XX:ParallelGCThreads={cpu_count * 2}",
-                    "-XX:+AggressiveOpts",
-                    "-XX:+AggressiveHeap"
-                ])
-            except:
-                pass
-                
-        return args
+        return self.jvm_presets.build_args(preset, java_path, major_version, ram)
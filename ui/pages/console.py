@@ -1,6 +1,13 @@
+import time
 import customtkinter as ctk
+from collections import deque
+from utils.game_output import game_output
 
 class ConsolePage(ctk.CTkFrame):
+    # Textbox is trimmed to this many lines; the full stream is in the log file
+    MAX_LINES = 2000
+    POLL_MS = 200
+
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -16,7 +23,41 @@ class ConsolePage(ctk.CTkFrame):
         
         self.log("Launcher initialized.")
         self.log("Ready to launch Minecraft.")
+        
+        # Game output arrives in batches on a worker thread; the UI thread picks
+        # them up on a timer and inserts them with a single textbox update
+        self.pending = deque(maxlen=self.MAX_LINES)
+        self.line_count = 0
+        game_output.subscribe(self.on_game_output)
+        self.after(self.POLL_MS, self.poll_output)
 
     def log(self, message):
         self.log_area.insert("end", f"> {message}\n")
         self.log_area.see("end")
+
+    def on_game_output(self, lines):
+        self.pending.extend(lines)
+
+    def poll_output(self):
+        try:
+            if self.pending:
+                lines = []
+                while self.pending:
+                    lines.append(self.pending.popleft())
+                text = "".join(
+                    f"{time.strftime('%H:%M:%S', time.localtime(l['time']))} [{l['stream']}] {l['text']}\n"
+                    for l in lines
+                )
+                self.log_area.insert("end", text)
+                self.line_count += len(lines)
+                
+                # Keep the widget bounded
+                extra = self.line_count - self.MAX_LINES
+                if extra > 0:
+                    self.log_area.delete("1.0", f"{extra + 1}.0")
+                    self.line_count -= extra
+                self.log_area.see("end")
+        except Exception as e:
+            print(f"Console update error: {e}")
+        finally:
+            self.after(self.POLL_MS, self.poll_output)
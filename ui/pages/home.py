@@ -1,6 +1,7 @@
 import customtkinter as ctk
 import tkinter as tk
 import threading
+from tkinter import messagebox
 from PIL import Image, ImageTk, ImageFilter
 from launcher_core import LauncherCore
 from utils.profiles import ProfileManager
@@ -8,6 +9,11 @@ from utils.config import Config
 from utils.discord_rpc import rpc_client
 
 from utils.instance_manager import InstanceManager
+from utils.version_manifest import VersionManifest
+from utils.process_supervisor import ProcessSupervisor
+from utils.launch_trace import tracer
+from utils.offline_mode import OfflineMode
+from utils.transfer_scheduler import transfers, TransferScheduler
 import os
 
 class HomePage(ctk.CTkFrame):
@@ -60,6 +66,8 @@ class HomePage(ctk.CTkFrame):
         
         # Start fetch
         self.mojang_versions = [] # Cache
+        # Cached manifest fills the list instantly; refresh it when a newer one arrives
+        VersionManifest.add_listener(self.on_manifest_update)
         threading.Thread(target=self.load_versions, daemon=True).start()
         
         # Bind Resize
@@ -136,7 +144,7 @@ class HomePage(ctk.CTkFrame):
         # Refresh Button
         self.btn_refresh = ctk.CTkButton(self, text="↻", width=30, height=28, 
                                          font=("Arial", 16, "bold"), fg_color="#333", hover_color="#555",
-                                         command=lambda: threading.Thread(target=self.load_versions, daemon=True).start())
+                                         command=lambda: threading.Thread(target=self.load_versions, args=(True,), daemon=True).start())
         update_window("win_refresh", self.btn_refresh, start_x, row2_y, anchor="w")
         
         update_text("lbl_ver", start_x + 45, row2_y, "Version:", font=("Arial", 14), anchor="w")
@@ -168,12 +176,16 @@ class HomePage(ctk.CTkFrame):
              # Update coords in case resize happened
              self.canvas.coords(self.text_ids["status"], cx, status_y)
 
-    def load_versions(self):
+    def on_manifest_update(self, versions):
+        # Called from the revalidation thread
+        threading.Thread(target=self.load_versions, daemon=True).start()
+
+    def load_versions(self, force_refresh=False):
         try:
              self.update_status("Loading versions...")
              
-             # Fetch Mojang Versions (Slow)
-             versions = self.launcher.get_available_versions()
+             # Cached Mojang manifest (revalidated in the background)
+             versions = self.launcher.get_available_versions(force_refresh=force_refresh)
              show_snapshots = Config.get("show_snapshots", False)
              
              self.mojang_versions = []
@@ -184,7 +196,7 @@ class HomePage(ctk.CTkFrame):
                      self.mojang_versions.append(v["id"])
              
              self.refresh_version_list()
-             self.update_status("Ready")
+             self.update_status("Ready (offline)" if OfflineMode.active() else "Ready")
         except Exception as e:
              self.update_status(f"Error loading versions: {e}")
              import traceback
@@ -245,13 +257,17 @@ class HomePage(ctk.CTkFrame):
         threading.Thread(target=self._launch_thread, args=(version_selection, profile)).start()
 
     def _launch_thread(self, version_selection, profile):
+        # Span trace of this launch (Statistics page / launcher_cache/traces)
+        trace = tracer.begin(f"Launch {version_selection}")
         try:
             self.update_status("Preparing...")
             
+            # Progress is reported as a count against setMax (aggregate over all files)
+            progress_max = {"value": 100}
             callbacks = {
                 "setStatus": lambda t: self.update_status(t),
-                "setProgress": lambda v: self.progress_bar.set(v/100) if v else None,
-                "setMax": lambda m: None
+                "setProgress": lambda v: self.progress_bar.set(min(1, v / progress_max["value"])) if v and progress_max["value"] else None,
+                "setMax": lambda m: progress_max.update(value=m)
             }
             
             # Check if Instance or Standard
@@ -264,18 +280,30 @@ class HomePage(ctk.CTkFrame):
                 version = inst["version"]
                 loader = inst["loader"]
                 game_dir = inst["path"] # Use isolated game dir
+                loader_version = inst.get("loader_version") # Pinned by modpacks
+                jvm_preset = inst.get("jvm_preset") # None -> global preset
+                placement = {k: inst[k] for k in ProcessSupervisor.PLACEMENT_KEYS if k in inst}
             else:
                 loader = self.loader_type.get()
                 version = version_selection
                 game_dir = None # Default
+                loader_version = None
+                jvm_preset = None
+                placement = None
                 
-            launch_ver_id = self.launcher.install_and_get_version(version, loader, callbacks, game_dir=game_dir)
+            # Game files for PLAY go ahead of mod downloads and background installs
+            with tracer.span("install_and_get_version", version=version, loader=loader), transfers.priority(TransferScheduler.LAUNCH):
+                launch_ver_id = self.launcher.install_and_get_version(version, loader, callbacks, game_dir=game_dir, loader_version=loader_version)
             
             self.update_status("Launching Game...")
             rpc_client.update_presence("In Game", f"Playing {version} ({loader})")
             
-            self.launcher.launch_game(launch_ver_id, profile["name"], profile.get("type", "offline"), game_dir=game_dir)
+            with tracer.span("launch_game", version=launch_ver_id):
+                session = self.launcher.launch_game(launch_ver_id, profile["name"], profile.get("type", "offline"), game_dir=game_dir, jvm_preset=jvm_preset, placement=placement)
             
+            warnings = self.launcher.supervisor.warnings(session) if session else []
+            if warnings:
+                self.after(0, lambda: messagebox.showwarning("Instance limits", "\n".join(warnings)))
             self.update_status("Game Launched!")
             rpc_client.update_presence("In Launcher", "Idle")
         except Exception as e:
@@ -283,5 +311,6 @@ class HomePage(ctk.CTkFrame):
              import traceback
              traceback.print_exc()
         finally:
+            tracer.release(trace)
             self.play_button.configure(state="normal", text="PLAY")
             self.canvas.itemconfigure(self.prog_win_id, state="hidden")
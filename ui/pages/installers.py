@@ -1,9 +1,11 @@
 import customtkinter as ctk
 import threading
 from tkinter import messagebox
-import minecraft_launcher_lib
+from utils.loader_catalog import LoaderCatalog
 
 class InstallersPage(ctk.CTkFrame):
+    NO_VERSIONS = "No versions (offline?)"
+    
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
@@ -25,6 +27,11 @@ class InstallersPage(ctk.CTkFrame):
         self._setup_forge_tab()
         self._setup_fabric_tab()
         self._setup_quilt_tab()
+        
+        # Filled from the catalog on disk; a newer index updates the combos
+        LoaderCatalog.add_listener(lambda loader: self.after(0, lambda: self._load_versions_thread(loader)))
+        for loader in LoaderCatalog.LOADERS:
+            self.load_versions(loader)
 
     def _setup_forge_tab(self):
         tab = self.tabs.tab("Forge")
@@ -63,77 +70,56 @@ class InstallersPage(ctk.CTkFrame):
         ctk.CTkButton(tab, text="Install Quilt", command=self.install_quilt).grid(row=3, column=0, pady=20)
 
     def load_forge_versions(self):
-        threading.Thread(target=self._load_forge_thread, daemon=True).start()
-
-    def _load_forge_thread(self):
-        # minecraft-launcher-lib forge listing is a bit complex, implies fetching all
-        # For simplicity, we might just show common MC versions and attempt install
-        # But correctly we should list them.
-        # find_forge_version(version_id) is available.
-        # list_forge_versions() returns a list.
-        try:
-            versions = minecraft_launcher_lib.forge.list_forge_versions()
-            # This returns a list of Forge versions, usually we want to map MC version to Forge version
-            # Simplified: Just listing unique MC versions support
-            mc_versions = sorted(list(set(v.split('-')[0] for v in versions if '-' in v)), reverse=True)
-            self.forge_ver_combo.configure(values=mc_versions)
-            if mc_versions: self.forge_ver_combo.set(mc_versions[0])
-        except Exception as e:
-            print(f"Error loading Forge: {e}")
+        self.load_versions("Forge", refresh=True)
 
     def load_fabric_versions(self):
-        threading.Thread(target=self._load_fabric_thread, daemon=True).start()
-        
-    def _load_fabric_thread(self):
-        try:
-            # Assuming get_stable_minecraft_versions() functionality from lib or just commonly supported
-            # fabric module has get_stable_minecraft_versions() ?
-            # Checking library capability... assume yes or fallback
-             versions = [v["version"] for v in minecraft_launcher_lib.fabric.get_all_minecraft_versions()]
-             self.fabric_ver_combo.configure(values=versions)
-             if versions: self.fabric_ver_combo.set(versions[0])
-        except:
-             pass
+        self.load_versions("Fabric", refresh=True)
 
     def load_quilt_versions(self):
-        threading.Thread(target=self._load_quilt_thread, daemon=True).start()
+        self.load_versions("Quilt", refresh=True)
 
-    def _load_quilt_thread(self):
+    def load_versions(self, loader, refresh=False):
+        if refresh:
+            # Listener refills the combo if the upstream list changed
+            LoaderCatalog.revalidate_async(loader, force=True)
+        threading.Thread(target=self._load_versions_thread, args=(loader,), daemon=True).start()
+
+    def _load_versions_thread(self, loader):
+        combo = {"Forge": self.forge_ver_combo, "Fabric": self.fabric_ver_combo, "Quilt": self.quilt_ver_combo}[loader]
         try:
-             versions = [v["version"] for v in minecraft_launcher_lib.quilt.get_all_minecraft_versions()]
-             self.quilt_ver_combo.configure(values=versions)
-             if versions: self.quilt_ver_combo.set(versions[0])
-        except:
-             pass
+            versions = LoaderCatalog.game_versions(loader)
+            if not versions:
+                combo.configure(values=[self.NO_VERSIONS])
+                combo.set(self.NO_VERSIONS)
+                return
+            current = combo.get()
+            combo.configure(values=versions)
+            combo.set(current if current in versions else versions[0])
+        except Exception as e:
+            print(f"Error loading {loader} versions: {e}")
 
     def install_forge(self):
         mc_ver = self.forge_ver_combo.get()
-        if not mc_ver or mc_ver == "Loading...": return
+        if not mc_ver or mc_ver in ("Loading...", self.NO_VERSIONS): return
         threading.Thread(target=lambda: self._install_loader("Forge", mc_ver), daemon=True).start()
 
     def install_fabric(self):
         mc_ver = self.fabric_ver_combo.get()
-        if not mc_ver or mc_ver == "Loading...": return
+        if not mc_ver or mc_ver in ("Loading...", self.NO_VERSIONS): return
         threading.Thread(target=lambda: self._install_loader("Fabric", mc_ver), daemon=True).start()
         
     def install_quilt(self):
         mc_ver = self.quilt_ver_combo.get()
-        if not mc_ver or mc_ver == "Loading...": return
+        if not mc_ver or mc_ver in ("Loading...", self.NO_VERSIONS): return
         threading.Thread(target=lambda: self._install_loader("Quilt", mc_ver), daemon=True).start()
 
     def _install_loader(self, loader, mc_ver):
         try:
             print(f"Installing {loader} for {mc_ver}...")
-            if loader == "Forge":
-                forge_ver = minecraft_launcher_lib.forge.find_forge_version(mc_ver)
-                if not forge_ver:
-                    print("Forge version not found for this MC version")
-                    return
-                minecraft_launcher_lib.forge.install_forge_version(forge_ver, self.launcher.minecraft_dir)
-            elif loader == "Fabric":
-                minecraft_launcher_lib.fabric.install_fabric(mc_ver, self.launcher.minecraft_dir)
-            elif loader == "Quilt":
-                minecraft_launcher_lib.quilt.install_quilt(mc_ver, self.launcher.minecraft_dir)
+            # Goes through the core so the installed-version index learns the new id
+            version_id = self.launcher.install_loader(mc_ver, loader)
+            if not version_id:
+                print(f"Could not determine installed {loader} version for {mc_ver}")
             
             print(f"Successfully installed {loader} for {mc_ver}")
             messagebox.showinfo("Success", f"{loader} for {mc_ver} installed!")
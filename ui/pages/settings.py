@@ -2,6 +2,7 @@ import customtkinter as ctk
 from tkinter import messagebox
 from utils.config import Config
 from utils.file_installer import FileInstaller
+from utils.jvm_presets import JvmPresets
 
 class SettingsPage(ctk.CTkFrame):
     def __init__(self, parent, controller):
@@ -27,9 +28,19 @@ class SettingsPage(ctk.CTkFrame):
         self.adv_frame = ctk.CTkFrame(self, fg_color="transparent")
         self.adv_frame.grid(row=3, column=0, sticky="ew", padx=20, pady=5)
         
-        self.fps_boost_var = ctk.BooleanVar(value=Config.get("fps_boost", False))
-        self.fps_boost_check = ctk.CTkCheckBox(self.adv_frame, text="FPS Boost (Optimized JVM Args)", variable=self.fps_boost_var, command=self.save_extras)
-        self.fps_boost_check.pack(side="left", padx=(0, 20))
+        # JVM tuning preset (replaces the old FPS Boost checkbox); instances can override it
+        ctk.CTkLabel(self.adv_frame, text="JVM Preset:").pack(side="left", padx=(0, 10))
+        self.preset_combo = ctk.CTkComboBox(self.adv_frame, values=list(JvmPresets.PRESETS.values()), width=180, command=lambda _: self.save_extras())
+        self.preset_combo.set(JvmPresets.PRESETS[JvmPresets.get_global_preset()])
+        self.preset_combo.pack(side="left", padx=(0, 20))
+        
+        self.cds_var = ctk.BooleanVar(value=Config.get("appcds", False))
+        self.cds_check = ctk.CTkCheckBox(self.adv_frame, text="AppCDS (Faster Startup)", variable=self.cds_var, command=self.save_extras)
+        self.cds_check.pack(side="left", padx=(0, 20))
+        
+        self.offline_var = ctk.BooleanVar(value=Config.get("offline_mode", False))
+        self.offline_check = ctk.CTkCheckBox(self.adv_frame, text="Offline Mode", variable=self.offline_var, command=self.save_extras)
+        self.offline_check.pack(side="left", padx=(0, 20))
         
         self.snap_var = ctk.BooleanVar(value=Config.get("show_snapshots", False))
         self.snap_check = ctk.CTkCheckBox(self.adv_frame, text="Show Snapshots", variable=self.snap_var, command=self.save_extras)
@@ -102,7 +113,10 @@ class SettingsPage(ctk.CTkFrame):
     def save_settings(self):
         Config.set("ram", int(self.ram_slider.get()))
         Config.set("theme", self.theme_combo.get())
-        Config.set("fps_boost", self.fps_boost_var.get())
+        labels = {label: key for key, label in JvmPresets.PRESETS.items()}
+        Config.set("jvm_preset", labels.get(self.preset_combo.get(), JvmPresets.DEFAULT_PRESET))
         Config.set("show_snapshots", self.snap_var.get())
+        Config.set("appcds", self.cds_var.get())
+        Config.set("offline_mode", self.offline_var.get())
         Config.set("java_path", self.java_entry.get())
         print("Settings saved")
@@ -1,5 +1,8 @@
 import customtkinter as ctk
+import time
 from utils.config import Config
+from utils.launch_trace import tracer
+from utils.http_client import http_client
 import random
 
 class StatisticsPage(ctk.CTkFrame):
@@ -21,6 +24,45 @@ class StatisticsPage(ctk.CTkFrame):
         self._create_stat_card("Total Launches", f"{launches}", 0, 1)
         self._create_stat_card("Last Playing", "2 days ago", 1, 0)
         self._create_stat_card("Favorite Version", "1.8.9", 1, 1)
+        
+        # Recent launch traces (where the seconds went between PLAY and the game window)
+        ctk.CTkLabel(self, text="Recent Launches", font=ctk.CTkFont(size=18, weight="bold")).grid(row=3, column=0, columnspan=2, pady=(10, 5))
+        self.grid_rowconfigure(4, weight=1)
+        self.trace_list = ctk.CTkTextbox(self, height=220, font=ctk.CTkFont(family="Consolas", size=12))
+        self.trace_list.grid(row=4, column=0, columnspan=2, padx=20, pady=(0, 20), sticky="nsew")
+        
+        self.bind('<Map>', lambda e: self.load_traces())
+        self.load_traces()
+
+    def load_traces(self, limit=10):
+        lines = []
+        for trace in tracer.list_traces(limit):
+            when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(trace.get("started", 0)))
+            lines.append(f"{when}  {trace.get('name', '?')}  total {trace.get('total_ms', 0) / 1000:.1f}s")
+            
+            # Slowest phases first
+            phases = sorted(trace.get("phases", {}).items(), key=lambda kv: kv[1], reverse=True)
+            for name, ms in phases[:6]:
+                lines.append(f"    {name:<26} {ms / 1000:>7.2f}s")
+            counters = trace.get("counters", {})
+            if counters:
+                mb = counters.get("bytes_downloaded", 0) / (1024 * 1024)
+                lines.append(f"    downloaded {mb:.1f} MB in {counters.get('files_downloaded', 0)} files, {counters.get('files_checked', 0)} files checked")
+            lines.append(f"    {trace.get('path', '')}")
+            lines.append("")
+        
+        # Where network time went since the launcher started
+        endpoints = http_client.stats()
+        if endpoints:
+            lines.append("Network (this session)")
+            for name, s in list(endpoints.items())[:10]:
+                lines.append(f"    {name:<34} {s['requests']:>5} req  {s['bytes'] / (1024 * 1024):>7.1f} MB  "
+                             f"avg {s['avg_ms']:>6.0f} ms  max {s['max_ms']:>6.0f} ms  {s['retries']} retries  {s['errors']} errors")
+        
+        self.trace_list.configure(state="normal")
+        self.trace_list.delete("1.0", "end")
+        self.trace_list.insert("end", "\n".join(lines) if lines else "No launches recorded yet.")
+        self.trace_list.configure(state="disabled")
 
     def _create_stat_card(self, title, value, row, col):
         card = ctk.CTkFrame(self)
@@ -0,0 +1,127 @@
+import customtkinter as ctk
+
+class VirtualList(ctk.CTkFrame):
+    """
+    Scrolling list that only creates enough row widgets to fill the view.
+
+    Rows come from make_row(parent) and are re-bound to data with
+    bind_row(row, item) as they scroll into view, so the widget count stays
+    the same for 20 or 20,000 items. on_need_more() is called when the view
+    gets within PREFETCH rows of the last loaded item and more are known to
+    exist (total), to load the next page.
+    """
+    PREFETCH = 10
+    WHEEL_ROWS = 1
+
+    def __init__(self, parent, make_row, bind_row, row_height, on_need_more=None, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+        self.on_need_more = on_need_more
+        self.items = []
+        self.total = 0
+        self.offset = 0 # pixels scrolled
+        self.pool = [] # [(row, bound index)]
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self.viewport = ctk.CTkFrame(self, fg_color="transparent")
+        self.viewport.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.message = ctk.CTkLabel(self.viewport, text="")
+
+        self.viewport.bind("<Configure>", lambda e: self._fill_pool())
+        self._bind_wheel(self.viewport)
+
+    # --- Data ---
+    def set_items(self, items, total=None):
+        self.items = list(items)
+        self.total = len(self.items) if total is None else total
+        self.offset = 0
+        self.message.place_forget()
+        self._invalidate()
+        self._render()
+
+    def append(self, items, total=None):
+        self.items.extend(items)
+        if total is not None:
+            self.total = total
+        self._render()
+
+    def set_message(self, text):
+        """Shows text instead of rows (empty result, errors)."""
+        self.items = []
+        self.total = 0
+        self.offset = 0
+        self._render()
+        self.message.configure(text=text)
+        self.message.place(relx=0.5, y=20, anchor="n")
+
+    def _invalidate(self):
+        # Rows re-bind on the next render (the data behind an index changed)
+        self.pool = [(row, None) for row, _ in self.pool]
+
+    # --- Rows ---
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel, add="+")
+        widget.bind("<Button-4>", lambda e: self.scroll_by(-self.WHEEL_ROWS * self.row_height), add="+")
+        widget.bind("<Button-5>", lambda e: self.scroll_by(self.WHEEL_ROWS * self.row_height), add="+")
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    def _fill_pool(self):
+        # One row per visible slot plus a partial row at each edge; only grows with the window
+        needed = self.viewport.winfo_height() // self.row_height + 2
+        while len(self.pool) < needed:
+            row = self.make_row(self.viewport)
+            self._bind_wheel(row)
+            self.pool.append((row, None))
+        self._render()
+
+    def _render(self):
+        height = self.viewport.winfo_height()
+        content = len(self.items) * self.row_height
+        self.offset = max(0, min(self.offset, content - height))
+        first = self.offset // self.row_height
+
+        # Item i always uses slot i % pool size, so scrolling by a row re-binds one row
+        for index in range(first, first + len(self.pool)):
+            slot = index % len(self.pool)
+            row, bound = self.pool[slot]
+            if index >= len(self.items):
+                row.place_forget()
+                self.pool[slot] = (row, None)
+                continue
+            if bound != index:
+                self.bind_row(row, self.items[index])
+                self.pool[slot] = (row, index)
+            row.place(x=0, y=index * self.row_height - self.offset, relwidth=1, height=self.row_height)
+
+        if content > 0 and height > 0:
+            self.scrollbar.set(self.offset / content, min(1.0, (self.offset + height) / content))
+        else:
+            self.scrollbar.set(0, 1)
+
+        last_visible = (self.offset + height) // self.row_height
+        if self.on_need_more and len(self.items) < self.total and last_visible >= len(self.items) - self.PREFETCH:
+            self.on_need_more()
+
+    # --- Scrolling ---
+    def scroll_by(self, pixels):
+        self.offset += pixels
+        self._render()
+
+    def _on_wheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_by(-steps * self.WHEEL_ROWS * self.row_height)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.offset = int(float(value) * len(self.items) * self.row_height)
+            self._render()
+        elif action == "scroll":
+            step = self.viewport.winfo_height() if unit == "pages" else self.row_height
+            self.scroll_by(int(value) * step)
@@ -0,0 +1,223 @@
+import os
+import json
+import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from .config import Config
+from .instance_manager import InstanceManager
+from .modrinth_api import ModrinthAPI
+from .version_installer import VersionInstaller
+from .transfer_scheduler import transfers
+
+class BulkPreparer:
+    """
+    Prepares many instances from one manifest:
+
+        {"instances": [
+            {"name": "Event 1", "version": "1.20.1", "loader": "Fabric",
+             "loader_version": "0.15.11",
+             "mods": ["sodium", "lithium@mc1.20.1-0.11.2",
+                      {"url": "https://...", "filename": "x.jar", "sha1": "..."}]}
+        ]}
+
+    Shared work is done once: every distinct vanilla version goes into a
+    single download batch, every distinct (version, loader, loader version)
+    is installed once, and every distinct mod file is downloaded once into
+    <minecraft_dir>/launcher_cache/mods and hard-linked (or copied) into the
+    instances. Loader installs run one after another on a background
+    thread while the mods download (installers share jars and detect their
+    result from the versions directory).
+    """
+    DIR_NAME = "mods"
+    LOADERS = ("Forge", "Fabric", "Quilt")
+
+    def __init__(self, core):
+        self.core = core
+        self.minecraft_dir = core.minecraft_dir
+        self.downloader = core.downloader
+        self.mods_dir = os.path.join(self.minecraft_dir, Config.CACHE_DIR_NAME, self.DIR_NAME)
+
+    @staticmethod
+    def load_manifest(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entries = data.get("instances", data) if isinstance(data, dict) else data
+        for entry in entries:
+            if not entry.get("name") or not entry.get("version"):
+                raise Exception(f"Manifest entry needs a name and a version: {entry}")
+            entry.setdefault("loader", "None")
+            entry.setdefault("mods", [])
+        return entries
+
+    # --- Steps ---
+    def _ensure_instances(self, entries, set_status):
+        created = 0
+        for entry in entries:
+            inst = InstanceManager.get_instance(entry["name"])
+            changes = {}
+            if inst is None:
+                inst = InstanceManager.create_instance(entry["name"], entry["version"], entry["loader"])
+                created += 1
+            elif inst["version"] != entry["version"] or inst["loader"] != entry["loader"]:
+                set_status(f"Updating '{entry['name']}' to {entry['version']} {entry['loader']}")
+                changes.update(version=entry["version"], loader=entry["loader"])
+                if inst.get("loader_version"):
+                    changes["loader_version"] = None # belonged to the old loader
+            # Launches resolve the loader build from the instance, keep it pinned to the prepared one
+            if entry.get("loader_version") and inst.get("loader_version") != entry["loader_version"]:
+                changes["loader_version"] = entry["loader_version"]
+            if changes:
+                inst = InstanceManager.update_instance(entry["name"], **changes)
+            entry["path"] = inst["path"]
+        return created
+
+    def _install_loader(self, key, callback):
+        vanilla, loader, loader_version = key
+        start = time.time()
+        version_id = self.core.version_index.lookup(vanilla, loader, loader_version)
+        if version_id:
+            self.core.install_version(version_id, callback)
+        else:
+            version_id = self.core.install_loader(vanilla, loader, loader_version, callback)
+        if not version_id:
+            raise Exception(f"Could not install {loader} for {vanilla}")
+        return version_id, time.time() - start
+
+    def _install_loaders(self, keys, callback, priority):
+        # Worker thread keeps the caller's transfer priority
+        with transfers.priority(priority):
+            return {key: self._install_loader(key, callback) for key in keys}
+
+    def _resolve_mod(self, key):
+        """(mod, loader, version) -> download job, or None if Modrinth has no matching file."""
+        mod, loader, vanilla = key
+        if isinstance(mod, dict):
+            return {"url": mod["url"], "filename": mod.get("filename") or mod["url"].rsplit("/", 1)[-1],
+                    "sha1": mod.get("sha1"), "size": mod.get("size")}
+
+        slug, _, wanted = mod.partition("@")
+        loaders = [loader.lower()] if loader in self.LOADERS else None
+        versions = ModrinthAPI.get_project_versions(slug, loaders=loaders, game_versions=[vanilla])
+        if wanted:
+            versions = [v for v in versions if wanted in (v.get("version_number"), v.get("id"))]
+        if not versions:
+            return None
+        files = versions[0]["files"]
+        file = next((f for f in files if f.get("primary")), files[0] if files else None)
+        if file is None:
+            return None
+        return {"url": file["url"], "filename": file["filename"],
+                "sha1": file.get("hashes", {}).get("sha1"), "size": file.get("size")}
+
+    @staticmethod
+    def _link(src, dst):
+        if os.path.exists(dst):
+            if os.path.getsize(dst) == os.path.getsize(src):
+                return
+            os.remove(dst)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    def _prepare_mods(self, entries, callback, set_status):
+        refs = {} # (mod, loader, version) -> instances using it
+        for entry in entries:
+            for mod in entry["mods"]:
+                mod_key = json.dumps(mod, sort_keys=True) if isinstance(mod, dict) else mod
+                refs.setdefault((mod_key, entry["loader"], entry["version"]), []).append(entry)
+        if not refs:
+            return {"references": 0, "files": 0, "bytes_saved": 0, "missing": []}
+
+        set_status(f"Resolving {len(refs)} mods...")
+        keys = list(refs)
+        lookups = [(json.loads(m) if m.startswith("{") else m, loader, vanilla) for m, loader, vanilla in keys]
+        with ThreadPoolExecutor(max_workers=self.downloader.max_workers) as executor:
+            resolved = dict(zip(keys, executor.map(self._resolve_mod, lookups)))
+
+        missing = [f"{key[0]} ({key[2]} {key[1]})" for key, file in resolved.items() if file is None]
+        jobs = {}
+        for file in resolved.values():
+            if file:
+                file["path"] = os.path.join(self.mods_dir, file["sha1"] or "nohash", file["filename"])
+                jobs.setdefault(file["path"], file)
+        self.downloader.download_all(list(jobs.values()), callback)
+
+        uses = dict.fromkeys(jobs, 0)
+        for key, file in resolved.items():
+            if not file:
+                continue
+            for entry in refs[key]:
+                mods_dir = os.path.join(entry["path"], "mods")
+                os.makedirs(mods_dir, exist_ok=True)
+                self._link(file["path"], os.path.join(mods_dir, file["filename"]))
+                uses[file["path"]] += 1
+        references = sum(uses.values())
+        # Every further instance with the same file would have downloaded it again
+        bytes_saved = sum((count - 1) * os.path.getsize(path) for path, count in uses.items())
+        return {"references": references, "files": len(jobs), "bytes_saved": bytes_saved, "missing": missing}
+
+    # --- Entry point ---
+    def prepare(self, entries, callback=None):
+        """Prepares all manifest entries. Returns a summary dict."""
+        callback = callback or {}
+        set_status = callback.get("setStatus", lambda x: None)
+        start = time.time()
+        before = self.downloader.stats()
+
+        created = self._ensure_instances(entries, set_status)
+
+        # 1. Every distinct vanilla version in one batch
+        vanilla_versions = list(dict.fromkeys(e["version"] for e in entries))
+        phase = time.time()
+        VersionInstaller(self.minecraft_dir, downloader=self.downloader).install_many(vanilla_versions, callback)
+        vanilla_seconds = time.time() - phase
+
+        # 2. Distinct loaders in the background while the mods download
+        loader_keys = list(dict.fromkeys((e["version"], e["loader"], e.get("loader_version"))
+                                         for e in entries if e["loader"] in self.LOADERS))
+        skipped = sorted({e["loader"] for e in entries if e["loader"] not in self.LOADERS + ("None",)})
+        if skipped:
+            set_status(f"Not automated, instances keep vanilla: {', '.join(skipped)}")
+
+        phase = time.time()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._install_loaders, loader_keys, callback, transfers.current())
+            mods = self._prepare_mods(entries, callback, set_status)
+            mods_seconds = time.time() - phase
+            loaders = future.result()
+
+        # 3. Results per instance
+        instances = []
+        for entry in entries:
+            key = (entry["version"], entry["loader"], entry.get("loader_version"))
+            version_id = loaders[key][0] if key in loaders else entry["version"]
+            instances.append({"name": entry["name"], "version_id": version_id, "path": entry["path"]})
+
+        elapsed = time.time() - start
+        after = self.downloader.stats()
+
+        # One instance at a time would repeat each shared step for every instance using it
+        sequential = elapsed
+        sequential += (len(entries) - len(vanilla_versions)) * vanilla_seconds / max(1, len(vanilla_versions))
+        for key, (version_id, seconds) in loaders.items():
+            uses = sum(1 for e in entries if (e["version"], e["loader"], e.get("loader_version")) == key)
+            sequential += (uses - 1) * seconds
+        if mods["files"]:
+            sequential += (mods["references"] - mods["files"]) * mods_seconds / mods["files"]
+
+        return {
+            "instances": instances,
+            "created": created,
+            "vanilla_versions": len(vanilla_versions),
+            "loader_installs": len(loader_keys),
+            "mod_files": mods["files"],
+            "mod_references": mods["references"],
+            "missing_mods": mods["missing"],
+            "elapsed_seconds": round(elapsed, 1),
+            "estimated_sequential_seconds": round(sequential, 1),
+            "estimated_seconds_saved": round(sequential - elapsed, 1),
+            "bytes_downloaded": after["bytes_downloaded"] - before["bytes_downloaded"],
+            "files_downloaded": after["files_downloaded"] - before["files_downloaded"],
+            "bytes_saved": mods["bytes_saved"]
+        }
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from .config import Config
+
+class CdsArchives:
+    """
+    AppCDS (class data sharing) archives per installed version.
+
+    The first launch of a (version id, classpath, JVM build) combination runs
+    with -XX:ArchiveClassesAtExit, so the JVM dumps the classes it loaded
+    when the game exits. Later launches map that archive with
+    -XX:SharedArchiveFile and skip most class loading and verification.
+    The key hashes the classpath and the java binary (path + mtime), so a
+    changed classpath or runtime gets a new archive and the stale ones for
+    that version are deleted. JVMs without dynamic archiving (< 13 or
+    missing flags) launch unchanged.
+
+    Build time and startup time (launch until the first rendering log line)
+    are recorded per archive in <minecraft_dir>/launcher_cache/cds/archives.json.
+    """
+    DIR_NAME = "cds"
+    FILE_NAME = "archives.json"
+    MIN_JAVA = 13
+    MAX_DUMP_ATTEMPTS = 3
+    MAX_SAMPLES = 10
+
+    # First log lines printed once the game window is up (1.13+ and older versions)
+    STARTUP_MARKERS = ["Backend library:", "LWJGL Version:", "LWJGL version", "Reloading ResourceManager"]
+
+    def __init__(self, minecraft_dir, jvm_presets):
+        self.minecraft_dir = str(minecraft_dir)
+        self.jvm_presets = jvm_presets
+        self.dir = os.path.join(self.minecraft_dir, Config.CACHE_DIR_NAME, self.DIR_NAME)
+        self.path = os.path.join(self.dir, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self.archives = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.archives = json.load(f).get("archives", {})
+        except Exception as e:
+            print(f"Error loading CDS archive index: {e}")
+            self.archives = {}
+
+    def save(self):
+        try:
+            os.makedirs(self.dir, exist_ok=True)
+            with self._lock:
+                data = {"archives": json.loads(json.dumps(self.archives))}
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving CDS archive index: {e}")
+
+    @staticmethod
+    def enabled():
+        return Config.get("appcds", False)
+
+    def is_supported(self, java_path, major_version):
+        if not java_path or (major_version or 0) < self.MIN_JAVA:
+            return False
+        flags = self.jvm_presets.supported_flags(java_path)
+        return bool(flags) and "ArchiveClassesAtExit" in flags and "SharedArchiveFile" in flags
+
+    @staticmethod
+    def _classpath(command):
+        if "-cp" in command:
+            return command[command.index("-cp") + 1]
+        return ""
+
+    def make_key(self, version_id, command):
+        java_path = command[0]
+        try:
+            java_mtime = os.stat(java_path).st_mtime_ns
+        except OSError:
+            java_mtime = None
+        key_data = [version_id, self._classpath(command), java_path, java_mtime]
+        return hashlib.sha1(json.dumps(key_data).encode("utf-8")).hexdigest()
+
+    def _drop_stale(self, version_id, key):
+        # Classpath or runtime changed: older archives of this version are useless now
+        stale = [k for k, v in self.archives.items() if v.get("version") == version_id and k != key]
+        for k in stale:
+            archive = self.archives[k].get("archive")
+            if archive and os.path.exists(archive):
+                try:
+                    os.remove(archive)
+                except OSError as e:
+                    print(f"Could not remove stale CDS archive: {e}")
+            with self._lock:
+                self.archives.pop(k, None)
+
+    def apply(self, command, version_id, major_version):
+        """
+        Returns (command, mode, key) with the CDS flag inserted after the java
+        executable. mode is "dump", "use" or None (unchanged command).
+        """
+        java_path = command[0] if command else None
+        if not self.is_supported(java_path, major_version):
+            return command, None, None
+
+        key = self.make_key(version_id, command)
+        self._drop_stale(version_id, key)
+
+        entry = self.archives.get(key)
+        if entry is None:
+            safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in version_id)
+            entry = {
+                "version": version_id,
+                "java": java_path,
+                "archive": os.path.join(self.dir, f"{safe_id}-{key[:12]}.jsa"),
+                "status": "new",
+                "dump_attempts": 0,
+                "startup": {"none": [], "dump": [], "use": []}
+            }
+            with self._lock:
+                self.archives[key] = entry
+
+        if entry["status"] == "ready" and os.path.isfile(entry["archive"]):
+            mode = "use"
+            cds_arg = f"-XX:SharedArchiveFile={entry['archive']}"
+        elif entry["dump_attempts"] >= self.MAX_DUMP_ATTEMPTS:
+            # Dumping keeps failing with this JVM/classpath, launch plainly
+            mode = None
+            cds_arg = None
+        else:
+            mode = "dump"
+            cds_arg = f"-XX:ArchiveClassesAtExit={entry['archive']}"
+            os.makedirs(self.dir, exist_ok=True)
+            entry["dump_attempts"] += 1
+            entry["status"] = "dumping"
+        self.save()
+
+        if cds_arg is None:
+            return command, None, key
+        return [command[0], cds_arg] + command[1:], mode, key
+
+    def track(self, session, key, mode):
+        """Records startup time for the launch and, for dump runs, the archive result."""
+        if key is None or key not in self.archives:
+            return
+        mode_name = mode or "none"
+
+        def on_startup(line):
+            elapsed = round(line["time"] - session.started, 3)
+            with self._lock:
+                samples = self.archives[key]["startup"].setdefault(mode_name, [])
+                samples.append(elapsed)
+                del samples[:-self.MAX_SAMPLES]
+            print(f"Game startup took {elapsed}s (CDS: {mode_name})")
+            self.save()
+
+        def on_exit(session):
+            entry = self.archives.get(key)
+            if not entry or mode != "dump":
+                return
+            archive = entry["archive"]
+            if os.path.isfile(archive) and os.path.getsize(archive) > 0:
+                # The archive is written while the JVM shuts down: time from the
+                # last game output line to the archive's final write
+                last_output = session.lines[-1]["time"] if session.lines else session.started
+                entry["status"] = "ready"
+                entry["created"] = time.time()
+                entry["size"] = os.path.getsize(archive)
+                entry["build_seconds"] = round(max(0.0, os.path.getmtime(archive) - last_output), 3)
+                print(f"CDS archive created for {entry['version']} ({entry['size'] // 1024} KB, {entry['build_seconds']}s)")
+            else:
+                entry["status"] = "new"
+                print(f"CDS archive was not written for {entry['version']} (exit code {session.process.returncode})")
+            self.save()
+
+        session.watch(self.STARTUP_MARKERS, on_startup)
+        session.on_exit(on_exit)
+
+    def stats(self):
+        """Per archive: status, build time and average startup with/without the archive."""
+        result = []
+        for key, entry in self.archives.items():
+            averages = {m: round(sum(s) / len(s), 3) for m, s in entry.get("startup", {}).items() if s}
+            result.append({
+                "version": entry.get("version"),
+                "status": entry.get("status"),
+                "build_seconds": entry.get("build_seconds"),
+                "startup": averages
+            })
+        return result
+
+    def clear(self):
+        for entry in self.archives.values():
+            archive = entry.get("archive")
+            if archive and os.path.exists(archive):
+                try:
+                    os.remove(archive)
+                except OSError:
+                    pass
+        with self._lock:
+            self.archives = {}
+        self.save()
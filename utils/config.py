@@ -9,13 +9,22 @@ class Config:
         "theme": "Dark",
         "minecraft_dir": os.path.expandvars(r"%APPDATA%\.minecraft"),
         "fps_boost": False,
+        "jvm_preset": "auto",
+        "appcds": False,
+        "offline_mode": False,
         "java_path": "java",
-        "show_snapshots": False
+        "show_snapshots": False,
+        "download_threads": 8,
+        "download_rate_limit": 0,
+        "forge_cache_dir": ""
     }
     
     config_file = "config.json"
     data = {}
 
+    # Launcher caches (stamps, manifests, ...) live under <minecraft_dir>/launcher_cache
+    CACHE_DIR_NAME = "launcher_cache"
+
     @classmethod
     def load(cls):
         if os.path.exists(cls.config_file):
@@ -45,3 +54,11 @@ class Config:
     def set(cls, key, value):
         cls.data[key] = value
         cls.save()
+
+    @classmethod
+    def get_cache_dir(cls, name=None):
+        path = os.path.join(cls.get("minecraft_dir", cls.DEFAULT_CONFIG["minecraft_dir"]), cls.CACHE_DIR_NAME)
+        if name:
+            path = os.path.join(path, name)
+        os.makedirs(path, exist_ok=True)
+        return path
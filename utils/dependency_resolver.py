@@ -0,0 +1,192 @@
+import os
+from .modrinth_api import ModrinthAPI
+from .content_manager import ContentManager
+from .hash_index import hash_index
+from .mod_downloader import ModDownloader
+
+class DependencyResolver:
+    """
+    Computes what has to be installed for a set of Modrinth projects: the
+    projects themselves plus their required dependencies, transitively, each
+    at the newest version (releases first) for the instance's game version
+    and loader.
+
+    The graph is walked one level at a time using the batch endpoints, so a
+    level costs a /projects call and a few /versions calls no matter how
+    many mods it has. Candidate versions are fetched newest first in windows
+    of WINDOW per project; a project only needs a second window if none of
+    its newest ones fit. Mods already in the instance (recognised by SHA-1
+    through /version_files) are left alone.
+    """
+    WINDOW = 10 # candidate versions per project per round
+    BATCH_IDS = 400 # ids per batch request
+    MAX_DEPTH = 16
+
+    def __init__(self, instance, content_type="mod"):
+        self.instance = instance
+        self.content_type = content_type
+        self.loaders = ModDownloader.loader_filter(content_type, instance)
+        self.requests = 0
+
+    # --- Batched lookups ---
+    def _chunks(self, ids):
+        ids = list(ids)
+        for i in range(0, len(ids), self.BATCH_IDS):
+            yield ids[i:i + self.BATCH_IDS]
+
+    def _projects(self, ids):
+        projects = []
+        for chunk in self._chunks(ids):
+            self.requests += 1
+            projects.extend(ModrinthAPI.get_projects(chunk))
+        return projects
+
+    def _versions(self, ids):
+        versions = []
+        for chunk in self._chunks(ids):
+            self.requests += 1
+            versions.extend(ModrinthAPI.get_versions(chunk))
+        return versions
+
+    def matches(self, version):
+        if self.instance["version"] not in version.get("game_versions", []):
+            return False
+        return not self.loaders or bool(set(self.loaders) & set(version.get("loaders", [])))
+
+    @staticmethod
+    def _best(versions):
+        # versions are newest first: the newest release, else the newest of any type
+        return next((v for v in versions if v.get("version_type") == "release"), versions[0])
+
+    def installed_projects(self):
+        """{project_id: filename} of the instance's files Modrinth knows."""
+        target_dir = ContentManager.get_dir(self.content_type, self.instance["path"])
+        if not target_dir or not os.path.isdir(target_dir):
+            return {}
+        paths = [os.path.join(target_dir, name) for name in ContentManager.list_content(self.content_type, self.instance["path"])]
+        by_hash = {h["sha1"]: os.path.basename(path) for path, h in hash_index.hashes(paths).items()}
+        if not by_hash:
+            return {}
+        self.requests += 1
+        found = ModrinthAPI.get_versions_from_hashes(list(by_hash))
+        return {v["project_id"]: by_hash[h] for h, v in found.items()}
+
+    # --- Resolving ---
+    def _pick(self, requested, titles):
+        """
+        Best matching version for each requested project (id or slug -> who
+        asked), fetching candidates window by window. Returns (found, unresolved).
+        """
+        projects = {}
+        unresolved = []
+        for project in self._projects(requested):
+            projects[project["id"]] = project
+            titles[project["id"]] = project.get("title", project["id"])
+        known = set(projects) | {p.get("slug") for p in projects.values()}
+        for pid in requested:
+            if pid not in known:
+                unresolved.append((pid, "project not found", requested[pid]))
+
+        # Usually oldest first, but that isn't part of the API: it only decides which ids are fetched first
+        candidates = {pid: list(reversed(p.get("versions", []))) for pid, p in projects.items()}
+        found = []
+        offset = 0
+        while candidates:
+            by_project = {}
+            window = [vid for ids in candidates.values() for vid in ids[offset:offset + self.WINDOW]]
+            # Newest first by publish date, whatever order the ids came in
+            fetched = sorted(self._versions(window), key=lambda v: v.get("date_published", ""), reverse=True)
+            for version in fetched:
+                if self.matches(version):
+                    by_project.setdefault(version["project_id"], []).append(version)
+            for pid in list(candidates):
+                required_by = requested.get(pid, requested.get(projects[pid].get("slug")))
+                if pid in by_project:
+                    found.append((pid, self._best(by_project[pid]), required_by))
+                elif offset + self.WINDOW < len(candidates[pid]):
+                    continue
+                else:
+                    unresolved.append((pid, f"no version for MC {self.instance['version']}" +
+                                       (f" / {self.instance['loader']}" if self.loaders else ""), required_by))
+                del candidates[pid]
+            offset += self.WINDOW
+        return found, unresolved
+
+    def resolve(self, project_ids):
+        """
+        Returns the install plan:
+            {"install": [{"project_id", "title", "version", "required_by"}],
+             "already_installed": {project_id: filename},
+             "unresolved": [{"project_id", "title", "reason", "required_by"}],
+             "incompatible": [(title, title)], "requests": int}
+        required_by is the title of the project that pulled it in (None if requested).
+        """
+        self.requests = 0
+        installed = self.installed_projects()
+        titles = {}
+        plan = {}
+        already = {}
+        unresolved = []
+        incompatible = []
+        pending = {pid: None for pid in project_ids} # project id / slug -> who asked for it
+        pinned = {} # version id -> who asked for it
+
+        for _ in range(self.MAX_DEPTH):
+            if not pending and not pinned:
+                break
+            found = []
+            if pinned:
+                # Dependencies naming an exact version: one batch; if it doesn't fit, take the project's best
+                for version in self._versions(pinned):
+                    if self.matches(version):
+                        found.append((version["project_id"], version, pinned[version["id"]]))
+                    else:
+                        pending.setdefault(version["project_id"], pinned[version["id"]])
+                pinned = {}
+            if pending:
+                picked, missing = self._pick(pending, titles)
+                found.extend(picked)
+                unresolved.extend(missing)
+                pending = {}
+            failed = {pid for pid, _, _ in unresolved}
+
+            untitled = [pid for pid, _, _ in found if pid not in titles]
+            if untitled:
+                for project in self._projects(untitled):
+                    titles[project["id"]] = project.get("title", project["id"])
+
+            for pid, version, required_by in found:
+                if pid in installed:
+                    already[pid] = installed[pid]
+                    continue
+                if pid in plan:
+                    continue
+                plan[pid] = {"project_id": pid, "version": version, "required_by": required_by}
+                for dep in version.get("dependencies", []):
+                    dep_pid = dep.get("project_id")
+                    if dep.get("dependency_type") == "incompatible":
+                        incompatible.append((pid, dep_pid))
+                    elif dep.get("dependency_type") != "required":
+                        continue
+                    elif dep_pid and (dep_pid in plan or dep_pid in installed or dep_pid in failed):
+                        continue
+                    elif dep.get("version_id"):
+                        pinned.setdefault(dep["version_id"], pid)
+                    elif dep_pid:
+                        pending.setdefault(dep_pid, pid)
+        else:
+            print("Dependency resolution stopped at the depth limit")
+
+        # Conflicts only matter if both sides end up in the instance
+        present = set(plan) | set(installed)
+        for entry in plan.values():
+            entry["title"] = titles.get(entry["project_id"], entry["project_id"])
+            entry["required_by"] = titles.get(entry["required_by"], entry["required_by"])
+        return {
+            "install": list(plan.values()),
+            "already_installed": already,
+            "unresolved": [{"project_id": pid, "title": titles.get(pid, pid), "reason": reason,
+                            "required_by": titles.get(by, by)} for pid, reason, by in unresolved],
+            "incompatible": [(titles.get(a, a), titles.get(b, b)) for a, b in incompatible if b in present],
+            "requests": self.requests
+        }
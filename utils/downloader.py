@@ -0,0 +1,211 @@
+import os
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .config import Config
+from .http_client import http_client
+from .transfer_scheduler import transfers
+
+class Downloader:
+    """
+    Parallel download engine.
+    Runs a bounded worker pool over the shared HTTP client, checks SHA-1 while
+    the data streams in and reports aggregate progress through the usual
+    setStatus/setProgress/setMax callback dict. Every transfer goes through
+    the TransferScheduler in the caller's priority class.
+
+    A job is a dict:
+        {"url": str, "path": str, "sha1": str|None, "size": int|None,
+         "executable": bool, "optional": bool, "sha512": str|None}
+    """
+    DEFAULT_WORKERS = 8
+    CHUNK_SIZE = 64 * 1024
+    RETRIES = 2
+    TIMEOUT = (10, 60) # (connect, read)
+
+    def __init__(self, max_workers=None):
+        if not max_workers:
+            max_workers = int(Config.get("download_threads", self.DEFAULT_WORKERS))
+        self.max_workers = max(1, max_workers)
+
+        # One keep-alive session for all workers. The per-host pool is at least
+        # the worker count so every worker keeps its own connection alive.
+        http_client.reserve(self.max_workers)
+
+        self._lock = threading.Lock()
+        self.bytes_downloaded = 0
+        self.files_downloaded = 0
+        self.files_checked = 0
+
+    def download_all(self, jobs, callback=None, stamps=None, priority=None):
+        """
+        Downloads all jobs concurrently. Files that already exist with the
+        expected checksum are skipped. Raises if a non-optional job fails.
+        If an InstallStamps store is given, unchanged stamped files are not
+        re-hashed and verified files are stamped. priority defaults to the
+        calling thread's transfer class.
+        """
+        callback = callback or {}
+        set_status = callback.get("setStatus", lambda x: None)
+        set_progress = callback.get("setProgress", lambda x: None)
+        set_max = callback.get("setMax", lambda x: None)
+
+        # Same target twice (e.g. shared asset hashes) is downloaded once
+        unique = {}
+        for job in jobs:
+            unique.setdefault(os.path.normcase(os.path.abspath(job["path"])), job)
+        jobs = list(unique.values())
+        if not jobs:
+            return
+
+        total = len(jobs)
+        set_status(f"Downloading {total} files...")
+        set_max(total)
+        set_progress(0)
+
+        # Keep UI updates cheap for thousands of small assets
+        step = max(1, total // 200)
+        done = 0
+        errors = []
+
+        with transfers.transfer(priority) as priority, ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._download_file, job, stamps, priority): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    if not job.get("optional"):
+                        errors.append((job, e))
+                done += 1
+                if done % step == 0 or done == total:
+                    set_progress(done)
+
+        if errors:
+            job, e = errors[0]
+            raise Exception(f"{len(errors)} file(s) failed to download. First: {job['url']} ({e})")
+
+    def download_file(self, job, stamps=None, priority=None, progress=None):
+        """
+        Downloads a single job. Returns True if the file was transferred,
+        False if a valid copy was already on disk. progress(received, total)
+        is called as data arrives (total may be None). Runs as its own batch,
+        so lower classes yield to it as they do to download_all.
+        """
+        with transfers.transfer(priority) as priority:
+            return self._download_file(job, stamps, priority, progress)
+
+    def _download_file(self, job, stamps, priority, progress=None):
+        path = job["path"]
+        sha1 = job.get("sha1")
+        self.count_checked(1)
+
+        if stamps is not None and stamps.matches(path, sha1):
+            return False
+
+        if self._is_valid(path, sha1, job.get("size"), job.get("sha512")):
+            if stamps is not None:
+                stamps.stamp(path, sha1)
+            return False
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        last_error = None
+        for attempt in range(self.RETRIES + 1):
+            if attempt:
+                time.sleep(http_client.backoff(attempt - 1))
+            try:
+                self._fetch(job["url"], path, sha1, priority, job.get("sha512"), progress, job.get("size"))
+                break
+            except Exception as e:
+                last_error = e
+        else:
+            raise last_error
+
+        if job.get("executable") and os.name != "nt":
+            os.chmod(path, os.stat(path).st_mode | 0o111)
+
+        if stamps is not None:
+            stamps.stamp(path, sha1)
+
+        with self._lock:
+            self.files_downloaded += 1
+        return True
+
+    def count_checked(self, count):
+        with self._lock:
+            self.files_checked += count
+
+    def stats(self):
+        with self._lock:
+            return {
+                "bytes_downloaded": self.bytes_downloaded,
+                "files_downloaded": self.files_downloaded,
+                "files_checked": self.files_checked
+            }
+
+    def _fetch(self, url, path, sha1, priority=None, sha512=None, progress=None, size=None):
+        # Stream into a temp file, hashing as we go, then move into place.
+        # Named per thread: parallel installs may fetch the same file.
+        tmp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.part"
+        digest = hashlib.sha1()
+        digest512 = hashlib.sha512() if sha512 else None
+        received = 0
+        priority = transfers.current() if priority is None else priority
+        transfers.wait_turn(priority)
+        try:
+            # Retried by download_file (also covers broken streams and bad checksums)
+            with http_client.get(url, stream=True, timeout=self.TIMEOUT, retries=0) as response:
+                if response.status_code != 200:
+                    raise Exception(f"HTTP {response.status_code}")
+                total = int(response.headers.get("Content-Length") or 0) or size
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                        transfers.throttle(priority, len(chunk))
+                        f.write(chunk)
+                        digest.update(chunk)
+                        if digest512:
+                            digest512.update(chunk)
+                        received += len(chunk)
+                        if progress:
+                            progress(received, total)
+
+            if sha1 and digest.hexdigest() != sha1:
+                raise Exception(f"Checksum mismatch (expected {sha1}, got {digest.hexdigest()})")
+            if sha512 and digest512.hexdigest() != sha512:
+                raise Exception(f"SHA-512 mismatch (expected {sha512[:16]}..., got {digest512.hexdigest()[:16]}...)")
+
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            with self._lock:
+                self.bytes_downloaded += received
+
+    @staticmethod
+    def _is_valid(path, sha1, size=None, sha512=None):
+        if not os.path.isfile(path):
+            return False
+        if size is not None and os.path.getsize(path) != size:
+            return False
+        if sha1:
+            return Downloader.sha1_of(path) == sha1
+        if sha512:
+            return Downloader.hash_of(path, "sha512") == sha512
+        return True
+
+    @staticmethod
+    def sha1_of(path):
+        return Downloader.hash_of(path, "sha1")
+
+    @staticmethod
+    def hash_of(path, algorithm):
+        digest = hashlib.new(algorithm)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(Downloader.CHUNK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
@@ -1,9 +1,9 @@
-import requests
 import webbrowser
 import threading
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from urllib.parse import urlparse, parse_qs, urlencode
 import secrets
+from .http_client import http_client
 
 class ElyAuthenticator:
     """
@@ -120,9 +120,10 @@ class ElyAuthenticator:
             'code': code
         }
         
-        response = requests.post(
+        response = http_client.post(
             f"{ElyAuthenticator.AUTH_URL}/token",
-            data=token_params
+            data=token_params,
+            endpoint="ely.by token"
         )
         
         if response.status_code != 200:
@@ -135,9 +136,10 @@ class ElyAuthenticator:
         """Get user profile using access token"""
         headers = {'Authorization': f'Bearer {access_token}'}
         
-        response = requests.get(
+        response = http_client.get(
             f"{ElyAuthenticator.API_URL}/account/v1/info",
-            headers=headers
+            headers=headers,
+            endpoint="ely.by profile"
         )
         
         if response.status_code != 200:
@@ -155,9 +157,10 @@ class ElyAuthenticator:
             'refresh_token': refresh_token
         }
         
-        response = requests.post(
+        response = http_client.post(
             f"{ElyAuthenticator.AUTH_URL}/token",
-            data=token_params
+            data=token_params,
+            endpoint="ely.by token"
         )
         
         if response.status_code != 200:
@@ -0,0 +1,185 @@
+import os
+import json
+import time
+import random
+import shutil
+import hashlib
+import platform
+import tempfile
+import subprocess
+from minecraft_launcher_lib.helper import get_library_path, get_jar_mainclass
+from minecraft_launcher_lib.forge import get_data_library_path
+from .config import Config
+
+class ForgeProcessorCache:
+    """
+    Content-addressed cache for the Forge installer's processors (the Java
+    jobs that split, remap and patch the client jar).
+
+    Each processor is keyed by a SHA-256 of its jar, classpath and arguments,
+    with every input file replaced by its SHA-1 and every path inside the
+    minecraft directory made relative. Its outputs are stored once under
+    objects/<sha1> and listed in entries/<key>.json, so a reinstall, the
+    same build in another minecraft directory, or another machine sharing
+    Config "forge_cache_dir" copies the outputs instead of starting Java.
+
+    Outputs are the processor's declared "outputs" plus arguments after an
+    output flag; processors writing outside the minecraft directory or
+    exiting non-zero are never cached.
+    """
+    DIR_NAME = "forge_processors"
+    OUTPUT_FLAGS = ("--output", "--out-jar", "--out", "--slim", "--extra", "--srg")
+
+    def __init__(self, cache_dir=None):
+        self.dir = cache_dir or Config.get("forge_cache_dir") or Config.get_cache_dir(self.DIR_NAME)
+        self.objects_dir = os.path.join(self.dir, "objects")
+        self.entries_dir = os.path.join(self.dir, "entries")
+        self._hashes = {} # (path, size, mtime_ns) -> sha1
+        self.stats = {"cached": 0, "ran": 0, "saved_seconds": 0.0, "run_seconds": 0.0}
+
+    # --- Hashing ---
+    def sha1_of(self, path):
+        st = os.stat(path)
+        key = (path, st.st_size, st.st_mtime_ns)
+        if key not in self._hashes:
+            digest = hashlib.sha1()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(block)
+            self._hashes[key] = digest.hexdigest()
+        return self._hashes[key]
+
+    @staticmethod
+    def _relative(value, path, root_path):
+        # Paths inside the minecraft dir / temp root must not change the key
+        for base, token in ((path, "{MC}"), (root_path, "{ROOT}")):
+            if value.startswith(base + os.sep):
+                return token + "/" + os.path.relpath(value, base).replace(os.sep, "/")
+        return value
+
+    def make_key(self, processor, args, outputs, path, root_path):
+        parts = [processor["jar"], processor.get("classpath", [])]
+        for arg in args:
+            if arg in outputs:
+                parts.append(["out", self._relative(arg, path, root_path)])
+            elif os.path.isfile(arg):
+                parts.append(["in", self.sha1_of(arg)])
+            else:
+                parts.append(self._relative(arg, path, root_path))
+        return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+    # --- Store ---
+    def _object_path(self, sha1):
+        return os.path.join(self.objects_dir, sha1[:2], sha1)
+
+    @staticmethod
+    def _copy(src, dst):
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        tmp_path = dst + ".tmp"
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, dst)
+
+    def _restore(self, key, path):
+        entry_path = os.path.join(self.entries_dir, key + ".json")
+        if not os.path.isfile(entry_path):
+            return None
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            outputs = entry["outputs"]
+            if not all(os.path.isfile(self._object_path(sha1)) for sha1 in outputs.values()):
+                return None
+            for rel_path, sha1 in outputs.items():
+                target = os.path.join(path, *rel_path.split("/"))
+                if os.path.isfile(target) and self.sha1_of(target) == sha1:
+                    continue
+                self._copy(self._object_path(sha1), target)
+            return entry
+        except Exception as e:
+            print(f"Forge processor cache entry {key[:12]} unusable: {e}")
+            return None
+
+    def _store(self, key, processor, outputs, path, seconds):
+        stored = {}
+        for output in outputs:
+            if not os.path.isfile(output):
+                print(f"Processor {processor['jar']} did not write {output}, not caching it")
+                return
+            sha1 = self.sha1_of(output)
+            if not os.path.isfile(self._object_path(sha1)):
+                self._copy(output, self._object_path(sha1))
+            stored[os.path.relpath(output, path).replace(os.sep, "/")] = sha1
+        os.makedirs(self.entries_dir, exist_ok=True)
+        tmp_path = os.path.join(self.entries_dir, key + ".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"processor": processor["jar"], "outputs": stored, "seconds": round(seconds, 2),
+                       "created": time.time()}, f, indent=4)
+        os.replace(tmp_path, os.path.join(self.entries_dir, key + ".json"))
+
+    # --- Processors ---
+    def run_processors(self, data, minecraft_directory, lzma_path, installer_path, callback, java=None):
+        """Drop-in for minecraft_launcher_lib.forge.forge_processors."""
+        path = str(minecraft_directory)
+        set_status = callback.get("setStatus", lambda x: None)
+        argument_vars = {"{MINECRAFT_JAR}": os.path.join(path, "versions", data["minecraft"], data["minecraft"] + ".jar")}
+        for key, value in data["data"].items():
+            if value["client"].startswith("[") and value["client"].endswith("]"):
+                argument_vars["{" + key + "}"] = get_data_library_path(value["client"], path)
+            else:
+                argument_vars["{" + key + "}"] = value["client"]
+        root_path = os.path.join(tempfile.gettempdir(), "forge-root-" + str(random.randrange(1, 100000)))
+        argument_vars["{INSTALLER}"] = installer_path
+        argument_vars["{BINPATCH}"] = lzma_path
+        argument_vars["{ROOT}"] = root_path
+        argument_vars["{SIDE}"] = "client"
+        separator = ";" if platform.system() == "Windows" else ":"
+
+        def substitute(value):
+            for var, replacement in argument_vars.items():
+                value = value.replace(var, replacement)
+            return value
+
+        callback.get("setMax", lambda x: None)(len(data["processors"]))
+        for count, processor in enumerate(data["processors"]):
+            if "client" not in processor.get("sides", ["client"]):
+                continue
+
+            classpath = separator.join([get_library_path(c, path) for c in processor["classpath"]] + [get_library_path(processor["jar"], path)])
+            args = []
+            for arg in processor["args"]:
+                var = argument_vars.get(arg, arg)
+                args.append(get_library_path(var[1:-1], path) if var.startswith("[") and var.endswith("]") else var)
+            args = [substitute(arg) for arg in args]
+
+            outputs = {substitute(o) for o in processor.get("outputs", {})}
+            outputs.update(args[i] for i in range(1, len(args)) if args[i - 1] in self.OUTPUT_FLAGS)
+            cacheable = all(o.startswith(path + os.sep) for o in outputs)
+            key = self.make_key(processor, args, outputs, path, root_path) if cacheable and outputs else None
+
+            entry = self._restore(key, path) if key else None
+            if entry:
+                set_status(f"Processor {processor['jar']} (cached)")
+                self.stats["cached"] += 1
+                self.stats["saved_seconds"] += entry.get("seconds", 0)
+            else:
+                set_status("Running processor " + processor["jar"])
+                command = [java or "java", "-cp", classpath, get_jar_mainclass(get_library_path(processor["jar"], path))] + args
+                start = time.time()
+                exit_code = subprocess.call(command)
+                elapsed = time.time() - start
+                self.stats["ran"] += 1
+                self.stats["run_seconds"] += elapsed
+                if exit_code != 0:
+                    print(f"Processor {processor['jar']} exited with code {exit_code}")
+                elif key:
+                    try:
+                        self._store(key, processor, outputs, path, elapsed)
+                    except Exception as e:
+                        print(f"Could not cache processor outputs: {e}")
+            callback.get("setProgress", lambda x: None)(count)
+
+        if os.path.exists(root_path):
+            shutil.rmtree(root_path)
+        print(f"Forge processors: {self.stats['cached']} from cache (~{self.stats['saved_seconds']:.0f}s saved), "
+              f"{self.stats['ran']} run ({self.stats['run_seconds']:.0f}s)")
+        return self.stats
@@ -0,0 +1,240 @@
+import os
+import time
+import threading
+from collections import deque
+
+class GameSession:
+    """
+    Output of one running game process.
+
+    stdout and stderr are drained by two reader threads, so neither pipe can
+    fill up and stall the JVM. Every line is timestamped and tagged with its
+    stream, kept in a fixed-size ring buffer and written to a rotating log
+    file (plain buffered writes; the logging module costs ~10x per line).
+    Subscribers get lines in batches through the hub.
+    """
+    BUFFER_LINES = 5000
+    LOG_MAX_BYTES = 5 * 1024 * 1024
+    LOG_BACKUPS = 3
+
+    def __init__(self, hub, process, name, log_path=None):
+        self.hub = hub
+        self.process = process
+        self.name = name
+        self.log_path = log_path
+        self.started = time.time()
+        self.lines = deque(maxlen=self.BUFFER_LINES)
+        self.line_count = 0
+        self._lock = threading.Lock()
+        self._readers = []
+        self._watchers = []        # [(substrings, callback)] fired once on the first matching line
+        self._exit_callbacks = []
+        self.ended = False
+        self.log_file = None
+        self.log_size = 0
+        if log_path:
+            self._open_log()
+
+    # --- Rotating log ---
+    def _open_log(self):
+        try:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            self.log_file = open(self.log_path, "a", encoding="utf-8", buffering=64 * 1024)
+            self.log_size = self.log_file.tell()
+        except Exception as e:
+            print(f"Could not open game log {self.log_path}: {e}")
+            self.log_file = None
+
+    def _rotate_log(self):
+        # game.log -> game.log.1 -> ... -> game.log.<LOG_BACKUPS>
+        self.log_file.close()
+        for i in range(self.LOG_BACKUPS - 1, 0, -1):
+            src = f"{self.log_path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.log_path}.{i + 1}")
+        os.replace(self.log_path, self.log_path + ".1")
+        self._open_log()
+
+    def _write_log(self, entry):
+        # Called with self._lock held
+        try:
+            self.log_file.write(entry)
+            self.log_size += len(entry)
+            if self.log_size >= self.LOG_MAX_BYTES:
+                self._rotate_log()
+        except Exception as e:
+            print(f"Error writing game log: {e}")
+            self.log_file = None
+
+    def _close_log(self):
+        with self._lock:
+            if self.log_file:
+                self.log_file.close()
+                self.log_file = None
+
+    def start(self):
+        for stream, tag in ((self.process.stdout, "OUT"), (self.process.stderr, "ERR")):
+            if stream is None:
+                continue
+            reader = threading.Thread(target=self._read, args=(stream, tag), daemon=True)
+            reader.start()
+            self._readers.append(reader)
+        threading.Thread(target=self._wait, daemon=True).start()
+
+    def _read(self, stream, tag):
+        try:
+            for text in iter(stream.readline, ""):
+                line = {"time": time.time(), "stream": tag, "session": self.name, "text": text.rstrip("\r\n")}
+                with self._lock:
+                    self.lines.append(line)
+                    self.line_count += 1
+                    if self.log_file:
+                        self._write_log(f"{time.strftime('%H:%M:%S', time.localtime(line['time']))} [{tag}] {line['text']}\n")
+                if self._watchers:
+                    self._check_watchers(line)
+                self.hub.publish(line)
+        except Exception as e:
+            print(f"Error reading game output: {e}")
+        finally:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def _wait(self):
+        self.process.wait()
+        self.join(timeout=5)
+        self.hub.publish({"time": time.time(), "stream": "SYS", "session": self.name,
+                          "text": f"Game exited with code {self.process.returncode}"})
+        self._close_log()
+        self.hub.session_ended(self)
+        with self._lock:
+            self.ended = True
+            callbacks = list(self._exit_callbacks)
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                print(f"Game exit callback error: {e}")
+
+    # --- Hooks ---
+    def watch(self, substrings, callback):
+        """callback(line) is called once, for the first line containing any of the substrings."""
+        substrings = tuple(substrings)
+        with self._lock:
+            # The line may already have been read
+            match = next((l for l in self.lines if any(s in l["text"] for s in substrings)), None)
+            if match is None:
+                self._watchers.append((substrings, callback))
+                return
+        callback(match)
+
+    def on_exit(self, callback):
+        """callback(session) is called after the process exited and its output was read."""
+        with self._lock:
+            if not self.ended:
+                self._exit_callbacks.append(callback)
+                return
+        callback(self)
+
+    def _check_watchers(self, line):
+        fired = []
+        with self._lock:
+            for watcher in self._watchers:
+                if any(s in line["text"] for s in watcher[0]):
+                    fired.append(watcher)
+            for watcher in fired:
+                self._watchers.remove(watcher)
+        for substrings, callback in fired:
+            try:
+                callback(line)
+            except Exception as e:
+                print(f"Game output watcher error: {e}")
+
+    def join(self, timeout=None):
+        """Waits until both streams are fully read (after the process exited)."""
+        for reader in self._readers:
+            reader.join(timeout)
+
+    def tail(self, count=50, stream=None):
+        with self._lock:
+            lines = list(self.lines)
+        if stream:
+            lines = [l for l in lines if l["stream"] == stream]
+        return lines[-count:]
+
+    @property
+    def running(self):
+        return self.process.poll() is None
+
+
+class GameOutputHub:
+    """
+    Collects lines from all game sessions and hands them to subscribers in
+    batches (at most every FLUSH_INTERVAL seconds), so a game logging
+    thousands of lines per second costs a subscriber one call per interval.
+    If subscribers fall behind, only the newest MAX_PENDING lines are kept.
+    """
+    FLUSH_INTERVAL = 0.1
+    MAX_PENDING = 2000
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self.pending = deque(maxlen=self.MAX_PENDING)
+        self.subscribers = []
+        self.sessions = []
+        self._flusher = None
+
+    def start_session(self, process, name, log_path=None):
+        session = GameSession(self, process, name, log_path)
+        with self._lock:
+            self.sessions.append(session)
+        session.start()
+        return session
+
+    def session_ended(self, session):
+        with self._lock:
+            if session in self.sessions:
+                self.sessions.remove(session)
+
+    def subscribe(self, callback):
+        """callback(lines) is called from a worker thread with a list of line dicts."""
+        with self._lock:
+            self.subscribers.append(callback)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+                self._flusher.start()
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+    def publish(self, line):
+        if not self.subscribers:
+            return
+        with self._lock:
+            self.pending.append(line)
+        self._wakeup.set()
+
+    def _flush_loop(self):
+        while True:
+            self._wakeup.wait()
+            # Let a burst accumulate into one batch
+            time.sleep(self.FLUSH_INTERVAL)
+            with self._lock:
+                self._wakeup.clear()
+                batch = list(self.pending)
+                self.pending.clear()
+                subscribers = list(self.subscribers)
+            if not batch:
+                continue
+            for callback in subscribers:
+                try:
+                    callback(batch)
+                except Exception as e:
+                    print(f"Game output subscriber error: {e}")
+
+# Singleton instance
+game_output = GameOutputHub()
@@ -0,0 +1,106 @@
+import os
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from .config import Config
+
+class HashIndex:
+    """
+    Persistent (path, size, mtime) -> SHA-1 / SHA-512 index for content files.
+
+    A file is only read when it is new or its size or mtime changed; both
+    digests are computed in the same pass, on a small thread pool (hashlib
+    releases the GIL on large buffers). Stored at
+    <minecraft_dir>/launcher_cache/hash_index.json:
+        {abs_path: [size, mtime_ns, sha1, sha512]}
+    """
+    FILE_NAME = "hash_index.json"
+    WORKERS = 4
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.path = None
+        self.files = {}
+        self.stats = {"hashed": 0, "cached": 0}
+
+    def _load(self):
+        # Loaded on first use (the config decides where the cache lives)
+        path = os.path.join(Config.get_cache_dir(), self.FILE_NAME)
+        if self.path == path:
+            return
+        self.path = path
+        self.files = {}
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.files = json.load(f)
+        except Exception as e:
+            print(f"Error loading hash index: {e}")
+
+    def save(self):
+        with self._lock:
+            data = dict(self.files)
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving hash index: {e}")
+
+    def _hash(self, path):
+        sha1 = hashlib.sha1()
+        sha512 = hashlib.sha512()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                sha1.update(block)
+                sha512.update(block)
+        return sha1.hexdigest(), sha512.hexdigest()
+
+    def hashes(self, paths):
+        """{path: {"sha1", "sha512"}} for the existing files among paths."""
+        with self._lock:
+            self._load()
+        result = {}
+        stale = []
+        for path in paths:
+            key = os.path.abspath(path)
+            try:
+                st = os.stat(key)
+            except OSError:
+                continue
+            entry = self.files.get(key)
+            if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+                result[path] = {"sha1": entry[2], "sha512": entry[3]}
+            else:
+                stale.append((path, key, st))
+        self.stats["cached"] += len(result)
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+                digests = executor.map(lambda item: self._hash(item[1]), stale)
+                with self._lock:
+                    for (path, key, st), (sha1, sha512) in zip(stale, digests):
+                        self.files[key] = [st.st_size, st.st_mtime_ns, sha1, sha512]
+                        result[path] = {"sha1": sha1, "sha512": sha512}
+            self.stats["hashed"] += len(stale)
+            self.save()
+        return result
+
+    def prune(self, directory):
+        """Forgets files under directory that no longer exist."""
+        prefix = os.path.abspath(directory) + os.sep
+        with self._lock:
+            self._load()
+            gone = [key for key in self.files if key.startswith(prefix) and not os.path.exists(key)]
+            for key in gone:
+                del self.files[key]
+        if gone:
+            self.save()
+        return len(gone)
+
+# Singleton instance
+hash_index = HashIndex()
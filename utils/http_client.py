@@ -0,0 +1,154 @@
+import time
+import random
+import threading
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from .config import Config
+
+class HttpClient:
+    """
+    The launcher's one HTTP client.
+
+    A single keep-alive session (urllib3 keeps a connection pool per host)
+    with connect/read timeouts on every call, gzip, and retries with jittered
+    exponential backoff for idempotent requests (connection errors, 429 and
+    5xx; Retry-After is honoured). POST is only retried when asked to.
+
+    Requests, errors, retries, bytes and latency are counted per endpoint
+    (a short name passed by the caller, the host otherwise).
+    """
+    TIMEOUT = (5, 30) # (connect, read)
+    RETRIES = 2
+    BACKOFF = 0.5 # seconds, doubled per attempt
+    MAX_BACKOFF = 8
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+    IDEMPOTENT = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+    POOL_HOSTS = 16
+    # Largest built-in worker count (modpack installs), so the pool is sized once
+    MIN_POOL_SIZE = 16
+    USER_AGENT = "IEB-MC-Launcher"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session = None
+        self.pool_size = 0
+        self.endpoints = {}
+
+    @property
+    def session(self):
+        # Created on first use so the pool size follows the loaded config. It
+        # covers every worker pool up front: remounting drops idle keep-alives.
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    session.headers["User-Agent"] = self.USER_AGENT
+                    session.headers["Accept-Encoding"] = "gzip, deflate"
+                    self._mount(session, max(self.MIN_POOL_SIZE, int(Config.get("download_threads", 8))))
+                    self._session = session
+        return self._session
+
+    def _mount(self, session, pool_size):
+        replaced = session.adapters.get("https://")
+        adapter = HTTPAdapter(pool_connections=self.POOL_HOSTS, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        self.pool_size = pool_size
+        if replaced is not None:
+            # Requests still running on it finish; their connections close on release
+            replaced.close()
+
+    def reserve(self, connections):
+        """
+        Makes the per-host pool at least this big (one connection per download
+        worker). Only worker counts above the up-front size cost a remount.
+        """
+        session = self.session
+        with self._lock:
+            if self.pool_size < connections:
+                print(f"Growing HTTP connection pool from {self.pool_size} to {connections}")
+                self._mount(session, connections)
+
+    @classmethod
+    def backoff(cls, attempt, retry_after=None):
+        """Delay before retry number attempt (0-based): exponential with +-50% jitter."""
+        if retry_after is not None:
+            return min(cls.MAX_BACKOFF, retry_after)
+        return min(cls.MAX_BACKOFF, cls.BACKOFF * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def request(self, method, url, endpoint=None, retries=None, timeout=None, **kwargs):
+        """
+        session.request with timeouts, retries and stats. Returns the response
+        (also for error statuses); raises if the last attempt failed to connect.
+        """
+        method = method.upper()
+        endpoint = endpoint or urlsplit(url).netloc
+        if retries is None:
+            retries = self.RETRIES if method in self.IDEMPOTENT else 0
+
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, timeout=timeout or self.TIMEOUT, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(endpoint, start, error=True)
+                if attempt >= retries:
+                    raise
+                time.sleep(self.backoff(attempt))
+                self._record_retry(endpoint)
+                attempt += 1
+                continue
+
+            size = response.headers.get("Content-Length")
+            if size is None and not kwargs.get("stream"):
+                size = len(response.content)
+            self._record(endpoint, start, size=int(size or 0))
+
+            if response.status_code in self.RETRY_STATUS and attempt < retries:
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+                time.sleep(self.backoff(attempt, float(retry_after) if retry_after and retry_after.isdigit() else None))
+                self._record_retry(endpoint)
+                attempt += 1
+                continue
+            return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    # --- Stats ---
+    def _record(self, endpoint, start, size=0, error=False):
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, {
+                "requests": 0, "errors": 0, "retries": 0, "bytes": 0, "total_ms": 0.0, "max_ms": 0.0
+            })
+            stats["requests"] += 1
+            stats["errors"] += int(error)
+            stats["bytes"] += size
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def _record_retry(self, endpoint):
+        with self._lock:
+            self.endpoints[endpoint]["retries"] += 1
+
+    def stats(self):
+        """{endpoint: counters + avg_ms}, busiest (total time) first."""
+        with self._lock:
+            result = {name: dict(s, avg_ms=round(s["total_ms"] / s["requests"], 1), total_ms=round(s["total_ms"], 1),
+                                 max_ms=round(s["max_ms"], 1))
+                      for name, s in self.endpoints.items()}
+        return dict(sorted(result.items(), key=lambda kv: kv[1]["total_ms"], reverse=True))
+
+    def reset_stats(self):
+        with self._lock:
+            self.endpoints = {}
+
+# Singleton instance
+http_client = HttpClient()
@@ -0,0 +1,150 @@
+import io
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from .config import Config
+from .http_client import http_client
+
+class ImageCache:
+    """
+    Icon pipeline for result cards.
+
+    Icons are fetched on a small worker pool, downsized once to the size
+    they are shown at and stored as PNG in launcher_cache/icons, which is
+    kept under MAX_DISK_BYTES by evicting the least recently used files
+    (mtime is bumped on every hit). The Tk images made from them live in an
+    in-memory LRU of MEMORY_ITEMS; requests for an icon already on its way
+    share the fetch. Callbacks run on the Tk thread.
+    """
+    DIR_NAME = "icons"
+    MAX_DISK_BYTES = 64 * 1024 * 1024
+    MEMORY_ITEMS = 150
+    WORKERS = 6
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._memory = OrderedDict() # (url, size) -> CTkImage
+        self._pending = {} # (url, size) -> [(widget, callback)]
+        self._failed = set() # not an image / not reachable this session
+        self._disk = None # path -> size, scanned on first store
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "fetched": 0, "failed": 0, "evicted": 0}
+
+    def load(self, url, size, widget, callback):
+        """
+        callback(image) with a CTkImage of size x size, on the Tk thread.
+        Called immediately if the image is in memory, never if it can't be loaded.
+        """
+        key = (url, size)
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+            elif key in self._failed:
+                return
+            elif key in self._pending:
+                self._pending[key].append((widget, callback))
+                return
+            else:
+                self._pending[key] = [(widget, callback)]
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.WORKERS)
+                self._executor.submit(self._work, key)
+        if image is not None:
+            callback(image)
+
+    # --- Worker side ---
+    def _path(self, url, size):
+        return os.path.join(Config.get_cache_dir(self.DIR_NAME), f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}_{size}.png")
+
+    def _work(self, key):
+        url, size = key
+        try:
+            image = self._load_pil(url, size)
+        except Exception as e:
+            print(f"Icon {url} unavailable: {e}")
+            image = None
+        # Any waiting widget that still exists can hand the result to the Tk thread
+        with self._lock:
+            widgets = [w for w, _ in self._pending.get(key, [])]
+        for widget in widgets:
+            try:
+                widget.after(0, lambda: self._deliver(key, image))
+                return
+            except Exception:
+                continue
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def _load_pil(self, url, size):
+        path = self._path(url, size)
+        if os.path.isfile(path):
+            os.utime(path) # LRU: recently used
+            self.stats["disk_hits"] += 1
+            with Image.open(path) as img:
+                img.load()
+                return img.copy()
+
+        response = http_client.get(url, endpoint="modrinth icons")
+        response.raise_for_status()
+        with Image.open(io.BytesIO(response.content)) as img:
+            img = img.convert("RGBA")
+            img.thumbnail((size, size), Image.Resampling.LANCZOS)
+        self.stats["fetched"] += 1
+
+        tmp_path = path + ".tmp"
+        img.save(tmp_path, "PNG")
+        os.replace(tmp_path, path)
+        self._account(path, os.path.getsize(path))
+        return img
+
+    def _account(self, path, size):
+        with self._lock:
+            if self._disk is None:
+                directory = os.path.dirname(path)
+                self._disk = {os.path.join(directory, n): os.path.getsize(os.path.join(directory, n))
+                              for n in os.listdir(directory) if n.endswith(".png")}
+            self._disk[path] = size
+            if sum(self._disk.values()) <= self.MAX_DISK_BYTES:
+                return
+            # Evict least recently used down to 90% so this doesn't run on every store
+            by_age = sorted(self._disk, key=lambda p: os.path.getmtime(p) if os.path.exists(p) else 0)
+            total = sum(self._disk.values())
+            for old in by_age:
+                if total <= self.MAX_DISK_BYTES * 0.9:
+                    break
+                total -= self._disk.pop(old)
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
+                self.stats["evicted"] += 1
+
+    # --- Tk side ---
+    def _deliver(self, key, pil_image):
+        with self._lock:
+            waiting = self._pending.pop(key, [])
+        if pil_image is None:
+            with self._lock:
+                self._failed.add(key)
+            self.stats["failed"] += 1
+            return
+        import customtkinter as ctk # Tk objects only on the UI thread
+        image = ctk.CTkImage(light_image=pil_image, dark_image=pil_image, size=pil_image.size)
+        with self._lock:
+            self._memory[key] = image
+            while len(self._memory) > self.MEMORY_ITEMS:
+                self._memory.popitem(last=False)
+        for widget, callback in waiting:
+            try:
+                if widget.winfo_exists():
+                    callback(image)
+            except Exception as e:
+                print(f"Icon callback error: {e}")
+
+# Singleton instance
+image_cache = ImageCache()
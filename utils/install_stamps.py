@@ -0,0 +1,146 @@
+import os
+import json
+import tempfile
+import threading
+from .config import Config
+
+class InstallStamps:
+    """
+    Persistent stamp store for installed versions.
+
+    Every file in a version's closure (version JSONs, libraries, assets,
+    client jar, runtime) is recorded as (path, size, mtime, sha1) once it
+    has been verified. A warm launch then only has to stat files: if every
+    stamp still matches, nothing is hashed and nothing is downloaded.
+
+    Stored at <minecraft_dir>/launcher_cache/install_stamps.json:
+        {"files": {rel_path: [size, mtime_ns, sha1]},
+         "versions": {version_id: [rel_path, ...]}}
+    """
+    FILE_NAME = "install_stamps.json"
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_dir(cls, minecraft_dir):
+        """One shared store per minecraft directory."""
+        key = os.path.normcase(os.path.abspath(str(minecraft_dir)))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(minecraft_dir)
+            return cls._instances[key]
+
+    def __init__(self, minecraft_dir):
+        self.minecraft_dir = str(minecraft_dir)
+        self.path = os.path.join(self.minecraft_dir, Config.CACHE_DIR_NAME, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self.files = {}
+        self.versions = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.files = data.get("files", {})
+            self.versions = data.get("versions", {})
+        except Exception as e:
+            print(f"Error loading install stamps: {e}")
+            self.files = {}
+            self.versions = {}
+
+    def save(self):
+        with self._lock:
+            data = {"files": dict(self.files), "versions": dict(self.versions)}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Unique temp file: saves can run concurrently
+            fd, tmp_path = tempfile.mkstemp(prefix=self.FILE_NAME + ".", suffix=".tmp", dir=os.path.dirname(self.path))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, separators=(",", ":"))
+                os.replace(tmp_path, self.path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except Exception as e:
+            print(f"Error saving install stamps: {e}")
+
+    def _rel(self, path):
+        return os.path.relpath(path, self.minecraft_dir).replace(os.sep, "/")
+
+    def _abs(self, rel_path):
+        return os.path.join(self.minecraft_dir, *rel_path.split("/"))
+
+    # --- Per file ---
+    def matches(self, path, sha1=None):
+        """True if the file is unchanged since it was stamped (stat only, no hashing)."""
+        stamp = self.files.get(self._rel(path))
+        if not stamp:
+            return False
+        size, mtime_ns, stamped_sha1 = stamp
+        if sha1 and stamped_sha1 != sha1:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return st.st_size == size and st.st_mtime_ns == mtime_ns
+
+    def stamp(self, path, sha1=None):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self.files[self._rel(path)] = [st.st_size, st.st_mtime_ns, sha1]
+
+    # --- Per version ---
+    def is_installed(self, version_id):
+        """True if every file of the version's closure still matches its stamp."""
+        rel_paths = self.versions.get(version_id)
+        if not rel_paths:
+            return False
+        for rel_path in rel_paths:
+            stamp = self.files.get(rel_path)
+            if not stamp:
+                return False
+            try:
+                st = os.stat(self._abs(rel_path))
+            except OSError:
+                return False
+            if st.st_size != stamp[0] or st.st_mtime_ns != stamp[1]:
+                return False
+        return True
+
+    def record_version(self, version_id, paths):
+        """
+        Marks the version as complete. Files without a stamp yet are stamped now.
+        If any file is missing (e.g. an optional library failed to download)
+        the version is not marked, so the next install retries it. Returns
+        True if the version was recorded.
+        """
+        missing = [path for path in paths if not os.path.isfile(path)]
+        if missing:
+            print(f"{version_id} is missing {len(missing)} file(s), not marking it installed. First: {missing[0]}")
+            self.invalidate(version_id)
+            return False
+
+        rel_paths = []
+        for path in paths:
+            rel_path = self._rel(path)
+            if rel_path not in self.files:
+                self.stamp(path)
+            rel_paths.append(rel_path)
+        with self._lock:
+            self.versions[version_id] = sorted(set(rel_paths))
+        self.save()
+        return True
+
+    def invalidate(self, version_id):
+        with self._lock:
+            self.versions.pop(version_id, None)
+        self.save()
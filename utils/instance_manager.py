@@ -77,6 +77,20 @@ class InstanceManager:
             return True
         return False
 
+    @staticmethod
+    def update_instance(name, **fields):
+        """Sets per-instance options (e.g. jvm_preset). None removes the option."""
+        instances = InstanceManager.load_instances()
+        if name not in instances:
+            return None
+        for key, value in fields.items():
+            if value is None:
+                instances[name].pop(key, None)
+            else:
+                instances[name][key] = value
+        InstanceManager.save_instances(instances)
+        return instances[name]
+
     @staticmethod
     def get_instance(name):
         return InstanceManager.load_instances().get(name)
@@ -0,0 +1,299 @@
+import os
+import json
+import glob
+import shutil
+import platform
+import threading
+import subprocess
+from .config import Config
+
+class JavaRegistry:
+    """
+    Registry of Java runtimes found on this machine.
+
+    Runtimes are discovered once (bundled Mojang runtimes, JAVA_HOME, common
+    install roots, PATH) and each binary is probed a single time with
+    `java -XshowSettings:properties -version` for its version, vendor and
+    architecture. Probe results are cached keyed by the binary's mtime, so a
+    warm launch only stats the known binaries: no directory scanning and no
+    subprocesses. A rescan only happens when no known runtime fits, and is
+    not repeated for the same request until one of the searched
+    directories changes (something was installed or removed).
+
+    Stored at <minecraft_dir>/launcher_cache/java_runtimes.json:
+        {"runtimes": {java_path: {mtime_ns, version, major, vendor, arch, home, bundled}}}
+    """
+    FILE_NAME = "java_runtimes.json"
+    PROBE_TIMEOUT = 15
+
+    # Extra roots searched for JDK/JRE folders
+    SEARCH_ROOTS = {
+        "Windows": [
+            r"C:\Program Files\Java",
+            r"C:\Program Files (x86)\Java",
+            r"C:\Program Files\Eclipse Adoptium",
+            r"C:\Program Files\Microsoft",
+            r"C:\Program Files\Zulu",
+            r"C:\Users\Public\Java"
+        ],
+        "Linux": ["/usr/lib/jvm", "/usr/java", "/opt"],
+        "Darwin": ["/Library/Java/JavaVirtualMachines"]
+    }
+
+    def __init__(self, minecraft_dir):
+        self.minecraft_dir = str(minecraft_dir)
+        self.path = os.path.join(self.minecraft_dir, Config.CACHE_DIR_NAME, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self.runtimes = {}
+        self._misses = {} # (major, component) -> search state of the scan that found nothing
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.runtimes = json.load(f).get("runtimes", {})
+        except Exception as e:
+            print(f"Error loading Java runtimes: {e}")
+            self.runtimes = {}
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self._lock:
+                data = {"runtimes": dict(self.runtimes)}
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving Java runtimes: {e}")
+
+    # --- Discovery ---
+    @staticmethod
+    def _binary_name():
+        # javaw avoids a console window for the game on Windows
+        return "javaw.exe" if os.name == 'nt' else "java"
+
+    def _java_home_binary(self, home):
+        java = os.path.join(home, "bin", self._binary_name())
+        if os.path.isfile(java):
+            return java
+        # macOS bundles: <jdk>.jdk/Contents/Home
+        java = os.path.join(home, "Contents", "Home", "bin", self._binary_name())
+        return java if os.path.isfile(java) else None
+
+    def discover(self):
+        """Returns candidate java binaries. This is the only place that scans directories."""
+        candidates = []
+
+        # Bundled runtimes: runtime/<component>/<platform>/<component>/bin/java
+        runtime_dir = os.path.join(self.minecraft_dir, "runtime")
+        for home in glob.glob(os.path.join(runtime_dir, "*", "*", "*")):
+            java = self._java_home_binary(home)
+            if java:
+                candidates.append(java)
+
+        java_home = os.environ.get("JAVA_HOME")
+        if java_home:
+            java = self._java_home_binary(java_home)
+            if java:
+                candidates.append(java)
+
+        for root in self.SEARCH_ROOTS.get(platform.system(), []):
+            if not os.path.isdir(root):
+                continue
+            try:
+                for entry in os.scandir(root):
+                    if entry.is_dir() and ("jdk" in entry.name.lower() or "jre" in entry.name.lower() or "java" in entry.name.lower()):
+                        java = self._java_home_binary(entry.path)
+                        if java:
+                            candidates.append(java)
+            except OSError:
+                pass
+
+        for name in ("javaw", "java"):
+            java = shutil.which(name)
+            if java:
+                candidates.append(os.path.realpath(java))
+
+        # Keep order, drop duplicates
+        seen = set()
+        result = []
+        for java in candidates:
+            key = os.path.normcase(os.path.abspath(java))
+            if key not in seen:
+                seen.add(key)
+                result.append(os.path.abspath(java))
+        return result
+
+    def _search_state(self):
+        """mtimes of the directories discover() looks in; stats only."""
+        runtime_dir = os.path.join(self.minecraft_dir, "runtime")
+        dirs = [runtime_dir] + glob.glob(os.path.join(runtime_dir, "*"))
+        dirs += self.SEARCH_ROOTS.get(platform.system(), [])
+        state = [os.environ.get("JAVA_HOME"), os.environ.get("PATH")]
+        for directory in dirs:
+            try:
+                state.append((directory, os.stat(directory).st_mtime_ns))
+            except OSError:
+                state.append((directory, None))
+        return tuple(state)
+
+    # --- Probing ---
+    @staticmethod
+    def parse_major(version):
+        # "1.8.0_392" -> 8, "17.0.9" -> 17, "21" -> 21
+        parts = version.split(".")
+        try:
+            if parts[0] == "1" and len(parts) > 1:
+                return int(parts[1])
+            return int(parts[0].split("-")[0].split("+")[0])
+        except ValueError:
+            return None
+
+    def probe(self, java_path):
+        """Runs the binary once and returns its properties (or None if it isn't a usable JVM)."""
+        # javaw has no console output; probe the java binary next to it
+        probe_path = java_path
+        if os.path.basename(java_path).lower() == "javaw.exe":
+            console_java = os.path.join(os.path.dirname(java_path), "java.exe")
+            if os.path.isfile(console_java):
+                probe_path = console_java
+
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+        try:
+            result = subprocess.run(
+                [probe_path, "-XshowSettings:properties", "-version"],
+                capture_output=True, text=True, timeout=self.PROBE_TIMEOUT, **kwargs
+            )
+        except Exception as e:
+            print(f"Java probe failed for {java_path}: {e}")
+            return None
+
+        props = {}
+        for line in (result.stderr + result.stdout).splitlines():
+            if " = " in line:
+                key, value = line.strip().split(" = ", 1)
+                props.setdefault(key, value)
+
+        version = props.get("java.version")
+        if not version:
+            return None
+        return {
+            "version": version,
+            "major": self.parse_major(version),
+            "vendor": props.get("java.vendor", ""),
+            "arch": props.get("os.arch", ""),
+            "home": props.get("java.home", ""),
+            "bundled": os.path.abspath(java_path).startswith(os.path.join(os.path.abspath(self.minecraft_dir), "runtime"))
+        }
+
+    def get_info(self, java_path):
+        """Cached probe result; re-probes only when the binary changed."""
+        try:
+            mtime_ns = os.stat(java_path).st_mtime_ns
+        except OSError:
+            return None
+        info = self.runtimes.get(java_path)
+        if info and info.get("mtime_ns") == mtime_ns:
+            return info
+        info = self.probe(java_path)
+        if info is None:
+            return None
+        info["mtime_ns"] = mtime_ns
+        with self._lock:
+            self.runtimes[java_path] = info
+        return info
+
+    def rescan(self):
+        """Rediscovers and probes runtimes, dropping binaries that are gone."""
+        print("Scanning for Java runtimes...")
+        found = {}
+        for java_path in self.discover():
+            info = self.get_info(java_path)
+            if info:
+                found[java_path] = info
+        with self._lock:
+            self.runtimes = found
+        self.save()
+        return list(found.items())
+
+    def list_runtimes(self):
+        """Known runtimes that still exist. Stats only; probes only changed binaries."""
+        if not self.runtimes:
+            return self.rescan()
+        result = []
+        changed = False
+        for java_path in list(self.runtimes):
+            old = self.runtimes.get(java_path)
+            info = self.get_info(java_path)
+            if info is None:
+                with self._lock:
+                    self.runtimes.pop(java_path, None)
+                changed = True
+                continue
+            changed = changed or info is not old
+            result.append((java_path, info))
+        if changed:
+            self.save()
+        return result
+
+    # --- Selection ---
+    @staticmethod
+    def _is_64bit(arch):
+        return "64" in arch
+
+    def _pick(self, runtimes, major_version, component=None):
+        if not runtimes:
+            return None
+        want_64 = platform.machine().endswith("64")
+
+        def rank(item):
+            java_path, info = item
+            component_match = bool(component) and f"{os.sep}{component}{os.sep}" in java_path
+            return (
+                component_match,
+                info.get("bundled", False),
+                self._is_64bit(info.get("arch", "")) == want_64,
+                info.get("major") or 0
+            )
+
+        if major_version is None:
+            return max(runtimes, key=rank)[0]
+
+        exact = [r for r in runtimes if r[1].get("major") == major_version]
+        if exact:
+            return max(exact, key=rank)[0]
+        # Modern versions usually run on a newer Java; take the closest one above
+        if major_version > 8:
+            newer = [r for r in runtimes if (r[1].get("major") or 0) > major_version]
+            if newer:
+                lowest = min(r[1]["major"] for r in newer)
+                return max([r for r in newer if r[1]["major"] == lowest], key=rank)[0]
+        return None
+
+    def find(self, major_version=None, component=None):
+        """
+        Returns the path of a java binary for the given major version
+        (preferring the bundled runtime component), or None.
+        """
+        key = (major_version, component)
+        state = self._search_state()
+        missed = self._misses.get(key) == state
+        if missed and not self.runtimes:
+            return None
+        known = bool(self.runtimes)
+        java_path = self._pick(self.list_runtimes(), major_version, component)
+        if java_path is None and known and not missed:
+            # A runtime installed since the last scan
+            java_path = self._pick(self.rescan(), major_version, component)
+        if java_path is None:
+            # Not again until something changes in the searched directories
+            self._misses[key] = state
+        else:
+            self._misses.pop(key, None)
+        return java_path
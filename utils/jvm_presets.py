@@ -0,0 +1,280 @@
+import os
+import json
+import hashlib
+import threading
+import subprocess
+from .config import Config
+
+class JvmPresets:
+    """
+    JVM tuning presets.
+
+    A preset turns (Java major version, heap size, core count) into GC and
+    runtime flags. Every -XX flag is checked against the flags the selected
+    JVM actually has (-XX:+PrintFlagsFinal, cached per binary and mtime);
+    unknown flags are dropped and experimental ones get their unlock flag.
+    The final argument list is test-started once (java <args> -version) and
+    that result is cached too, so a preset can never stop the game from
+    starting: if it fails, only the heap arguments are passed.
+
+    Stored at <minecraft_dir>/launcher_cache/jvm_flags.json.
+    """
+    FILE_NAME = "jvm_flags.json"
+    PROBE_TIMEOUT = 20
+
+    # key -> label shown in Settings / instance options
+    PRESETS = {
+        "auto": "Auto",
+        "none": "None (heap only)",
+        "g1": "G1 Low Latency",
+        "zgc": "ZGC (Large Heap)",
+        "throughput": "Throughput",
+        "small_heap": "Small Heap (Legacy)"
+    }
+    DEFAULT_PRESET = "auto"
+
+    UNLOCK_FLAGS = {
+        "experimental": "-XX:+UnlockExperimentalVMOptions",
+        "diagnostic": "-XX:+UnlockDiagnosticVMOptions"
+    }
+
+    def __init__(self, minecraft_dir):
+        self.minecraft_dir = str(minecraft_dir)
+        self.path = os.path.join(self.minecraft_dir, Config.CACHE_DIR_NAME, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self.flags = {}      # java_path -> {"mtime_ns", "flags": {name: kind}}
+        self.validated = {}  # sha1(java_path, mtime, args) -> bool
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.flags = data.get("flags", {})
+            self.validated = data.get("validated", {})
+        except Exception as e:
+            print(f"Error loading JVM flag cache: {e}")
+            self.flags = {}
+            self.validated = {}
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self._lock:
+                data = {"flags": dict(self.flags), "validated": dict(self.validated)}
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving JVM flag cache: {e}")
+
+    @classmethod
+    def get_global_preset(cls):
+        preset = Config.get("jvm_preset")
+        if preset is None:
+            # Configs from before presets: the old FPS Boost checkbox maps to Auto
+            return "auto" if Config.get("fps_boost", False) else "none"
+        return preset if preset in cls.PRESETS else cls.DEFAULT_PRESET
+
+    # --- JVM probing ---
+    @staticmethod
+    def _run(java_path, args):
+        # javaw has no console output
+        if os.path.basename(java_path).lower() == "javaw.exe":
+            console_java = os.path.join(os.path.dirname(java_path), "java.exe")
+            if os.path.isfile(console_java):
+                java_path = console_java
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs["creationflags"] = subprocess.CREATE_NO_WINDOW
+        return subprocess.run([java_path] + args, capture_output=True, text=True,
+                              timeout=JvmPresets.PROBE_TIMEOUT, **kwargs)
+
+    @staticmethod
+    def _mtime(java_path):
+        try:
+            return os.stat(java_path).st_mtime_ns
+        except OSError:
+            return None
+
+    def supported_flags(self, java_path):
+        """{flag name: kind} for the JVM (kind is product/experimental/diagnostic/...), or None."""
+        mtime_ns = self._mtime(java_path)
+        if mtime_ns is None:
+            return None
+        cached = self.flags.get(java_path)
+        if cached and cached.get("mtime_ns") == mtime_ns:
+            return cached["flags"]
+
+        try:
+            result = self._run(java_path, [
+                "-XX:+UnlockExperimentalVMOptions",
+                "-XX:+UnlockDiagnosticVMOptions",
+                "-XX:+PrintFlagsFinal",
+                "-version"
+            ])
+        except Exception as e:
+            print(f"Could not read JVM flags from {java_path}: {e}")
+            return None
+
+        # "     bool UseG1GC      = true      {product} {ergonomic}"
+        flags = {}
+        for line in result.stdout.splitlines():
+            if "=" not in line or "{" not in line:
+                continue
+            parts = line.split()
+            if len(parts) < 4:
+                continue
+            name = parts[1]
+            kind = line[line.index("{") + 1:line.index("}")].strip().split(" ")[0]
+            flags[name] = kind
+        if not flags:
+            return None
+
+        with self._lock:
+            self.flags[java_path] = {"mtime_ns": mtime_ns, "flags": flags}
+        self.save()
+        return flags
+
+    def _starts(self, java_path, args):
+        """Test-starts the JVM with args once; cached per binary."""
+        key = hashlib.sha1(json.dumps([java_path, self._mtime(java_path), args]).encode("utf-8")).hexdigest()
+        if key in self.validated:
+            return self.validated[key]
+        try:
+            ok = self._run(java_path, args + ["-version"]).returncode == 0
+        except Exception as e:
+            print(f"JVM argument check failed: {e}")
+            ok = False
+        with self._lock:
+            self.validated[key] = ok
+        self.save()
+        return ok
+
+    # --- Presets ---
+    @staticmethod
+    def resolve(preset, major_version, ram_mb, cpu_count):
+        """Maps "auto" (and presets that don't fit the JVM / heap) to a concrete preset."""
+        major_version = major_version or 8
+        if preset == "auto":
+            if major_version >= 17 and ram_mb >= 8192 and cpu_count >= 4:
+                return "zgc"
+            if major_version <= 8 or ram_mb <= 2048:
+                return "small_heap"
+            return "g1"
+        if preset == "zgc" and major_version < 17:
+            # ZGC is production-ready (and on every platform) from Java 15+; 17 is the first LTS
+            return "g1"
+        return preset
+
+    @staticmethod
+    def preset_flags(preset, major_version, ram_mb, cpu_count):
+        """Raw flags for a concrete preset, before checking them against the JVM."""
+        major_version = major_version or 8
+        flags = []
+
+        if preset == "g1":
+            large = ram_mb >= 12288
+            flags = [
+                "-XX:+UseG1GC",
+                "-XX:+ParallelRefProcEnabled",
+                "-XX:MaxGCPauseMillis=200",
+                "-XX:+DisableExplicitGC",
+                "-XX:+AlwaysPreTouch",
+                f"-XX:G1NewSizePercent={40 if large else 30}",
+                f"-XX:G1MaxNewSizePercent={50 if large else 40}",
+                f"-XX:G1HeapRegionSize={16 if large else 8}M",
+                f"-XX:G1ReservePercent={15 if large else 20}",
+                "-XX:G1HeapWastePercent=5",
+                "-XX:G1MixedGCCountTarget=4",
+                f"-XX:InitiatingHeapOccupancyPercent={20 if large else 15}",
+                "-XX:G1MixedGCLiveThresholdPercent=90",
+                "-XX:G1RSetUpdatingPauseTimePercent=5",
+                "-XX:SurvivorRatio=32",
+                "-XX:+PerfDisableSharedMem",
+                "-XX:MaxTenuringThreshold=1"
+            ]
+            if cpu_count <= 4:
+                flags.append(f"-XX:ConcGCThreads={max(1, cpu_count // 2)}")
+
+        elif preset == "zgc":
+            flags = [
+                "-XX:+UseZGC",
+                "-XX:+DisableExplicitGC",
+                "-XX:+AlwaysPreTouch",
+                "-XX:+PerfDisableSharedMem",
+                f"-XX:ConcGCThreads={max(1, cpu_count // 4)}"
+            ]
+            if major_version >= 21:
+                # Generational ZGC (default from 23, flag removed later; dropped if unknown)
+                flags.append("-XX:+ZGenerational")
+
+        elif preset == "throughput":
+            flags = [
+                "-XX:+UseParallelGC",
+                f"-XX:ParallelGCThreads={max(1, min(cpu_count, 16))}",
+                "-XX:+DisableExplicitGC",
+                "-XX:+PerfDisableSharedMem"
+            ]
+
+        elif preset == "small_heap":
+            if ram_mb <= 1536:
+                flags = ["-XX:+UseSerialGC"]
+            else:
+                flags = [
+                    "-XX:+UseG1GC",
+                    "-XX:MaxGCPauseMillis=50",
+                    "-XX:G1HeapRegionSize=4M",
+                    "-XX:+ParallelRefProcEnabled"
+                ]
+            flags.append("-XX:+DisableExplicitGC")
+
+        return flags
+
+    @staticmethod
+    def _flag_name(flag):
+        # "-XX:+UseG1GC" -> UseG1GC, "-XX:G1HeapRegionSize=8M" -> G1HeapRegionSize
+        name = flag[4:]
+        if name[:1] in "+-":
+            name = name[1:]
+        return name.split("=", 1)[0]
+
+    def filter_flags(self, flags, supported):
+        """Drops flags the JVM doesn't have and adds unlock flags where needed."""
+        kept = []
+        unlocks = []
+        for flag in flags:
+            name = self._flag_name(flag)
+            kind = supported.get(name)
+            if kind is None:
+                print(f"JVM preset: dropping unsupported flag {flag}")
+                continue
+            unlock = self.UNLOCK_FLAGS.get(kind)
+            if unlock and unlock not in unlocks:
+                unlocks.append(unlock)
+            kept.append(flag)
+        return unlocks + kept
+
+    def build_args(self, preset, java_path, major_version, ram_mb, cpu_count=None):
+        """Heap arguments plus the preset's flags that this JVM accepts."""
+        cpu_count = cpu_count or os.cpu_count() or 4
+        heap_args = [f"-Xmx{ram_mb}M", "-Xms128M"]
+
+        preset = self.resolve(preset or self.DEFAULT_PRESET, major_version, ram_mb, cpu_count)
+        flags = self.preset_flags(preset, major_version, ram_mb, cpu_count)
+        if not flags or not java_path:
+            return heap_args
+
+        supported = self.supported_flags(java_path)
+        if supported is None:
+            # Can't check them, so don't risk them
+            return heap_args
+
+        args = heap_args + self.filter_flags(flags, supported)
+        if not self._starts(java_path, args):
+            print(f"JVM preset '{preset}' does not start with {java_path}, using heap arguments only")
+            return heap_args
+        return args
@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import hashlib
+import platform
+import threading
+from .config import Config
+
+class LaunchPlanCache:
+    """
+    Memoized launch-command builder.
+
+    The first launch of a version builds the full command once with marker
+    values in place of the per-launch fields (username, UUID, token) and
+    stores it as a plan: resolved classpath, natives and the argument
+    template. Later launches only substitute those fields.
+
+    Plans are keyed by version id, the content hashes of the version JSON and
+    everything it inherits from, the OS and the remaining option set, so any
+    edit to a version JSON or a changed option builds a fresh plan.
+    """
+    FILE_NAME = "launch_plans.json"
+    MAX_PLANS = 32
+
+    # platform.architecture() spawns a subprocess on some systems, so resolve it once
+    OS_KEY = [platform.system(), platform.machine(), platform.architecture()[0]]
+
+    # Per-launch option -> marker baked into the template
+    MARKERS = {
+        "username": "__IEB_USERNAME__",
+        "uuid": "__IEB_UUID__",
+        "token": "__IEB_TOKEN__"
+    }
+
+    def __init__(self, minecraft_dir):
+        self.minecraft_dir = str(minecraft_dir)
+        self.path = os.path.join(self.minecraft_dir, Config.CACHE_DIR_NAME, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self.plans = {}
+        # json path -> (size, mtime_ns, sha1, inheritsFrom); avoids re-hashing unchanged JSONs
+        self._json_info = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.plans = json.load(f)
+        except Exception as e:
+            print(f"Error loading launch plans: {e}")
+            self.plans = {}
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self._lock:
+                # Keep only the most recently used plans
+                plans = sorted(self.plans.items(), key=lambda kv: kv[1].get("used", 0), reverse=True)
+                self.plans = dict(plans[:self.MAX_PLANS])
+                data = dict(self.plans)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error saving launch plans: {e}")
+
+    # --- Key ---
+    def _version_hashes(self, version_id):
+        """Content hashes of the version JSON and its inheritsFrom chain."""
+        hashes = []
+        current = version_id
+        while current and len(hashes) < 8:
+            json_path = os.path.join(self.minecraft_dir, "versions", current, current + ".json")
+            st = os.stat(json_path)
+            info = self._json_info.get(json_path)
+            if info is None or info[0] != st.st_size or info[1] != st.st_mtime_ns:
+                with open(json_path, "rb") as f:
+                    raw = f.read()
+                info = (st.st_size, st.st_mtime_ns, hashlib.sha1(raw).hexdigest(), json.loads(raw).get("inheritsFrom"))
+                self._json_info[json_path] = info
+            hashes.append(info[2])
+            current = info[3]
+        return hashes
+
+    def make_key(self, version_id, options):
+        fixed_options = {k: v for k, v in options.items() if k not in self.MARKERS}
+        key_data = {
+            "version": version_id,
+            "json": self._version_hashes(version_id),
+            "os": self.OS_KEY,
+            "options": fixed_options
+        }
+        return hashlib.sha1(json.dumps(key_data, sort_keys=True).encode("utf-8")).hexdigest()
+
+    # --- Plans ---
+    def get_command(self, version_id, options, build):
+        """
+        Returns the launch command for version_id. build(options) is called
+        with marker values only when no valid plan exists (cold path).
+        """
+        key = self.make_key(version_id, options)
+        plan = self.plans.get(key)
+
+        if plan and not self._plan_valid(plan):
+            plan = None
+
+        if plan is None:
+            template_options = dict(options)
+            template_options.update(self.MARKERS)
+            command = build(template_options)
+            plan = self._make_plan(version_id, command)
+            plan["used"] = time.time()
+            with self._lock:
+                self.plans[key] = plan
+            self.save()
+        else:
+            plan["used"] = time.time()
+
+        return self.fill(plan["command"], options)
+
+    def _make_plan(self, version_id, command):
+        classpath = ""
+        if "-cp" in command:
+            classpath = command[command.index("-cp") + 1]
+        natives_dir = ""
+        for arg in command:
+            if arg.startswith("-Djava.library.path="):
+                natives_dir = arg.split("=", 1)[1]
+                break
+        natives = [entry for entry in classpath.split(os.pathsep) if "-natives-" in os.path.basename(entry)]
+        return {
+            "version": version_id,
+            "command": command,
+            "classpath": classpath,
+            "natives_dir": natives_dir,
+            "natives": natives
+        }
+
+    @staticmethod
+    def _plan_valid(plan):
+        # A bundled runtime that has since been removed needs a fresh plan
+        executable = plan["command"][0] if plan.get("command") else None
+        if not executable:
+            return False
+        return not os.path.isabs(executable) or os.path.exists(executable)
+
+    def fill(self, template, options):
+        values = {marker: options.get(field, "") for field, marker in self.MARKERS.items()}
+        command = []
+        for arg in template:
+            if "__IEB_" in arg:
+                for marker, value in values.items():
+                    arg = arg.replace(marker, value)
+            command.append(arg)
+        return command
+
+    def invalidate(self, version_id=None):
+        with self._lock:
+            if version_id is None:
+                self.plans = {}
+            else:
+                self.plans = {k: v for k, v in self.plans.items() if v.get("version") != version_id}
+        self.save()
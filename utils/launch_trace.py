@@ -0,0 +1,172 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from .config import Config
+
+class LaunchTrace:
+    """
+    Spans recorded for one launch, exported in Chrome's trace event format
+    (open the file in chrome://tracing or https://ui.perfetto.dev).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.time()
+        self.events = []
+        self.counters = {}
+        self.finished = False
+        self.deferred = False # finished later by the game session (first log lines)
+        self._lock = threading.Lock()
+
+    def _ts(self, t):
+        return int((t - self.started) * 1000000)
+
+    def add_span(self, name, start, end, **args):
+        event = {
+            "name": name, "cat": "launch", "ph": "X",
+            "ts": self._ts(start), "dur": max(0, int((end - start) * 1000000)),
+            "pid": os.getpid(), "tid": threading.get_ident(), "args": args
+        }
+        with self._lock:
+            self.events.append(event)
+        return event
+
+    @contextmanager
+    def span(self, name, **args):
+        start = time.time()
+        event_args = dict(args)
+        try:
+            yield event_args
+        finally:
+            self.add_span(name, start, time.time(), **event_args)
+
+    def instant(self, name, t=None, **args):
+        with self._lock:
+            self.events.append({
+                "name": name, "cat": "launch", "ph": "i", "s": "p",
+                "ts": self._ts(t or time.time()),
+                "pid": os.getpid(), "tid": threading.get_ident(), "args": args
+            })
+
+    def count(self, key, value):
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def summary(self):
+        with self._lock:
+            spans = [e for e in self.events if e["ph"] == "X"]
+            end = max([e["ts"] + e["dur"] for e in spans] + [e["ts"] for e in self.events] + [0])
+        phases = {}
+        for e in spans:
+            phases[e["name"]] = phases.get(e["name"], 0) + round(e["dur"] / 1000, 1)
+        return {
+            "name": self.name,
+            "started": self.started,
+            "total_ms": round(end / 1000, 1),
+            "phases": phases,
+            "counters": dict(self.counters)
+        }
+
+    def to_chrome(self):
+        with self._lock:
+            events = list(self.events)
+        events.append({"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": "IEB-MC-Launcher"}})
+        return {"traceEvents": events, "displayTimeUnit": "ms", "metadata": self.summary()}
+
+
+class LaunchTracer:
+    """
+    Hands out the trace for the launch running on the current thread, so
+    LauncherCore can add spans without a trace being passed around. Spans
+    outside a launch are no-ops. Finished traces are written to
+    <cache>/traces, keeping the newest MAX_TRACES.
+    """
+    DIR_NAME = "traces"
+    MAX_TRACES = 20
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def begin(self, name):
+        trace = LaunchTrace(name)
+        self._local.trace = trace
+        return trace
+
+    def current(self):
+        return getattr(self._local, "trace", None)
+
+    @contextmanager
+    def span(self, name, **args):
+        trace = self.current()
+        if trace is None:
+            yield dict(args)
+            return
+        with trace.span(name, **args) as event_args:
+            yield event_args
+
+    def add_span(self, name, start, end=None, **args):
+        """Span from explicit timestamps (for phases that don't fit a with-block)."""
+        trace = self.current()
+        if trace is not None:
+            trace.add_span(name, start, end or time.time(), **args)
+
+    def count(self, key, value):
+        trace = self.current()
+        if trace is not None:
+            trace.count(key, value)
+
+    def release(self, trace):
+        """Ends the launch thread's part. The trace is written now unless the game session finishes it."""
+        if getattr(self._local, "trace", None) is trace:
+            self._local.trace = None
+        if not trace.deferred:
+            self.finish(trace)
+
+    def finish(self, trace):
+        with trace._lock:
+            if trace.finished:
+                return None
+            trace.finished = True
+        try:
+            trace_dir = Config.get_cache_dir(self.DIR_NAME)
+            path = os.path.join(trace_dir, time.strftime("launch-%Y%m%d-%H%M%S", time.localtime(trace.started)) + f"-{int(trace.started * 1000) % 1000:03d}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(trace.to_chrome(), f)
+            self._prune(trace_dir)
+            summary = trace.summary()
+            print(f"Launch trace saved ({summary['total_ms']} ms): {path}")
+            return path
+        except Exception as e:
+            print(f"Error saving launch trace: {e}")
+            return None
+
+    def _prune(self, trace_dir):
+        traces = sorted(f for f in os.listdir(trace_dir) if f.startswith("launch-") and f.endswith(".json"))
+        for name in traces[:-self.MAX_TRACES]:
+            try:
+                os.remove(os.path.join(trace_dir, name))
+            except OSError:
+                pass
+
+    def list_traces(self, limit=10):
+        """Summaries of the newest traces, newest first."""
+        try:
+            trace_dir = Config.get_cache_dir(self.DIR_NAME)
+            names = sorted((f for f in os.listdir(trace_dir) if f.startswith("launch-") and f.endswith(".json")), reverse=True)
+        except OSError:
+            return []
+        result = []
+        for name in names[:limit]:
+            try:
+                with open(os.path.join(trace_dir, name), "r", encoding="utf-8") as f:
+                    summary = json.load(f).get("metadata", {})
+                summary["path"] = os.path.join(trace_dir, name)
+                result.append(summary)
+            except Exception as e:
+                print(f"Error reading launch trace {name}: {e}")
+        return result
+
+# Singleton instance
+tracer = LaunchTracer()
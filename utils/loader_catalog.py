@@ -0,0 +1,257 @@
+import os
+import re
+import json
+import time
+import threading
+import xml.etree.ElementTree as ET
+from .config import Config
+from .http_client import http_client
+from .offline_mode import OfflineMode
+
+class LoaderCatalog:
+    """
+    Disk-backed catalog of Forge, Fabric and Quilt versions.
+
+    The upstream metadata (Forge maven metadata + promotions, Fabric/Quilt
+    meta) is kept in <cache>/loaders with its ETag and pre-indexed by
+    Minecraft version, newest first by version order (1.9 < 1.10, pre-releases
+    before the release). Lookups are served from the index on disk; copies
+    older than TTL are revalidated in the background, so the installers
+    page fills instantly and works offline. Listeners are told when a
+    loader's index changed.
+    """
+    DIR_NAME = "loaders"
+    TTL = 6 * 60 * 60
+    LOADERS = ("Forge", "Fabric", "Quilt")
+    SOURCES = {
+        "Forge": {
+            "versions": "https://maven.minecraftforge.net/net/minecraftforge/forge/maven-metadata.xml",
+            "promotions": "https://files.minecraftforge.net/net/minecraftforge/forge/promotions_slim.json"
+        },
+        "Fabric": {
+            "game": "https://meta.fabricmc.net/v2/versions/game",
+            "loader": "https://meta.fabricmc.net/v2/versions/loader"
+        },
+        "Quilt": {
+            "game": "https://meta.quiltmc.org/v3/versions/game",
+            "loader": "https://meta.quiltmc.org/v3/versions/loader"
+        }
+    }
+
+    _lock = threading.Lock()
+    _indexes = {}
+    _revalidating = set()
+    _listeners = []
+
+    # --- Version ordering ---
+    @staticmethod
+    def version_key(version):
+        """Sort key: numbers compare numerically, a suffix (pre, rc, beta) sorts before the plain version."""
+        key = []
+        for part in re.findall(r"\d+|[a-zA-Z]+", version):
+            key.append((2, int(part), "") if part.isdigit() else (0, 0, part.lower()))
+        key.append((1, 0, ""))
+        return key
+
+    @classmethod
+    def sort_versions(cls, versions):
+        return sorted(versions, key=cls.version_key, reverse=True)
+
+    # --- Disk ---
+    @classmethod
+    def _path(cls, name):
+        return os.path.join(Config.get_cache_dir(cls.DIR_NAME), name)
+
+    @classmethod
+    def _read_json(cls, name, default=None):
+        path = cls._path(name)
+        if not os.path.exists(path):
+            return default
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error reading loader catalog {name}: {e}")
+            return default
+
+    @classmethod
+    def _write(cls, name, data):
+        # bytes are written as-is, anything else as JSON
+        path = cls._path(name)
+        tmp_path = path + ".tmp"
+        if isinstance(data, bytes):
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _raw_name(loader, source):
+        return f"{loader.lower()}-{source}.raw"
+
+    # --- Index ---
+    @classmethod
+    def _build(cls, loader):
+        raw = {}
+        for source in cls.SOURCES[loader]:
+            path = cls._path(cls._raw_name(loader, source))
+            if not os.path.exists(path):
+                return None
+            with open(path, "rb") as f:
+                raw[source] = f.read()
+
+        if loader == "Forge":
+            promos = json.loads(raw["promotions"]).get("promos", {})
+            by_game = {}
+            for node in ET.fromstring(raw["versions"]).iter("version"):
+                mc, _, forge = (node.text or "").partition("-")
+                if forge:
+                    by_game.setdefault(mc, []).append(forge)
+            loaders = {}
+            latest = {}
+            for mc, versions in by_game.items():
+                recommended = promos.get(f"{mc}-recommended")
+                versions = cls.sort_versions(versions)
+                loaders[mc] = [{"version": v, "stable": v == recommended} for v in versions]
+                latest[mc] = recommended or promos.get(f"{mc}-latest") or versions[0]
+            return {"game_versions": cls.sort_versions(by_game), "loaders": loaders, "latest": latest}
+
+        # Fabric / Quilt: any loader build runs on every supported game version (source order is newest first)
+        games = json.loads(raw["game"])
+        loader_list = [{"version": v["version"], "stable": v.get("stable", True)} for v in json.loads(raw["loader"])]
+        latest = next((v["version"] for v in loader_list if v["stable"]), loader_list[0]["version"] if loader_list else None)
+        return {
+            "game_versions": [v["version"] for v in games],
+            "stable_game_versions": [v["version"] for v in games if v.get("stable")],
+            "all_loaders": loader_list,
+            "latest_loader": latest
+        }
+
+    @classmethod
+    def _get(cls, loader):
+        if loader not in cls.SOURCES:
+            raise Exception(f"Unknown loader {loader}")
+        with cls._lock:
+            if loader not in cls._indexes:
+                cls._indexes[loader] = cls._read_json(f"{loader.lower()}.index.json")
+            index = cls._indexes[loader]
+
+        if index is None:
+            # First use: nothing on disk yet
+            if OfflineMode.active():
+                return {}
+            try:
+                cls.revalidate(loader)
+            except Exception as e:
+                print(f"Could not load {loader} versions: {e}")
+            return cls._indexes.get(loader) or {}
+        if time.time() - index.get("checked", 0) > cls.TTL:
+            cls.revalidate_async(loader)
+        return index
+
+    # --- Public API ---
+    @classmethod
+    def game_versions(cls, loader, stable_only=False):
+        """Minecraft versions the loader supports, newest first."""
+        index = cls._get(loader)
+        if stable_only and "stable_game_versions" in index:
+            return list(index["stable_game_versions"])
+        return list(index.get("game_versions", []))
+
+    @classmethod
+    def loader_versions(cls, loader, mc_version):
+        """All loader builds for a Minecraft version, newest first: [{"version", "stable"}]."""
+        index = cls._get(loader)
+        if "loaders" in index:
+            return list(index["loaders"].get(mc_version, []))
+        if mc_version in index.get("game_versions", []):
+            return list(index.get("all_loaders", []))
+        return []
+
+    @classmethod
+    def latest(cls, loader, mc_version, stable=True):
+        """Latest (stable/recommended if there is one) loader version for a Minecraft version, or None."""
+        index = cls._get(loader)
+        if "loaders" in index:
+            if stable:
+                return index["latest"].get(mc_version)
+            versions = index["loaders"].get(mc_version)
+            return versions[0]["version"] if versions else None
+        if mc_version not in index.get("game_versions", []):
+            return None
+        if stable:
+            return index.get("latest_loader")
+        loaders = index.get("all_loaders", [])
+        return loaders[0]["version"] if loaders else None
+
+    @classmethod
+    def add_listener(cls, callback):
+        """callback(loader) is called from a worker thread when a loader's index changed."""
+        cls._listeners.append(callback)
+
+    @classmethod
+    def remove_listener(cls, callback):
+        if callback in cls._listeners:
+            cls._listeners.remove(callback)
+
+    @classmethod
+    def revalidate_async(cls, loader, force=False):
+        if OfflineMode.active():
+            return
+        with cls._lock:
+            index = cls._indexes.get(loader)
+            if loader in cls._revalidating or (not force and index and time.time() - index.get("checked", 0) <= cls.TTL):
+                return
+            cls._revalidating.add(loader)
+
+        def run():
+            try:
+                cls.revalidate(loader)
+            except Exception as e:
+                print(f"{loader} catalog revalidation failed, using cached copy: {e}")
+            finally:
+                cls._revalidating.discard(loader)
+        threading.Thread(target=run, daemon=True).start()
+
+    @classmethod
+    def revalidate(cls, loader):
+        """Conditional GETs for the loader's sources; rebuilds the index if anything changed."""
+        meta = cls._read_json(f"{loader.lower()}.meta.json", {})
+        changed = False
+        for source, url in cls.SOURCES[loader].items():
+            headers = {}
+            source_meta = meta.get(source, {})
+            if os.path.exists(cls._path(cls._raw_name(loader, source))):
+                if source_meta.get("etag"):
+                    headers["If-None-Match"] = source_meta["etag"]
+                if source_meta.get("last_modified"):
+                    headers["If-Modified-Since"] = source_meta["last_modified"]
+            response = http_client.get(url, headers=headers, endpoint=f"{loader.lower()} metadata")
+            if response.status_code == 304:
+                continue
+            response.raise_for_status()
+            cls._write(cls._raw_name(loader, source), response.content)
+            meta[source] = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+            changed = True
+        cls._write(f"{loader.lower()}.meta.json", meta)
+
+        with cls._lock:
+            index = cls._indexes.get(loader)
+        if changed or index is None:
+            index = cls._build(loader)
+            if index is None:
+                return False
+        index["checked"] = time.time()
+        cls._write(f"{loader.lower()}.index.json", index)
+        with cls._lock:
+            cls._indexes[loader] = index
+
+        if changed:
+            for listener in list(cls._listeners):
+                try:
+                    listener(loader)
+                except Exception as e:
+                    print(f"Loader catalog listener error: {e}")
+        return changed
@@ -0,0 +1,154 @@
+import os
+import time
+import queue
+import threading
+from .modrinth_api import ModrinthAPI
+from .content_manager import ContentManager
+from .downloader import Downloader
+
+class ModDownloader:
+    """
+    Download queue for Modrinth content (mods, resource packs, shaders).
+
+    enqueue() returns at once; a few worker threads take items from a
+    bounded queue, pick the newest file of the project that matches the
+    instance's game version (and loader, for mods), stream it to a .part
+    file with its SHA-512 checked and move it into the instance's content
+    directory. Listeners get each item dict whenever its state or progress
+    changes (from a worker thread).
+    """
+    MAX_WORKERS = 3
+    MAX_QUEUED = 50
+    KEEP_FINISHED = 100 # finished items kept in self.items
+    PROGRESS_INTERVAL = 0.2 # seconds between progress notifications per item
+    # Loaders whose mods an instance can also load
+    COMPATIBLE_LOADERS = {"quilt": ["quilt", "fabric"]}
+
+    def __init__(self):
+        self._queue = queue.Queue(maxsize=self.MAX_QUEUED)
+        self._lock = threading.Lock()
+        self._workers = []
+        self._listeners = []
+        self._next_id = 0
+        self.items = []
+        self.downloader = None # created with the first worker
+
+    def enqueue(self, project, content_type, instance, version=None):
+        """
+        Queues a search hit / project for the instance. Returns the item dict.
+        With a version dict (e.g. from an install plan) no lookup is made.
+        """
+        with self._lock:
+            self._next_id += 1
+            item = {
+                "id": self._next_id, "title": project.get("title") or project.get("slug"),
+                "project_id": project.get("project_id") or project.get("id") or project.get("slug"),
+                "content_type": content_type, "instance": instance["name"], "state": "queued",
+                "received": 0, "total": None, "filename": None, "path": None, "error": None, "version": version
+            }
+        try:
+            self._queue.put_nowait((item, dict(instance)))
+        except queue.Full:
+            raise Exception(f"Download queue is full ({self.MAX_QUEUED} items), try again later")
+        with self._lock:
+            finished = [i for i in self.items if i["state"] in ("done", "present", "failed")]
+            for old in finished[:max(0, len(finished) - self.KEEP_FINISHED)]:
+                self.items.remove(old)
+            self.items.append(item)
+            if self.downloader is None:
+                self.downloader = Downloader(max_workers=self.MAX_WORKERS)
+            if len(self._workers) < self.MAX_WORKERS:
+                worker = threading.Thread(target=self._worker, daemon=True)
+                self._workers.append(worker)
+                worker.start()
+        self._notify(item)
+        return item
+
+    def active(self):
+        with self._lock:
+            return [i for i in self.items if i["state"] in ("queued", "resolving", "downloading")]
+
+    def add_listener(self, callback):
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, item):
+        for listener in list(self._listeners):
+            try:
+                listener(dict(item))
+            except Exception as e:
+                print(f"Mod download listener error: {e}")
+
+    # --- Resolving ---
+    @classmethod
+    def loader_filter(cls, content_type, instance):
+        """Modrinth loader names a file must have for the instance (None = any)."""
+        loader = (instance.get("loader") or "None").lower()
+        if content_type != "mod" or loader == "none":
+            return None
+        return cls.COMPATIBLE_LOADERS.get(loader, [loader])
+
+    @staticmethod
+    def primary_file(version):
+        url, filename = ModrinthAPI.get_version_file(version)
+        if not url:
+            raise Exception(f"Version {version.get('version_number')} has no files")
+        return next(f for f in version["files"] if f["url"] == url)
+
+    def resolve(self, project_id, content_type, instance):
+        """Newest matching version (releases first) and its primary file dict."""
+        loaders = self.loader_filter(content_type, instance)
+        versions = ModrinthAPI.get_project_versions(project_id, loaders=loaders, game_versions=[instance["version"]])
+        if not versions:
+            raise Exception(f"No file for MC {instance['version']}" + (f" / {instance['loader']}" if loaders else ""))
+        version = next((v for v in versions if v.get("version_type") == "release"), versions[0])
+        return version, self.primary_file(version)
+
+    # --- Workers ---
+    def _worker(self):
+        while True:
+            item, instance = self._queue.get()
+            try:
+                self._download(item, instance)
+            except Exception as e:
+                item["state"], item["error"] = "failed", str(e)
+                print(f"Download of {item['title']} failed: {e}")
+            finally:
+                self._notify(item)
+                self._queue.task_done()
+
+    def _download(self, item, instance):
+        if item["version"]:
+            file = self.primary_file(item["version"])
+        else:
+            item["state"] = "resolving"
+            self._notify(item)
+            _, file = self.resolve(item["project_id"], item["content_type"], instance)
+        target_dir = ContentManager.get_dir(item["content_type"], instance["path"])
+        if not target_dir:
+            raise Exception(f"Can't install {item['content_type']} into an instance")
+
+        item.update(state="downloading", filename=file["filename"], total=file.get("size"),
+                    path=os.path.join(target_dir, file["filename"]))
+        self._notify(item)
+        last = [0.0]
+
+        def progress(received, total):
+            item["received"], item["total"] = received, total
+            now = time.monotonic()
+            if now - last[0] >= self.PROGRESS_INTERVAL:
+                last[0] = now
+                self._notify(item)
+
+        hashes = file.get("hashes", {})
+        job = {"url": file["url"], "path": item["path"], "sha512": hashes.get("sha512"),
+               "sha1": None if hashes.get("sha512") else hashes.get("sha1"), "size": file.get("size")}
+        transferred = self.downloader.download_file(job, progress=progress)
+        item["state"] = "done" if transferred else "present"
+        item["received"] = item["total"] = os.path.getsize(item["path"])
+
+# Singleton instance
+mod_downloads = ModDownloader()
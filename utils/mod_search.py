@@ -0,0 +1,142 @@
+import time
+import threading
+from collections import OrderedDict
+from .modrinth_api import ModrinthAPI
+
+class ModSearch:
+    """
+    Modrinth search with an LRU + TTL result cache.
+
+    Results are keyed by the normalized request (query case and spacing,
+    project type, sorted facets, index, offset, limit). Identical requests
+    in flight share one HTTP call, and errors are never cached.
+
+    submit() is the UI entry point: every call on a channel (one per search
+    box) supersedes the previous one, requests wait out a debounce delay
+    first, and results of superseded requests are dropped, so typing sends
+    at most one request per pause and an old answer never overwrites a newer
+    one. Cached answers are delivered immediately.
+    """
+    MAX_ENTRIES = 128
+    TTL = 5 * 60
+    DEBOUNCE = 0.35 # seconds
+    PAGE_SIZE = 20
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache = OrderedDict() # key -> (stored_at, result)
+        self._inflight = {} # key -> {"event", "result", "error"}
+        self._generations = {} # channel -> latest submit number
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "superseded": 0}
+
+    @staticmethod
+    def make_key(query, project_type="mod", versions=None, loaders=None, index="relevance", offset=0, limit=PAGE_SIZE):
+        return (" ".join(query.lower().split()), project_type, tuple(sorted(versions or [])),
+                tuple(sorted(l.lower() for l in loaders or [])), index, int(offset), int(limit))
+
+    # --- Cache ---
+    def _cached(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[0] > self.TTL:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry[1]
+
+    def _store(self, key, result):
+        with self._lock:
+            self._cache[key] = (time.time(), result)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    # --- Search ---
+    def search(self, query, project_type="mod", versions=None, loaders=None, index="relevance", offset=0, limit=PAGE_SIZE):
+        """
+        Blocking search. Returns Modrinth's response dict ("hits", "total_hits",
+        "offset", ...); raises if the request failed.
+        """
+        key = self.make_key(query, project_type, versions, loaders, index, offset, limit)
+        result = self._cached(key)
+        if result is not None:
+            self.stats["hits"] += 1
+            return result
+
+        with self._lock:
+            call = self._inflight.get(key)
+            owner = call is None
+            if owner:
+                call = self._inflight[key] = {"event": threading.Event(), "result": None, "error": None}
+        if not owner:
+            self.stats["coalesced"] += 1
+            call["event"].wait()
+            if call["error"]:
+                raise call["error"]
+            return call["result"]
+
+        self.stats["misses"] += 1
+        try:
+            call["result"] = ModrinthAPI.search(query.strip(), limit=limit, index=index, project_type=project_type,
+                                                versions=versions, loaders=loaders, offset=offset)
+            self._store(key, call["result"])
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call["event"].set()
+
+    def submit(self, channel, callback, query, delay=None, **params):
+        """
+        Debounced, superseding search for a search box. callback(result, error)
+        is called from a worker thread, only if no newer submit was made on the
+        channel in the meantime.
+        """
+        with self._lock:
+            generation = self._generations.get(channel, 0) + 1
+            self._generations[channel] = generation
+
+        def current():
+            with self._lock:
+                return self._generations.get(channel) == generation
+
+        key = self.make_key(query, **params)
+        cached = self._cached(key)
+        if cached is not None:
+            self.stats["hits"] += 1
+            callback(cached, None)
+            return
+
+        def run():
+            if not current():
+                self.stats["superseded"] += 1
+                return
+            try:
+                result, error = self.search(query, **params), None
+            except Exception as e:
+                result, error = None, e
+            if current():
+                callback(result, error)
+            else:
+                self.stats["superseded"] += 1
+
+        timer = threading.Timer(self.DEBOUNCE if delay is None else delay, run)
+        timer.daemon = True
+        timer.start()
+
+    def cancel(self, channel):
+        """Drops any pending or running search on the channel."""
+        with self._lock:
+            self._generations[channel] = self._generations.get(channel, 0) + 1
+
+# Singleton instance
+mod_search = ModSearch()
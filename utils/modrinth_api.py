@@ -1,31 +1,17 @@
-import requests
 import json
+from .http_client import http_client, HttpClient
 
 class ModrinthAPI:
     BASE_URL = "https://api.modrinth.com/v2"
 
     @staticmethod
-    def search_mods(query, limit=20, index="relevance", project_type="mod", versions=None, loaders=None):
+    def search(query, limit=20, index="relevance", project_type="mod", versions=None, loaders=None, offset=0):
+        """Raw search response ("hits", "total_hits", ...). Raises on failure."""
         # project_type: mod, resourcepack, shader, modpack
         url = f"{ModrinthAPI.BASE_URL}/search"
         
-        facets = []
-        facets.append(f"project_type:{project_type}")
-        
-        if versions and len(versions) > 0:
-             # OR logic for versions: ["versions:1.20.1", "versions:1.20"]
-             v_facet = [f"versions:{v}" for v in versions]
-             facets.append(v_facet)
-             
-        if loaders and len(loaders) > 0:
-             # OR logic for loaders: ["categories:fabric", "categories:forge"]
-             l_facet = [f"categories:{l.lower()}" for l in loaders]
-             facets.append(l_facet)
-             
         # Modrinth facets structure is List[List[str]] (AND of ORs)
-        # If we have single string in list it's treated correctly? 
-        # Actually structure is [[A, B], [C]] -> (A OR B) AND C
-        
+        # [[A, B], [C]] -> (A OR B) AND C
         final_facets = []
         final_facets.append([f"project_type:{project_type}"])
         if versions: final_facets.append([f"versions:{v}" for v in versions])
@@ -34,14 +20,18 @@ class ModrinthAPI:
         params = {
             "query": query,
             "limit": limit,
+            "offset": offset,
             "index": index,
             "facets": json.dumps(final_facets)
         }
+        response = http_client.get(url, params=params, endpoint="modrinth search")
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def search_mods(query, limit=20, index="relevance", project_type="mod", versions=None, loaders=None, offset=0):
         try:
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                return response.json()["hits"]
-            return []
+            return ModrinthAPI.search(query, limit, index, project_type, versions, loaders, offset)["hits"]
         except Exception as e:
             print(f"Modrinth Search Error: {e}")
             return []
@@ -50,7 +40,7 @@ class ModrinthAPI:
     def get_project(project_id):
         url = f"{ModrinthAPI.BASE_URL}/project/{project_id}"
         try:
-            response = requests.get(url)
+            response = http_client.get(url, endpoint="modrinth project")
             if response.status_code == 200:
                 return response.json()
             return None
@@ -68,7 +58,7 @@ class ModrinthAPI:
              params["game_versions"] = json.dumps(game_versions)
              
         try:
-            response = requests.get(url, params=params)
+            response = http_client.get(url, params=params, endpoint="modrinth versions")
             if response.status_code == 200:
                 return response.json()
             return []
@@ -76,6 +66,42 @@ class ModrinthAPI:
             print(f"Modrinth Version Error: {e}")
             return []
             
+    # --- Batch endpoints (raise on failure) ---
+    @staticmethod
+    def get_projects(project_ids):
+        """Project objects for up to a few hundred ids / slugs in one request."""
+        response = http_client.get(f"{ModrinthAPI.BASE_URL}/projects", params={"ids": json.dumps(list(project_ids))},
+                                   endpoint="modrinth projects")
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def get_versions(version_ids):
+        """Version objects for up to a few hundred version ids in one request."""
+        response = http_client.get(f"{ModrinthAPI.BASE_URL}/versions", params={"ids": json.dumps(list(version_ids))},
+                                   endpoint="modrinth versions batch")
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def get_versions_from_hashes(hashes, algorithm="sha1"):
+        """{hash: version} for the files Modrinth knows."""
+        response = http_client.post(f"{ModrinthAPI.BASE_URL}/version_files", json={"hashes": list(hashes), "algorithm": algorithm},
+                                    endpoint="modrinth version files", retries=HttpClient.RETRIES)
+        response.raise_for_status()
+        return response.json()
+
+    @staticmethod
+    def get_latest_versions_from_hashes(hashes, algorithm="sha1", loaders=None, game_versions=None):
+        """{hash: newest version of that file's project} matching the filters."""
+        body = {"hashes": list(hashes), "algorithm": algorithm}
+        if loaders: body["loaders"] = list(loaders)
+        if game_versions: body["game_versions"] = list(game_versions)
+        response = http_client.post(f"{ModrinthAPI.BASE_URL}/version_files/update", json=body,
+                                    endpoint="modrinth version files update", retries=HttpClient.RETRIES)
+        response.raise_for_status()
+        return response.json()
+
     @staticmethod
     def get_version_file(version_data):
         # Return the primary file URL and filename
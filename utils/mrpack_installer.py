@@ -0,0 +1,150 @@
+import os
+import json
+import shutil
+import zipfile
+import tempfile
+import threading
+from .config import Config
+from .downloader import Downloader
+from .instance_manager import InstanceManager
+from .transfer_scheduler import transfers
+
+class MrpackInstaller:
+    """
+    Installs Modrinth modpacks (.mrpack).
+
+    The pack is streamed to a temp file (never held in memory), its
+    modrinth.index.json read, and an instance created with the pack's
+    Minecraft version and loader (the loader version is kept as the
+    instance's "loader_version"). All client files listed in the index are
+    downloaded concurrently by the shared Downloader with SHA-1 and SHA-512
+    checked, while overrides/ and then client-overrides/ are extracted in one
+    streaming pass over the archive. Overrides win: index files that an
+    override replaces are not downloaded.
+    """
+    INDEX_FILE = "modrinth.index.json"
+    OVERRIDE_DIRS = ("overrides/", "client-overrides/") # later wins
+    # modrinth.index.json dependency key -> launcher loader name
+    LOADERS = {"fabric-loader": "Fabric", "quilt-loader": "Quilt", "forge": "Forge", "neoforge": "NeoForge"}
+    MIN_WORKERS = 16 # within HttpClient.MIN_POOL_SIZE, so no pool remount
+
+    def __init__(self, downloader=None):
+        # Packs are hundreds of small files: more connections than a game install
+        self.downloader = downloader or Downloader(max(self.MIN_WORKERS, int(Config.get("download_threads", 8))))
+
+    @staticmethod
+    def _safe_path(root, relative):
+        # Index paths and archive entries must stay inside the instance
+        path = os.path.normpath(os.path.join(root, relative))
+        if os.path.isabs(relative) or not path.startswith(os.path.normpath(root) + os.sep):
+            raise Exception(f"Unsafe path in modpack: {relative}")
+        return path
+
+    @classmethod
+    def read_index(cls, archive):
+        with archive.open(cls.INDEX_FILE) as f:
+            index = json.load(f)
+        if index.get("game") != "minecraft" or "minecraft" not in index.get("dependencies", {}):
+            raise Exception("Not a Minecraft modpack")
+        return index
+
+    @classmethod
+    def loader_of(cls, index):
+        """(loader name, loader version) from the index's dependencies."""
+        for key, loader in cls.LOADERS.items():
+            if key in index["dependencies"]:
+                return loader, index["dependencies"][key]
+        return "None", None
+
+    def jobs(self, index, instance_dir):
+        jobs = []
+        for entry in index.get("files", []):
+            if entry.get("env", {}).get("client") == "unsupported" or not entry.get("downloads"):
+                continue
+            hashes = entry.get("hashes", {})
+            jobs.append({"url": entry["downloads"][0], "path": self._safe_path(instance_dir, entry["path"]),
+                         "sha1": hashes.get("sha1"), "sha512": hashes.get("sha512"), "size": entry.get("fileSize")})
+        return jobs
+
+    def override_members(self, archive, instance_dir):
+        """[(info, target path)] of the override entries, overrides/ before client-overrides/."""
+        order = {prefix: i for i, prefix in enumerate(self.OVERRIDE_DIRS)}
+        members = []
+        for info in archive.infolist():
+            prefix = next((p for p in self.OVERRIDE_DIRS if info.filename.startswith(p)), None)
+            if prefix and not info.is_dir():
+                members.append((order[prefix], info, self._safe_path(instance_dir, info.filename[len(prefix):])))
+        return [(info, target) for _, info, target in sorted(members, key=lambda m: m[0])]
+
+    def extract_overrides(self, archive, instance_dir, members=None):
+        """Writes overrides/ then client-overrides/ into the instance, streaming each entry. Returns the file count."""
+        members = self.override_members(archive, instance_dir) if members is None else members
+        for info, target in members:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with archive.open(info) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+        return len(members)
+
+    def fetch(self, url, sha512=None, sha1=None):
+        """Streams a remote .mrpack to a temp file and returns its path."""
+        fd, path = tempfile.mkstemp(suffix=".mrpack")
+        os.close(fd)
+        os.remove(path)
+        self.downloader.download_file({"url": url, "path": path, "sha1": sha1, "sha512": sha512})
+        return path
+
+    def install(self, source, name=None, callback=None, sha512=None, sha1=None):
+        """
+        Installs a pack from a local path or URL into a new instance (name
+        defaults to the pack's). Returns the instance dict with stats.
+        """
+        callback = callback or {}
+        set_status = callback.get("setStatus", lambda x: None)
+        downloaded = not os.path.isfile(source)
+        if downloaded:
+            set_status("Downloading modpack...")
+            path = self.fetch(source, sha512, sha1)
+        else:
+            path = source
+
+        try:
+            with zipfile.ZipFile(path) as archive:
+                index = self.read_index(archive)
+                name = name or index.get("name") or os.path.splitext(os.path.basename(source))[0]
+                if InstanceManager.get_instance(name):
+                    raise Exception(f"Version '{name}' already exists")
+                loader, loader_version = self.loader_of(index)
+                instance = InstanceManager.create_instance(name, index["dependencies"]["minecraft"], loader)
+                if loader_version:
+                    instance = InstanceManager.update_instance(name, loader_version=loader_version)
+                try:
+                    members = self.override_members(archive, instance["path"])
+                    overridden = {os.path.normcase(target) for _, target in members}
+                    jobs = [job for job in self.jobs(index, instance["path"]) if os.path.normcase(job["path"]) not in overridden]
+                    set_status(f"Installing {name}: {len(jobs)} files")
+                    # Files download in the background while the overrides are unpacked
+                    errors = []
+                    worker = threading.Thread(target=self._download, args=(jobs, callback, transfers.current(), errors), daemon=True)
+                    worker.start()
+                    try:
+                        overrides = self.extract_overrides(archive, instance["path"], members)
+                    finally:
+                        worker.join()
+                    if errors:
+                        raise errors[0]
+                except Exception:
+                    # No half-installed packs
+                    InstanceManager.delete_instance(name)
+                    raise
+        finally:
+            if downloaded and os.path.exists(path):
+                os.remove(path)
+
+        set_status(f"Installed {name}")
+        return dict(instance, files=len(jobs), overrides=overrides, **self.downloader.stats())
+
+    def _download(self, jobs, callback, priority, errors):
+        try:
+            self.downloader.download_all(jobs, callback, priority=priority)
+        except Exception as e:
+            errors.append(e)
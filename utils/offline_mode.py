@@ -0,0 +1,51 @@
+import time
+import socket
+from .config import Config
+
+class OfflineMode:
+    """
+    Offline launches: everything is built from local version JSONs, installed
+    runtimes, the cached authlib jar and the cached manifest, and nothing
+    touches the network.
+
+    Config "offline_mode" forces it. Otherwise the launcher falls back to it
+    on its own when a step that needs the network finds Mojang unreachable,
+    and stays offline for FALLBACK_SECONDS before trying the network again.
+    """
+    PROBE_ADDRESS = ("launchermeta.mojang.com", 443)
+    PROBE_TIMEOUT = 2
+    FALLBACK_SECONDS = 5 * 60
+
+    _offline_until = 0
+
+    @classmethod
+    def active(cls):
+        return bool(Config.get("offline_mode", False)) or time.time() < cls._offline_until
+
+    @classmethod
+    def go_offline(cls, reason, seconds=None):
+        """Switches to offline mode for seconds (FALLBACK_SECONDS by default, inf for the whole session)."""
+        if not cls.active():
+            print(f"Switching to offline mode: {reason}")
+        cls._offline_until = time.time() + (seconds if seconds is not None else cls.FALLBACK_SECONDS)
+
+    @classmethod
+    def reset(cls):
+        cls._offline_until = 0
+
+    @classmethod
+    def network_available(cls):
+        """One TCP connect to Mojang. A failure switches to offline mode."""
+        if cls.active():
+            return False
+        try:
+            socket.create_connection(cls.PROBE_ADDRESS, timeout=cls.PROBE_TIMEOUT).close()
+            return True
+        except OSError as e:
+            cls.go_offline(f"{cls.PROBE_ADDRESS[0]} unreachable ({e})")
+            return False
+
+    @staticmethod
+    def missing_error(missing):
+        lines = "\n".join(f"  - {item}" for item in missing)
+        return Exception(f"Cannot launch offline, missing:\n{lines}")
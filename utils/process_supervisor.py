@@ -0,0 +1,461 @@
+import os
+import time
+import shutil
+import platform
+import threading
+import subprocess
+
+class ProcessSupervisor:
+    """
+    Tracks every running game process (instance, PID, start time, RSS, exit
+    code) and applies per-instance placement so several instances on one
+    machine don't thrash:
+
+        cpu_affinity     list of core ids, or "auto" for a disjoint slice of
+                         cores (slices are rebalanced as instances come and go)
+        nice             POSIX nice value (mapped to a priority class on Windows)
+        memory_max_mb    Linux cgroup v2 memory.max
+        cpu_max_percent  Linux cgroup v2 cpu.max (100 = one full core)
+
+    Placement is best effort: anything the OS refuses is printed and skipped.
+    On Linux affinity and nice are per thread, so they are applied to every
+    thread in /proc/<pid>/task. prepare_launch() also builds a command prefix
+    so the game starts under taskset/nice and inside a cgroup scope with the
+    memory/CPU caps (a systemd user scope, else a delegated sibling cgroup);
+    what could not be applied ends up in the record's "warnings".
+    """
+    PLACEMENT_KEYS = ("cpu_affinity", "nice", "memory_max_mb", "cpu_max_percent")
+    MAX_FINISHED = 20
+    CGROUP_PREFIX = "ieb-game-"
+    CGROUP_MOUNTS = ("/sys/fs/cgroup", "/sys/fs/cgroup/unified")
+    PROBE_TIMEOUT = 10
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._next_scope = 1
+        self._systemd_probes = {} # systemd-run properties -> usable
+        self.games = {}     # id -> record
+        self._events = {}   # id -> threading.Event set on exit
+
+    # --- Registration ---
+    def register(self, process, session=None, instance=None, version_id=None, placement=None, scope=None):
+        """
+        Starts tracking a game process and applies its placement. scope is
+        what prepare_launch() returned for it. Returns the record.
+        """
+        scope = scope or {}
+        with self._lock:
+            game_id = self._next_id
+            self._next_id += 1
+            record = {
+                "id": game_id,
+                "instance": instance,
+                "version": version_id,
+                "pid": process.pid,
+                "started": time.time(),
+                "ended": None,
+                "exit_code": None,
+                "placement": dict(placement or {}),
+                "cgroup": scope.get("cgroup"),
+                "unit": scope.get("unit"),
+                "warnings": list(scope.get("warnings", [])),
+                "process": process,
+                "session": session
+            }
+            self.games[game_id] = record
+            self._events[game_id] = threading.Event()
+
+        self._apply_placement(record)
+        if record["placement"].get("cpu_affinity") == "auto":
+            self._rebalance()
+
+        if session is not None:
+            session.on_exit(lambda s: self._on_exit(game_id))
+        else:
+            threading.Thread(target=lambda: (process.wait(), self._on_exit(game_id)), daemon=True).start()
+        return record
+
+    def _on_exit(self, game_id):
+        record = self.games.get(game_id)
+        if record is None:
+            return
+        record["exit_code"] = record["process"].wait()
+        record["ended"] = time.time()
+        self._remove_cgroup(record)
+        self._events[game_id].set()
+        print(f"Game {record['instance'] or record['version']} (pid {record['pid']}) exited with code {record['exit_code']}")
+
+        if record["placement"].get("cpu_affinity") == "auto":
+            self._rebalance()
+        self._prune()
+
+    def _prune(self):
+        with self._lock:
+            finished = sorted((r for r in self.games.values() if r["ended"]), key=lambda r: r["ended"])
+            for record in finished[:-self.MAX_FINISHED]:
+                self.games.pop(record["id"], None)
+                self._events.pop(record["id"], None)
+
+    # --- Public API ---
+    def list_games(self, running_only=True):
+        """Snapshots of tracked games (without the process object), RSS refreshed."""
+        result = []
+        for record in list(self.games.values()):
+            if running_only and record["ended"]:
+                continue
+            info = {k: v for k, v in record.items() if k not in ("process", "session")}
+            info["rss_mb"] = None if record["ended"] else self.get_rss_mb(record["pid"])
+            result.append(info)
+        return result
+
+    def get(self, game_id):
+        return self.games.get(game_id)
+
+    def warnings(self, session):
+        """Placement that could not be applied to the game of this output session."""
+        return next((r["warnings"] for r in list(self.games.values()) if r["session"] is session), [])
+
+    def find(self, instance):
+        """Running games of an instance (or version id)."""
+        return [r for r in self.games.values() if not r["ended"] and instance in (r["instance"], r["version"])]
+
+    def stop(self, game_id, timeout=15):
+        """Asks the game to exit, kills it after timeout. Returns the exit code."""
+        record = self.games.get(game_id)
+        if record is None:
+            raise Exception(f"No game with id {game_id}")
+        process = record["process"]
+        if process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=timeout)
+            except Exception:
+                print(f"Game pid {record['pid']} did not exit, killing it")
+                process.kill()
+                process.wait()
+        return self.wait(game_id)
+
+    def stop_all(self, timeout=15):
+        for record in list(self.games.values()):
+            if not record["ended"]:
+                self.stop(record["id"], timeout)
+
+    def wait(self, game_id, timeout=None):
+        """Blocks until the game exited. Returns its exit code (None on timeout)."""
+        event = self._events.get(game_id)
+        if event is None:
+            raise Exception(f"No game with id {game_id}")
+        if not event.wait(timeout):
+            return None
+        return self.games[game_id]["exit_code"]
+
+    def wait_all(self, timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        for game_id in list(self._events):
+            remaining = None if deadline is None else max(0, deadline - time.time())
+            self.wait(game_id, remaining)
+
+    # --- Placement ---
+    def prepare_launch(self, placement):
+        """
+        (command prefix, scope) for a game about to start. The prefix runs it
+        inside a cgroup scope with the memory/CPU caps, so they hold from the
+        first allocation, and under taskset / nice (where installed) for fixed
+        affinity and nice. Pass scope on to register(). POSIX only;
+        register() applies affinity and nice again either way.
+        """
+        placement = placement or {}
+        scope = {"cgroup": None, "unit": None, "warnings": []}
+        if os.name == 'nt':
+            if placement.get("memory_max_mb") or placement.get("cpu_max_percent"):
+                scope["warnings"].append("Memory/CPU caps are only supported on Linux")
+            return [], scope
+
+        prefix = []
+        if placement.get("memory_max_mb") or placement.get("cpu_max_percent"):
+            prefix += self._scope_prefix(placement, scope)
+        affinity = placement.get("cpu_affinity")
+        if affinity and affinity != "auto" and shutil.which("taskset"):
+            # taskset refuses to run the game at all for cores we don't have
+            cores = [c for c in (int(c) for c in affinity) if c in self.available_cores()]
+            if cores:
+                prefix += ["taskset", "-c", ",".join(str(c) for c in cores)]
+        nice = placement.get("nice")
+        if nice is not None and shutil.which("nice"):
+            # nice -n is relative to the launcher's own level
+            prefix += ["nice", "-n", str(int(nice) - os.nice(0))]
+        return prefix, scope
+
+    @staticmethod
+    def _threads(pid):
+        """Thread ids of a process (Linux), or just the pid where threads aren't listed."""
+        try:
+            return [int(tid) for tid in os.listdir(f"/proc/{pid}/task")] or [pid]
+        except OSError:
+            return [pid]
+
+    def _apply_placement(self, record):
+        placement = record["placement"]
+        pid = record["pid"]
+
+        affinity = placement.get("cpu_affinity")
+        if affinity and affinity != "auto":
+            self.set_affinity(pid, [int(c) for c in affinity])
+
+        if placement.get("nice") is not None:
+            self.set_nice(pid, int(placement["nice"]))
+
+        # Caps can only be set up before the start (prepare_launch)
+        if (placement.get("memory_max_mb") or placement.get("cpu_max_percent")) and not (record["cgroup"] or record["unit"] or record["warnings"]):
+            record["warnings"].append("Memory/CPU caps were not set up before launch")
+        for warning in record["warnings"]:
+            print(f"Game pid {pid}: {warning}")
+
+    def _rebalance(self):
+        # Give every running "auto" instance its own contiguous block of cores
+        with self._lock:
+            auto = [r for r in self.games.values() if not r["ended"] and r["placement"].get("cpu_affinity") == "auto"]
+        if not auto:
+            return
+        cores = self.available_cores()
+        per_game = max(1, len(cores) // len(auto))
+        for i, record in enumerate(sorted(auto, key=lambda r: r["id"])):
+            start = (i * per_game) % len(cores)
+            block = cores[start:start + per_game] or cores
+            self.set_affinity(record["pid"], block)
+            record["cores"] = block
+
+    @staticmethod
+    def available_cores():
+        if hasattr(os, "sched_getaffinity"):
+            return sorted(os.sched_getaffinity(0))
+        return list(range(os.cpu_count() or 1))
+
+    @staticmethod
+    def set_affinity(pid, cores):
+        try:
+            if hasattr(os, "sched_setaffinity"):
+                # Per thread on Linux: threads started before this keep their own mask
+                for tid in ProcessSupervisor._threads(pid):
+                    try:
+                        os.sched_setaffinity(tid, set(cores))
+                    except ProcessLookupError:
+                        if tid == pid:
+                            raise
+                        # thread exited meanwhile
+            elif os.name == 'nt':
+                import ctypes
+                mask = 0
+                for core in cores:
+                    mask |= 1 << core
+                PROCESS_SET_INFORMATION = 0x0200
+                PROCESS_QUERY_INFORMATION = 0x0400
+                handle = ctypes.windll.kernel32.OpenProcess(PROCESS_SET_INFORMATION | PROCESS_QUERY_INFORMATION, False, pid)
+                try:
+                    if not ctypes.windll.kernel32.SetProcessAffinityMask(handle, ctypes.c_size_t(mask)):
+                        raise OSError(ctypes.GetLastError(), "SetProcessAffinityMask failed")
+                finally:
+                    ctypes.windll.kernel32.CloseHandle(handle)
+            else:
+                print(f"CPU affinity is not supported on {platform.system()}")
+                return False
+            return True
+        except Exception as e:
+            print(f"Could not set CPU affinity for pid {pid}: {e}")
+            return False
+
+    @staticmethod
+    def set_nice(pid, nice):
+        try:
+            if os.name == 'nt':
+                import ctypes
+                # nice -> priority class (IDLE, BELOW_NORMAL, NORMAL, ABOVE_NORMAL, HIGH)
+                if nice >= 15:
+                    priority = 0x40
+                elif nice > 0:
+                    priority = 0x4000
+                elif nice == 0:
+                    priority = 0x20
+                elif nice > -10:
+                    priority = 0x8000
+                else:
+                    priority = 0x80
+                PROCESS_SET_INFORMATION = 0x0200
+                handle = ctypes.windll.kernel32.OpenProcess(PROCESS_SET_INFORMATION, False, pid)
+                try:
+                    if not ctypes.windll.kernel32.SetPriorityClass(handle, priority):
+                        raise OSError(ctypes.GetLastError(), "SetPriorityClass failed")
+                finally:
+                    ctypes.windll.kernel32.CloseHandle(handle)
+            elif platform.system() == "Linux":
+                # Linux applies PRIO_PROCESS to one thread only
+                for tid in ProcessSupervisor._threads(pid):
+                    try:
+                        os.setpriority(os.PRIO_PROCESS, tid, nice)
+                    except ProcessLookupError:
+                        if tid == pid:
+                            raise
+            else:
+                os.setpriority(os.PRIO_PROCESS, pid, nice)
+            return True
+        except Exception as e:
+            print(f"Could not set nice level for pid {pid}: {e}")
+            return False
+
+    # --- cgroup v2 (Linux) ---
+    @staticmethod
+    def _scope_properties(placement):
+        properties = []
+        if placement.get("memory_max_mb"):
+            properties.append(f"MemoryMax={int(placement['memory_max_mb'])}M")
+        if placement.get("cpu_max_percent"):
+            properties.append(f"CPUQuota={float(placement['cpu_max_percent']):g}%")
+        return properties
+
+    def _scope_prefix(self, placement, scope):
+        """Prefix starting the game in a capped cgroup; failures go to scope["warnings"]."""
+        if platform.system() != "Linux":
+            scope["warnings"].append("Memory/CPU caps are only supported on Linux")
+            return []
+        with self._lock:
+            name = f"{self.CGROUP_PREFIX}{os.getpid()}-{self._next_scope}"
+            self._next_scope += 1
+
+        # 1. A transient systemd user scope (the user manager is delegated memory/cpu)
+        properties = self._scope_properties(placement)
+        if self._systemd_scope_works(placement):
+            scope["unit"] = name + ".scope"
+            return ["systemd-run", "--user", "--scope", "--quiet", "--collect", f"--unit={scope['unit']}",
+                    *(f"--property={p}" for p in properties), "--"]
+
+        # 2. A sibling cgroup we may write to: the shell moves itself in, then execs the game
+        try:
+            scope["cgroup"] = self._create_cgroup(name, placement)
+        except OSError as e:
+            scope["warnings"].append(f"Memory/CPU caps not applied: no systemd user scope and no delegated cgroup ({e})")
+            return []
+        return ["sh", "-c", 'echo $$ > "$0/cgroup.procs" || echo "Could not join cgroup $0" >&2; exec "$@"', scope["cgroup"]]
+
+    def _systemd_scope_works(self, placement):
+        """Whether systemd-run can start a user scope with these caps actually in place (probed once)."""
+        key = (bool(placement.get("memory_max_mb")), bool(placement.get("cpu_max_percent")))
+        if key in self._systemd_probes:
+            return self._systemd_probes[key]
+        works = False
+        if shutil.which("systemd-run"):
+            # The files only exist if the controllers reach the scope
+            files = " ".join(f for f, wanted in (("memory.max", key[0]), ("cpu.max", key[1])) if wanted)
+            check = f'd=/sys/fs/cgroup$(sed -n "s/^0:://p" /proc/self/cgroup); cd "$d" && cat {files}'
+            try:
+                result = subprocess.run(["systemd-run", "--user", "--scope", "--quiet", "--collect",
+                                         *(f"--property={p}" for p in self._scope_properties(placement)),
+                                         "--", "sh", "-c", check],
+                                        capture_output=True, text=True, timeout=self.PROBE_TIMEOUT)
+                works = result.returncode == 0
+                if not works:
+                    print(f"systemd user scope not usable: {(result.stderr or result.stdout).strip()[:200]}")
+            except (OSError, subprocess.SubprocessError) as e:
+                print(f"systemd user scope not usable: {e}")
+        self._systemd_probes[key] = works
+        return works
+
+    @classmethod
+    def _cgroup_root(cls):
+        """(cgroup v2 mount, our own cgroup directory), or None if cgroup v2 isn't available."""
+        for mount in cls.CGROUP_MOUNTS:
+            if os.path.exists(os.path.join(mount, "cgroup.controllers")):
+                break
+        else:
+            return None
+        try:
+            with open("/proc/self/cgroup", "r") as f:
+                for line in f:
+                    if line.startswith("0::"):
+                        return mount, os.path.join(mount, line.strip()[3:].lstrip("/"))
+        except OSError:
+            pass
+        return None
+
+    def _create_cgroup(self, name, placement):
+        """
+        Creates a capped cgroup next to the launcher's own one (our own can't
+        enable controllers for children while it has processes). Returns its
+        path; raises OSError if the hierarchy isn't delegated to us.
+        """
+        found = self._cgroup_root()
+        if found is None:
+            raise OSError("cgroup v2 is not available")
+        mount, own = found
+        parent = own if os.path.normpath(own) == os.path.normpath(mount) else os.path.dirname(own)
+
+        wanted = [c for c, key in (("memory", "memory_max_mb"), ("cpu", "cpu_max_percent")) if placement.get(key)]
+        control = os.path.join(parent, "cgroup.subtree_control")
+        with open(control, "r") as f:
+            enabled = f.read().split()
+        missing = [c for c in wanted if c not in enabled]
+        if missing:
+            with open(control, "w") as f:
+                f.write(" ".join("+" + c for c in missing))
+        # Moving a process needs write access at the common ancestor
+        if not os.access(os.path.join(parent, "cgroup.procs"), os.W_OK):
+            raise OSError(f"{parent} is not writable")
+
+        path = os.path.join(parent, name)
+        os.makedirs(path, exist_ok=True)
+        try:
+            if placement.get("memory_max_mb"):
+                with open(os.path.join(path, "memory.max"), "w") as f:
+                    f.write(str(int(placement["memory_max_mb"]) * 1024 * 1024))
+            if placement.get("cpu_max_percent"):
+                period = 100000
+                quota = int(period * float(placement["cpu_max_percent"]) / 100)
+                with open(os.path.join(path, "cpu.max"), "w") as f:
+                    f.write(f"{quota} {period}")
+        except OSError:
+            self._remove_cgroup({"cgroup": path})
+            raise
+        return path
+
+    @staticmethod
+    def _remove_cgroup(record):
+        # systemd scopes are collected by systemd (--collect)
+        path = record.get("cgroup")
+        if path and os.path.isdir(path):
+            try:
+                os.rmdir(path)
+            except OSError as e:
+                print(f"Could not remove cgroup {path}: {e}")
+
+    # --- Stats ---
+    @staticmethod
+    def get_rss_mb(pid):
+        try:
+            if os.name == 'nt':
+                import ctypes
+                from ctypes import wintypes
+
+                class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                    _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+                counters = PROCESS_MEMORY_COUNTERS()
+                counters.cb = ctypes.sizeof(counters)
+                PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+                handle = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+                try:
+                    if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+                        return round(counters.WorkingSetSize / (1024 * 1024), 1)
+                finally:
+                    ctypes.windll.kernel32.CloseHandle(handle)
+                return None
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return round(int(line.split()[1]) / 1024, 1)
+        except Exception:
+            pass
+        return None
@@ -0,0 +1,97 @@
+import time
+import threading
+from contextlib import contextmanager
+from .config import Config
+
+class TransferScheduler:
+    """
+    Shares the connection between launcher downloads by priority class:
+
+        LAUNCH      files the game being launched needs (PLAY, cli launch)
+        USER        anything the user started (installs, mods, modpacks)
+        BACKGROUND  prefetching and bulk preparation
+
+    While a batch of a higher class is running, lower-class transfers pause
+    before their next chunk (and don't start new files) until it is done.
+    Config "download_rate_limit" (KB/s, 0 = off) caps the combined rate.
+
+    The class is taken from the calling thread (see priority()), so code
+    that runs inside a launch doesn't have to pass it down.
+    """
+    LAUNCH = 0
+    USER = 1
+    BACKGROUND = 2
+    NAMES = {LAUNCH: "launch", USER: "user", BACKGROUND: "background"}
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._active = {p: 0 for p in self.NAMES}
+        self._local = threading.local()
+        self._rate_lock = threading.Lock()
+        self._tokens = 0.0
+        self._last_refill = time.monotonic()
+        self.stats = {name: {"bytes": 0, "paused_seconds": 0.0} for name in self.NAMES.values()}
+
+    # --- Priority of the current thread ---
+    def current(self):
+        return getattr(self._local, "priority", self.USER)
+
+    @contextmanager
+    def priority(self, priority):
+        """Transfers started on this thread inside the block use this class."""
+        previous = getattr(self._local, "priority", None)
+        self._local.priority = priority
+        try:
+            yield priority
+        finally:
+            self._local.priority = previous if previous is not None else self.USER
+
+    # --- Batches ---
+    @contextmanager
+    def transfer(self, priority=None):
+        """Marks a batch of this class as running; lower classes yield to it."""
+        priority = self.current() if priority is None else priority
+        with self._cond:
+            self._active[priority] += 1
+        try:
+            yield priority
+        finally:
+            with self._cond:
+                self._active[priority] -= 1
+                self._cond.notify_all()
+
+    def _preempted(self, priority):
+        return any(self._active[p] for p in self.NAMES if p < priority)
+
+    def wait_turn(self, priority):
+        """Blocks while a higher class is transferring."""
+        if not self._preempted(priority):
+            return
+        start = time.monotonic()
+        with self._cond:
+            while self._preempted(priority):
+                self._cond.wait(0.5)
+            self.stats[self.NAMES[priority]]["paused_seconds"] += time.monotonic() - start
+
+    def throttle(self, priority, size):
+        """Called per received chunk: yields to higher classes and applies the rate cap."""
+        self.wait_turn(priority)
+        limit = float(Config.get("download_rate_limit", 0) or 0) * 1024
+        with self._rate_lock:
+            self.stats[self.NAMES[priority]]["bytes"] += size
+            if limit <= 0:
+                return
+            now = time.monotonic()
+            # Token bucket with one second of burst
+            self._tokens = min(limit, self._tokens + (now - self._last_refill) * limit) - size
+            self._last_refill = now
+            delay = -self._tokens / limit if self._tokens < 0 else 0
+        if delay:
+            time.sleep(delay)
+
+    def active(self):
+        with self._cond:
+            return {self.NAMES[p]: count for p, count in self._active.items()}
+
+# Singleton instance
+transfers = TransferScheduler()
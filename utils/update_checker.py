@@ -0,0 +1,110 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from .modrinth_api import ModrinthAPI
+from .content_manager import ContentManager
+from .downloader import Downloader
+from .hash_index import hash_index
+from .mod_downloader import ModDownloader
+
+class UpdateChecker:
+    """
+    Finds outdated content in an instance with one Modrinth request per folder.
+
+    Every jar/zip in mods, resourcepacks and shaderpacks is hashed through
+    the persistent HashIndex (unchanged files are only stat'ed), then each
+    folder's hashes go to /version_files/update in one call (the calls run
+    concurrently), filtered to the instance's game version and the loaders
+    that content type is published under: the instance's loader(s) for
+    mods (any loader for vanilla instances), fixed lists for packs.
+    """
+    CONTENT_TYPES = ("mod", "resourcepack", "shader")
+    PACK_LOADERS = {"resourcepack": ["minecraft"], "shader": ["iris", "optifine", "canvas", "vanilla"]}
+
+    def __init__(self, instance):
+        self.instance = instance
+        self.requests = 0
+
+    def files(self):
+        """{path: content_type} of the instance's content files."""
+        files = {}
+        for content_type in self.CONTENT_TYPES:
+            for name in ContentManager.list_content(content_type, self.instance["path"]):
+                files[os.path.join(ContentManager.get_dir(content_type, self.instance["path"]), name)] = content_type
+        return files
+
+    def loaders(self, content_type):
+        """Loader filter for a content type (None = any)."""
+        if content_type == "mod":
+            return ModDownloader.loader_filter(content_type, self.instance)
+        return self.PACK_LOADERS.get(content_type)
+
+    def _latest(self, content_type, sha1s):
+        return ModrinthAPI.get_latest_versions_from_hashes(sha1s, "sha1", self.loaders(content_type), [self.instance["version"]])
+
+    def check(self):
+        """
+        Returns {"updates": [{"path", "content_type", "filename", "version", "file"}],
+        "up_to_date": int, "unknown": [filename], "files": int, "requests": int}.
+        version/file are the newest matching Modrinth version and its primary file.
+        """
+        files = self.files()
+        for content_type in self.CONTENT_TYPES:
+            hash_index.prune(ContentManager.get_dir(content_type, self.instance["path"]))
+        hashes = hash_index.hashes(list(files))
+        result = {"updates": [], "up_to_date": 0, "unknown": [], "files": len(files), "requests": 0}
+        if not hashes:
+            return result
+
+        # A shared loader filter would hide mods of loaders the packs don't use
+        by_type = {}
+        for path, h in hashes.items():
+            by_type.setdefault(files[path], {})[h["sha1"]] = path
+        with ThreadPoolExecutor(max_workers=len(by_type)) as executor:
+            latest = {}
+            for content_type, found in zip(by_type, executor.map(lambda t: self._latest(t, list(by_type[t])), by_type)):
+                latest.update({(content_type, sha1): version for sha1, version in found.items()})
+        self.requests += len(by_type)
+        result["requests"] = self.requests
+        for content_type, by_sha1 in by_type.items():
+            for sha1, path in by_sha1.items():
+                version = latest.get((content_type, sha1))
+                if version is None:
+                    result["unknown"].append(os.path.basename(path))
+                    continue
+                if any(f.get("hashes", {}).get("sha1") == sha1 for f in version.get("files", [])):
+                    result["up_to_date"] += 1
+                    continue
+                result["updates"].append({"path": path, "content_type": content_type, "filename": os.path.basename(path),
+                                          "version": version, "file": ModDownloader.primary_file(version)})
+        return result
+
+    def apply(self, update, downloader=None):
+        """Downloads the new file (SHA-512 checked) next to the old one, then removes the old one."""
+        file = update["file"]
+        target = os.path.join(os.path.dirname(update["path"]), file["filename"])
+        hashes = file.get("hashes", {})
+        (downloader or Downloader()).download_file({"url": file["url"], "path": target, "sha512": hashes.get("sha512"),
+                                                    "sha1": None if hashes.get("sha512") else hashes.get("sha1"),
+                                                    "size": file.get("size")})
+        if os.path.normcase(os.path.abspath(target)) != os.path.normcase(os.path.abspath(update["path"])):
+            os.remove(update["path"])
+        return target
+
+    def apply_all(self, updates, callback=None):
+        """Applies updates in parallel. Returns [(update, error)] for the ones that failed."""
+        set_progress = (callback or {}).get("setProgress", lambda x: None)
+        downloader = Downloader()
+        failed = []
+        done = 0
+
+        def run(update):
+            try:
+                self.apply(update, downloader)
+            except Exception as e:
+                failed.append((update, e))
+
+        with ThreadPoolExecutor(max_workers=downloader.max_workers) as executor:
+            for _ in executor.map(run, updates):
+                done += 1
+                set_progress(done)
+        return failed
@@ -0,0 +1,115 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from .config import Config
+
+class InstalledVersionIndex:
+    """
+    Persistent index of installed loader versions.
+
+    Maps (vanilla version, loader, loader version) to the version id the
+    loader installer produced, so resolving what to launch is a dict lookup
+    instead of parsing every versions/*/*.json and guessing by substring.
+    The loader install steps write to it directly. When the versions
+    directory's mtime changes (something was added or removed outside the
+    launcher), entries whose version JSON disappeared are dropped.
+    """
+    FILE_NAME = "installed_versions.json"
+
+    def __init__(self, minecraft_dir):
+        self.minecraft_dir = str(minecraft_dir)
+        self.versions_dir = os.path.join(self.minecraft_dir, "versions")
+        self.path = os.path.join(self.minecraft_dir, Config.CACHE_DIR_NAME, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self.entries = {}
+        self.versions_mtime = None
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.entries = data.get("entries", {})
+            self.versions_mtime = data.get("versions_mtime")
+        except Exception as e:
+            print(f"Error loading installed version index: {e}")
+            self.entries = {}
+            self.versions_mtime = None
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with self._lock:
+                data = {"versions_mtime": self.versions_mtime, "entries": dict(self.entries)}
+            # Unique temp file: saves can run concurrently
+            fd, tmp_path = tempfile.mkstemp(prefix=self.FILE_NAME + ".", suffix=".tmp", dir=os.path.dirname(self.path))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=4)
+                os.replace(tmp_path, self.path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except Exception as e:
+            print(f"Error saving installed version index: {e}")
+
+    @staticmethod
+    def _key(vanilla_version, loader, loader_version):
+        return f"{vanilla_version}|{loader.lower()}|{loader_version}"
+
+    def _json_exists(self, version_id):
+        return os.path.isfile(os.path.join(self.versions_dir, version_id, version_id + ".json"))
+
+    def _dir_mtime(self):
+        try:
+            return os.stat(self.versions_dir).st_mtime_ns
+        except OSError:
+            return None
+
+    def _revalidate(self):
+        # Only walk our own entries (one stat each), never the whole versions dir
+        mtime = self._dir_mtime()
+        if mtime == self.versions_mtime:
+            return
+        with self._lock:
+            self.entries = {k: v for k, v in self.entries.items() if self._json_exists(v["id"])}
+            self.versions_mtime = mtime
+        self.save()
+
+    def lookup(self, vanilla_version, loader, loader_version=None):
+        """
+        Returns the installed version id or None. Without a loader_version
+        the most recently installed build for (vanilla, loader) is returned.
+        """
+        self._revalidate()
+
+        if loader_version:
+            entry = self.entries.get(self._key(vanilla_version, loader, loader_version))
+        else:
+            prefix = self._key(vanilla_version, loader, "")
+            candidates = [v for k, v in self.entries.items() if k.startswith(prefix)]
+            entry = max(candidates, key=lambda v: v.get("installed", 0)) if candidates else None
+
+        if entry and self._json_exists(entry["id"]):
+            return entry["id"]
+        return None
+
+    def record(self, vanilla_version, loader, loader_version, version_id):
+        with self._lock:
+            self.entries[self._key(vanilla_version, loader, loader_version)] = {
+                "id": version_id,
+                "vanilla": vanilla_version,
+                "loader": loader,
+                "loader_version": loader_version,
+                "installed": time.time()
+            }
+            self.versions_mtime = self._dir_mtime()
+        self.save()
+
+    def list_versions(self):
+        self._revalidate()
+        return list(self.entries.values())
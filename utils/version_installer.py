@@ -0,0 +1,345 @@
+import os
+import json
+import shutil
+from minecraft_launcher_lib.helper import parse_rule_list, inherit_json
+from minecraft_launcher_lib.natives import get_natives, extract_natives_file
+from minecraft_launcher_lib.runtime import _get_jvm_platform_string
+from minecraft_launcher_lib.exceptions import VersionNotFound
+from .downloader import Downloader
+from .http_client import http_client
+from .install_stamps import InstallStamps
+from .version_manifest import VersionManifest
+
+class VersionInstaller:
+    """
+    Installs a Minecraft version through the parallel Downloader.
+    Walks the version JSON (and everything it inherits from), turns every
+    library, asset, log config, client jar and Java runtime file into a
+    download job, and hands the whole batch to the worker pool at once.
+    Once a version is complete its closure is stamped, so later installs of
+    the same version only stat the files.
+    """
+    LIBRARIES_URL = "https://libraries.minecraft.net"
+    RESOURCES_URL = "https://resources.download.minecraft.net"
+    RUNTIME_MANIFEST_URL = "https://launchermeta.mojang.com/v1/products/java-runtime/2ec0cc96c44e5a76b9c8b7c39df7210883d12871/all.json"
+
+    def __init__(self, minecraft_dir, downloader=None):
+        self.minecraft_dir = str(minecraft_dir)
+        self.downloader = downloader or Downloader()
+        self.stamps = InstallStamps.for_dir(self.minecraft_dir)
+
+    def is_installed(self, version_id):
+        return self.stamps.is_installed(version_id)
+
+    def check_local(self, version_id):
+        """
+        What a launch of version_id would be missing, using only local files
+        (no manifest lookups, no downloads). Empty list if nothing is missing.
+        """
+        # Warm path: same stat-only check as an online launch
+        if self.stamps.is_installed(version_id):
+            return []
+
+        chain = []
+        current = version_id
+        while current and current not in chain:
+            json_path = self._version_json_path(current)
+            if not os.path.isfile(json_path):
+                return [f"version {current} (no {os.path.relpath(json_path, self.minecraft_dir)})"]
+            with open(json_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            chain.append(current)
+            current = data.get("inheritsFrom")
+
+        root_jar = os.path.join(self.minecraft_dir, "versions", chain[-1], chain[-1] + ".jar")
+        with open(self._version_json_path(version_id), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if "inheritsFrom" in data:
+            data = inherit_json(data, self.minecraft_dir)
+
+        missing = []
+        if not os.path.isfile(root_jar):
+            missing.append(f"client jar {os.path.relpath(root_jar, self.minecraft_dir)}")
+
+        jobs = []
+        self.collect_library_jobs(data, jobs)
+        libraries = [job["path"] for job in jobs if not os.path.isfile(job["path"])]
+        if libraries:
+            missing.append(f"{len(libraries)} libraries (e.g. {os.path.relpath(libraries[0], self.minecraft_dir)})")
+
+        if "assetIndex" in data:
+            index_path = os.path.join(self.minecraft_dir, "assets", "indexes", data["assets"] + ".json")
+            if not os.path.isfile(index_path):
+                missing.append(f"asset index {data['assets']}")
+            else:
+                with open(index_path, "r", encoding="utf-8") as f:
+                    objects = json.load(f)["objects"]
+                objects_dir = os.path.join(self.minecraft_dir, "assets", "objects")
+                assets = sum(1 for obj in objects.values() if not os.path.isfile(os.path.join(objects_dir, obj["hash"][:2], obj["hash"])))
+                if assets:
+                    missing.append(f"{assets} of {len(objects)} assets for index {data['assets']}")
+        return missing
+
+    def install(self, version_id, callback=None, force=False):
+        self.install_many([version_id], callback, force)
+
+    def install_many(self, version_ids, callback=None, force=False):
+        """
+        Installs several versions in one download batch, so libraries and
+        assets they share are fetched once and everything downloads in parallel.
+        """
+        callback = callback or {}
+        set_status = callback.get("setStatus", lambda x: None)
+
+        # Warm path: every stamped file is unchanged, nothing to hash or download
+        pending = []
+        for version_id in dict.fromkeys(version_ids):
+            if not force and self.stamps.is_installed(version_id):
+                self.downloader.count_checked(len(self.stamps.versions.get(version_id, [])))
+                set_status(f"{version_id} is up to date")
+            else:
+                pending.append(version_id)
+        if not pending:
+            return
+
+        set_status(f"Resolving {', '.join(pending)}...")
+        jobs = []
+        natives = [] # (native jar, extract dir, extract rules)
+        plans = [] # (version id, its jobs, its version JSONs, its runtime components)
+        for version_id in pending:
+            version_jobs = []
+            runtimes = set()
+            seen = set()
+            self._collect_version(version_id, version_jobs, natives, runtimes, seen)
+            plans.append((version_id, version_jobs, seen, runtimes))
+            jobs.extend(version_jobs)
+
+        # Java runtime files go into the same batch
+        post_runtime = []
+        runtime_jobs = {}
+        for component in set().union(*(plan[3] for plan in plans)):
+            runtime_jobs[component] = []
+            runtime = self._collect_runtime(component, runtime_jobs[component])
+            if runtime:
+                post_runtime.append(runtime)
+            jobs.extend(runtime_jobs[component])
+
+        self.downloader.download_all(jobs, callback, stamps=self.stamps)
+
+        for jar_path, extract_dir, extract_data in natives:
+            if os.path.isfile(jar_path):
+                extract_natives_file(jar_path, extract_dir, extract_data)
+
+        for finish in post_runtime:
+            finish()
+
+        for version_id, version_jobs, seen, runtimes in plans:
+            closure = [job["path"] for job in version_jobs] + [self._version_json_path(v) for v in seen]
+            for component in runtimes:
+                closure += [job["path"] for job in runtime_jobs.get(component, [])]
+            self.stamps.record_version(version_id, closure)
+
+        set_status("Installation complete")
+
+    # --- Version JSON ---
+    def _version_json_path(self, version_id):
+        return os.path.join(self.minecraft_dir, "versions", version_id, version_id + ".json")
+
+    def _load_version_json(self, version_id):
+        json_path = self._version_json_path(version_id)
+        if not os.path.isfile(json_path):
+            entry = VersionManifest.find(version_id)
+            if entry is None:
+                raise VersionNotFound(version_id)
+            self.downloader.download_file({"url": entry["url"], "path": json_path, "sha1": entry.get("sha1")})
+
+        with open(json_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _collect_version(self, version_id, jobs, natives, runtimes, seen):
+        if version_id in seen:
+            return
+        seen.add(version_id)
+
+        data = self._load_version_json(version_id)
+
+        # Loader versions (Forge/Fabric/Quilt) build on a vanilla parent
+        if "inheritsFrom" in data:
+            try:
+                self._collect_version(data["inheritsFrom"], jobs, natives, runtimes, seen)
+            except VersionNotFound:
+                pass
+            data = inherit_json(data, self.minecraft_dir)
+
+        self.collect_library_jobs(data, jobs, natives)
+        self._collect_asset_jobs(data, jobs)
+
+        if data.get("logging"):
+            log_file = data["logging"]["client"]["file"]
+            jobs.append({
+                "url": log_file["url"],
+                "path": os.path.join(self.minecraft_dir, "assets", "log_configs", log_file["id"]),
+                "sha1": log_file["sha1"],
+                "size": log_file.get("size")
+            })
+
+        client_jar = os.path.join(self.minecraft_dir, "versions", data["id"], data["id"] + ".jar")
+        if "downloads" in data:
+            client = data["downloads"]["client"]
+            jobs.append({"url": client["url"], "path": client_jar, "sha1": client["sha1"], "size": client.get("size")})
+        elif "inheritsFrom" in data and not os.path.isfile(client_jar):
+            # Old Forge versions need the vanilla jar under their own id
+            parent = data["inheritsFrom"]
+            parent_jar = os.path.join(self.minecraft_dir, "versions", parent, parent + ".jar")
+            if os.path.isfile(parent_jar):
+                shutil.copyfile(parent_jar, client_jar)
+
+        if "javaVersion" in data:
+            runtimes.add(data["javaVersion"]["component"])
+
+    # --- Libraries ---
+    def collect_library_jobs(self, data, jobs, natives=None):
+        """Adds download jobs for every library allowed on this system."""
+        libraries_dir = os.path.join(self.minecraft_dir, "libraries")
+        natives_dir = os.path.join(self.minecraft_dir, "versions", data.get("id", ""), "natives")
+
+        for lib in data.get("libraries", []):
+            if not parse_rule_list(lib, "rules", {}):
+                continue
+
+            try:
+                group, name, version = lib["name"].split(":")[0:3]
+            except ValueError:
+                continue
+
+            try:
+                version, fileend = version.split("@")
+            except ValueError:
+                fileend = "jar"
+
+            lib_dir = os.path.join(libraries_dir, *group.split("."), name, version)
+            native = get_natives(lib)
+            native_path = os.path.join(lib_dir, f"{name}-{version}-{native}.jar") if native else None
+
+            downloads = lib.get("downloads", {})
+            artifact = downloads.get("artifact")
+            if artifact and artifact.get("url") and "path" in artifact:
+                jobs.append({
+                    "url": artifact["url"],
+                    "path": os.path.join(libraries_dir, artifact["path"]),
+                    "sha1": artifact.get("sha1"),
+                    "size": artifact.get("size")
+                })
+            elif not downloads:
+                # Maven style entry (Fabric, Quilt, old Forge)
+                base_url = lib.get("url", self.LIBRARIES_URL).rstrip("/")
+                jar_filename = f"{name}-{version}.{fileend}"
+                jobs.append({
+                    "url": "/".join([base_url, *group.split("."), name, version, jar_filename]),
+                    "path": os.path.join(lib_dir, jar_filename),
+                    "sha1": lib.get("sha1"),
+                    "size": lib.get("size"),
+                    # Only entries without a checksum may be absent upstream
+                    "optional": not (lib.get("sha1") or lib.get("size"))
+                })
+
+            if native:
+                classifier = downloads.get("classifiers", {}).get(native)
+                if classifier:
+                    jobs.append({
+                        "url": classifier["url"],
+                        "path": native_path,
+                        "sha1": classifier.get("sha1"),
+                        "size": classifier.get("size")
+                    })
+                if natives is not None and "extract" in lib:
+                    natives.append((native_path, natives_dir, lib["extract"]))
+
+    # --- Assets ---
+    def _collect_asset_jobs(self, data, jobs):
+        # Old versions don't have this
+        if "assetIndex" not in data:
+            return
+
+        index = data["assetIndex"]
+        index_path = os.path.join(self.minecraft_dir, "assets", "indexes", data["assets"] + ".json")
+        # The index itself decides every other asset job, so fetch it right away
+        index_job = {"url": index["url"], "path": index_path, "sha1": index.get("sha1"), "size": index.get("size")}
+        self.downloader.download_file(index_job, stamps=self.stamps)
+        jobs.append(index_job)
+
+        with open(index_path, "r", encoding="utf-8") as f:
+            objects = json.load(f)["objects"]
+
+        objects_dir = os.path.join(self.minecraft_dir, "assets", "objects")
+        for obj in objects.values():
+            h = obj["hash"]
+            jobs.append({
+                "url": f"{self.RESOURCES_URL}/{h[:2]}/{h}",
+                "path": os.path.join(objects_dir, h[:2], h),
+                "sha1": h,
+                "size": obj.get("size")
+            })
+
+    # --- Java Runtime ---
+    def install_runtime(self, component, callback=None):
+        """Installs one of Mojang's Java runtime components through the download pool."""
+        jobs = []
+        finish = self._collect_runtime(component, jobs)
+        if finish is None:
+            raise Exception(f"Java runtime {component} is not available for this platform")
+        self.downloader.download_all(jobs, callback)
+        finish()
+
+    def _collect_runtime(self, component, jobs):
+        """
+        Adds the runtime's files to jobs. Returns a finisher that creates
+        links and the .version marker once the files are downloaded.
+        """
+        platform_string = _get_jvm_platform_string()
+        response = http_client.get(self.RUNTIME_MANIFEST_URL, endpoint="mojang runtimes")
+        response.raise_for_status()
+        all_runtimes = response.json()
+
+        if component not in all_runtimes.get(platform_string, {}):
+            print(f"Runtime {component} not available for {platform_string}")
+            return None
+        entries = all_runtimes[platform_string][component]
+        if not entries:
+            return None
+
+        response = http_client.get(entries[0]["manifest"]["url"], endpoint="mojang runtime manifest")
+        response.raise_for_status()
+        manifest = response.json()
+        runtime_root = os.path.join(self.minecraft_dir, "runtime", component, platform_string)
+        base_path = os.path.join(runtime_root, component)
+
+        links = []
+        for rel_path, value in manifest["files"].items():
+            current_path = os.path.join(base_path, rel_path)
+            if value["type"] == "file":
+                raw = value["downloads"]["raw"]
+                jobs.append({
+                    "url": raw["url"],
+                    "path": current_path,
+                    "sha1": raw["sha1"],
+                    "size": raw.get("size"),
+                    "executable": value.get("executable", False)
+                })
+            elif value["type"] == "directory":
+                os.makedirs(current_path, exist_ok=True)
+            elif value["type"] == "link":
+                links.append((value["target"], current_path))
+
+        def finish():
+            for target, link_path in links:
+                try:
+                    os.makedirs(os.path.dirname(link_path), exist_ok=True)
+                    if not os.path.lexists(link_path):
+                        os.symlink(target, link_path)
+                except Exception:
+                    pass
+            with open(os.path.join(runtime_root, ".version"), "w", encoding="utf-8") as f:
+                f.write(entries[0]["version"]["name"])
+
+        return finish
@@ -0,0 +1,212 @@
+import os
+import json
+import time
+import tempfile
+import threading
+from .config import Config
+from .http_client import http_client
+from .offline_mode import OfflineMode
+
+class VersionManifest:
+    """
+    Disk-backed cache of Mojang's version manifest.
+
+    The last copy on disk is served immediately; a background thread then
+    revalidates it with ETag / If-Modified-Since, so the version list fills
+    instantly at startup and keeps working offline. The parsed manifest is
+    indexed in memory by id and by type. In offline mode only the copy on
+    disk is used (an empty list if there is none).
+    """
+    URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+    FILE_NAME = "version_manifest_v2.json"
+    META_FILE_NAME = "version_manifest_v2.meta.json"
+    REVALIDATE_INTERVAL = 10 * 60 # seconds between background checks
+    TIMEOUT = (5, 30)
+
+    _lock = threading.Lock()
+    _loaded = False
+    _data = None
+    _meta = {}
+    _by_id = {}
+    _by_type = {}
+    _listeners = []
+    _revalidating = False
+    _last_check = 0
+
+    @classmethod
+    def _paths(cls):
+        cache_dir = Config.get_cache_dir()
+        return os.path.join(cache_dir, cls.FILE_NAME), os.path.join(cache_dir, cls.META_FILE_NAME)
+
+    @classmethod
+    def _load_from_disk(cls):
+        if cls._loaded:
+            return
+        cls._loaded = True
+        data_path, meta_path = cls._paths()
+        try:
+            if os.path.exists(data_path):
+                with open(data_path, "r", encoding="utf-8") as f:
+                    cls._set_data(json.load(f))
+            if os.path.exists(meta_path):
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    cls._meta = json.load(f)
+        except Exception as e:
+            print(f"Error loading cached version manifest: {e}")
+
+    @classmethod
+    def _set_data(cls, data):
+        by_id = {}
+        by_type = {}
+        for v in data.get("versions", []):
+            by_id[v["id"]] = v
+            by_type.setdefault(v["type"], []).append(v)
+        cls._data = data
+        cls._by_id = by_id
+        cls._by_type = by_type
+
+    @staticmethod
+    def _replace(path, raw):
+        # Unique temp file: another launcher process may be writing the same cache
+        fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @classmethod
+    def _write_to_disk(cls, raw, meta):
+        data_path, meta_path = cls._paths()
+        try:
+            cls._replace(data_path, raw)
+            cls._replace(meta_path, json.dumps(meta).encode("utf-8"))
+        except Exception as e:
+            print(f"Error saving version manifest: {e}")
+
+    # --- Public API ---
+    @classmethod
+    def get_versions(cls, revalidate=True, force=False):
+        """
+        Returns the manifest's version list. Served from disk when possible;
+        only the very first run (no cache yet) waits for the network.
+        """
+        with cls._lock:
+            cls._load_from_disk()
+            has_data = cls._data is not None
+
+        if OfflineMode.active():
+            pass
+        elif not has_data:
+            cls.revalidate()
+        elif revalidate:
+            cls.revalidate_async(force=force)
+
+        return list(cls._data["versions"]) if cls._data else []
+
+    @classmethod
+    def get(cls, version_id):
+        with cls._lock:
+            cls._load_from_disk()
+        return cls._by_id.get(version_id)
+
+    @classmethod
+    def get_by_type(cls, version_type):
+        with cls._lock:
+            cls._load_from_disk()
+        return list(cls._by_type.get(version_type, []))
+
+    @classmethod
+    def get_latest(cls):
+        with cls._lock:
+            cls._load_from_disk()
+        return dict(cls._data.get("latest", {})) if cls._data else {}
+
+    @classmethod
+    def find(cls, version_id):
+        """Looks up a version, revalidating once if it's not in the cached copy (e.g. a new release)."""
+        entry = cls.get(version_id)
+        if entry is None and not OfflineMode.active():
+            cls.revalidate()
+            entry = cls._by_id.get(version_id)
+        return entry
+
+    @classmethod
+    def add_listener(cls, callback):
+        """callback(versions) is called from a worker thread whenever a newer manifest arrives."""
+        cls._listeners.append(callback)
+
+    @classmethod
+    def remove_listener(cls, callback):
+        if callback in cls._listeners:
+            cls._listeners.remove(callback)
+
+    @classmethod
+    def revalidate_async(cls, force=False):
+        if OfflineMode.active():
+            return
+        if not force and time.time() - cls._last_check < cls.REVALIDATE_INTERVAL:
+            return
+        with cls._lock:
+            if cls._revalidating:
+                return
+            cls._revalidating = True
+            # Counted from the attempt: offline, failures don't start a thread per call
+            cls._last_check = time.time()
+        threading.Thread(target=cls._revalidate_background, daemon=True).start()
+
+    @classmethod
+    def _revalidate_background(cls):
+        try:
+            cls.revalidate()
+        except Exception as e:
+            print(f"Version manifest revalidation failed: {e}")
+        finally:
+            # Only the path that set the flag clears it
+            cls._revalidating = False
+
+    @classmethod
+    def revalidate(cls):
+        """
+        Conditional GET against Mojang. Returns True if a newer manifest was stored.
+        Network errors are swallowed when a cached copy exists (offline use).
+        """
+        cls._last_check = time.time()
+        try:
+            headers = {}
+            if cls._data is not None:
+                if cls._meta.get("etag"):
+                    headers["If-None-Match"] = cls._meta["etag"]
+                if cls._meta.get("last_modified"):
+                    headers["If-Modified-Since"] = cls._meta["last_modified"]
+
+            response = http_client.get(cls.URL, headers=headers, timeout=cls.TIMEOUT, endpoint="mojang version manifest")
+
+            if response.status_code == 304:
+                return False
+            response.raise_for_status()
+
+            data = response.json()
+            meta = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched": time.time()
+            }
+            with cls._lock:
+                cls._set_data(data)
+                cls._meta = meta
+            cls._write_to_disk(response.content, meta)
+
+            for listener in list(cls._listeners):
+                try:
+                    listener(list(data["versions"]))
+                except Exception as e:
+                    print(f"Version manifest listener error: {e}")
+            return True
+        except Exception as e:
+            if cls._data is None:
+                raise
+            print(f"Version manifest revalidation failed, using cached copy: {e}")
+            return False